@@ -0,0 +1,58 @@
+"""Memory used by N collected articles as plain dicts vs. Article records.
+
+    python -m benchmarks.article_memory [N]
+"""
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from src.article import Article
+
+SOURCES = ["Hacker News", "TechCrunch AI", "The Verge AI", "MIT Technology Review", "Ars Technica"]
+NOW = datetime(2026, 2, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _raw(i: int) -> dict:
+    # Each parsed feed entry carries its own copy of the source name.
+    return {
+        "title": f"Story {i} about a new language model",
+        "link": f"https://example.com/news/{i}",
+        "source": "".join(SOURCES[i % len(SOURCES)]),
+        "description": "A short description of the story, as cleaned from the feed summary.",
+        "published": (NOW - timedelta(minutes=i)).isoformat(),
+    }
+
+
+def _as_dicts(raw: dict) -> dict:
+    # Dedup, filtering and summarizing each copied the dict to add a key.
+    article = {**raw, "related": []}
+    article = {**article, "keyword_hits": {"ai": 1}}
+    return {**article, "titulo_pt": article["title"], "resumo_pt": article["description"]}
+
+
+def _as_articles(raw: dict) -> Article:
+    article = Article.from_dict(raw).evolve(related=[])
+    article = article.evolve(keyword_hits={"ai": 1})
+    return article.evolve(titulo_pt=article.title, resumo_pt=article.description)
+
+
+def _measure(build, n: int) -> int:
+    tracemalloc.start()
+    items = [build(_raw(i)) for i in range(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current
+
+
+def main(n: int = 50_000) -> None:
+    as_dicts = _measure(_as_dicts, n)
+    as_articles = _measure(_as_articles, n)
+    print(f"{n} articles")
+    print(f"  dicts:    {as_dicts / 1e6:7.1f} MB ({as_dicts / n:.0f} B/article)")
+    print(f"  Article:  {as_articles / 1e6:7.1f} MB ({as_articles / n:.0f} B/article)")
+    print(f"  saved:    {1 - as_articles / as_dicts:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,98 @@
+"""Digest rendering time: the compiled, escaped renderer vs. the old `+=` f-string version.
+
+    python -m benchmarks.email_render [N]
+
+Escaping dominates: the old unescaped renderer is about 8x faster than any
+escaped one. With the same per-field html.escape applied to it, the old
+renderer is slightly faster than the compiled one (1.5 ms against 1.6 ms for
+500 articles), so the precompiled templates buy no speed; what the compiled
+renderer pays for is escaping every field.
+"""
+import html
+import sys
+import timeit
+
+from src.email_sender import build_email_html, build_email_text
+
+ROUNDS = 15
+
+
+def legacy_build_email_html(articles: list[dict], date_str: str) -> str:
+    """The renderer as it was before templates were compiled (unescaped, `+=` concatenation)."""
+    articles_html = ""
+    for i, article in enumerate(articles, 1):
+        titulo = article.get("titulo_pt", article["title"])
+        resumo = article.get("resumo_pt", article.get("description", ""))
+        articles_html += f"""
+        <tr>
+            <td style="padding: 14px 0; border-bottom: 1px solid #eee;">
+                <a href="{article['link']}" style="color: #0066cc; text-decoration: none; font-size: 16px; font-weight: bold;">
+                    {i}. {titulo}
+                </a><br>
+                <p style="color: #444; font-size: 13px; line-height: 1.6; margin: 6px 0 4px 0;">
+                    {resumo}
+                </p>
+                <span style="color: #999; font-size: 11px;">{article['source']}</span>
+            </td>
+        </tr>"""
+
+    return f"""
+    <div style="max-width: 600px; margin: 0 auto; font-family: -apple-system, sans-serif; color: #333;">
+        <h1 style="font-size: 22px; border-bottom: 3px solid #0066cc; padding-bottom: 8px;">
+            Novidades de IA no mundo — {date_str}
+        </h1>
+
+        <h2 style="font-size: 16px; margin-top: 20px;">Notícias de IA</h2>
+        <table style="width: 100%; border-collapse: collapse;">
+            {articles_html}
+        </table>
+
+        <p style="color: #999; font-size: 11px; margin-top: 24px; text-align: center;">
+            Gerado automaticamente pelo Joshua AI News
+        </p>
+    </div>
+    """
+
+
+def _escaped(articles: list[dict]) -> list[dict]:
+    return [{key: html.escape(value) for key, value in article.items()} for article in articles]
+
+
+def _articles(n: int) -> list[dict]:
+    return [
+        {
+            "title": f"Story {i}: a model & its <benchmarks>",
+            "titulo_pt": f"Notícia {i}: um modelo & seus <benchmarks>",
+            "resumo_pt": "Resumo da notícia em duas frases, com \"aspas\" e detalhes. " * 2,
+            "description": "Original description",
+            "source": "TechCrunch AI",
+            "link": f"https://example.com/news/{i}?a=1&b=2",
+        }
+        for i in range(n)
+    ]
+
+
+def main(n: int = 500) -> None:
+    articles = _articles(n)
+    date_str = "18 de Fevereiro de 2026"
+    runs = {
+        "legacy html": lambda: legacy_build_email_html(articles, date_str),
+        "legacy html, escaped": lambda: legacy_build_email_html(_escaped(articles), date_str),
+        "html": lambda: build_email_html(articles, date_str),
+        "html + text": lambda: (build_email_html(articles, date_str), build_email_text(articles, date_str)),
+    }
+    # Best of interleaved rounds: timings on shared machines swing by 50% or more,
+    # and interleaving exposes every renderer to the same swings.
+    timers = {name: timeit.Timer(func) for name, func in runs.items()}
+    numbers = {name: timer.autorange()[0] for name, timer in timers.items()}
+    best = dict.fromkeys(runs, float("inf"))
+    for _ in range(ROUNDS):
+        for name, timer in timers.items():
+            best[name] = min(best[name], timer.timeit(numbers[name]) / numbers[name])
+    print(f"{n} articles per digest, best of {ROUNDS} rounds")
+    for name, seconds in best.items():
+        print(f"  {name:22} {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
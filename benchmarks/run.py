@@ -0,0 +1,250 @@
+"""Pipeline benchmarks against synthetic data and local stand-ins for every service.
+
+    python -m benchmarks.run --scale small
+    python -m benchmarks.run --scale medium --only dedup,filter --articles 500000
+    python -m benchmarks.run --scale small --save-baseline
+
+Each benchmark runs once to warm up, then reports median wall time and
+throughput over `--repeat` runs.
+When benchmarks/baselines.json has an entry for the same scale and input
+size, the fastest run is compared against the baseline's (less sensitive to
+noise than the median) and the run exits non-zero if any benchmark is slower
+by more than `--tolerance`. Baselines are machine
+specific; refresh them with --save-baseline on the machine that compares.
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import config
+from benchmarks.stubs import FakeAnthropic, FakeNewsApiClient, FeedServer, fake_resend_batch_send
+from benchmarks.synthetic import make_articles, make_rss
+from src.article import Article
+from src.clustering import cluster_articles
+from src.collectors.newsapi import collect_newsapi_articles
+from src.collectors.rss import _parse_feed, collect_rss_articles
+from src.dedup import deduplicate_articles
+from src.email_sender import build_email_html, send_digest_batch
+from src.main import filter_ai_articles
+from src.rate_limit import TokenBucket
+from src.summarizer import summarize_articles
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+
+SCALES = {
+    "small": {"feeds": 10, "entries": 10, "queries": 4, "articles": 1_000, "summarize": 15, "recipients": 100,
+              "feed_entries": 2_000, "cluster": 2_000},
+    "medium": {"feeds": 200, "entries": 25, "queries": 12, "articles": 100_000, "summarize": 100, "recipients": 2_000,
+               "feed_entries": 20_000, "cluster": 20_000},
+    "large": {"feeds": 10_000, "entries": 20, "queries": 50, "articles": 1_000_000, "summarize": 500, "recipients": 20_000,
+              "feed_entries": 200_000, "cluster": 50_000},
+}
+
+
+def _bench_collect_rss(args):
+    server = FeedServer(args.feeds, args.entries, latency=args.http_latency).__enter__()
+    feeds = server.feed_configs()
+
+    def run():
+        return collect_rss_articles(feeds, max_workers=config.RSS_MAX_WORKERS, timeout=60)
+
+    return args.feeds * args.entries, run, lambda: server.__exit__(None, None, None)
+
+
+def _bench_parse_feed(parser: str):
+    def bench(args):
+        # A newest-first feed spanning three days, so two thirds of it is past the cutoff.
+        data = make_rss(0, args.feed_entries, hours=72, newest_first=True)
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+        feed_config = {"name": "Feed 0"}
+        return args.feed_entries, lambda: _parse_feed(feed_config, data, {}, cutoff, parser), None
+
+    return bench
+
+
+def _bench_collect_newsapi(args):
+    patcher = patch(
+        "src.collectors.newsapi.NewsApiClient",
+        lambda api_key, session=None: FakeNewsApiClient(latency=args.newsapi_latency, total=100),
+    )
+    patcher.start()
+    queries = [f"query {i}" for i in range(args.queries)]
+
+    def run():
+        return collect_newsapi_articles(
+            "key", queries, page_size=config.NEWSAPI_PAGE_SIZE, max_pages=5,
+            max_workers=config.NEWSAPI_MAX_WORKERS,
+            rate_limiter=TokenBucket(rate=1e9, capacity=len(queries) * 5),
+        )
+
+    return args.queries * 100, run, patcher.stop
+
+
+def _bench_dedup(args):
+    articles = make_articles(args.articles)
+    return len(articles), lambda: deduplicate_articles(articles), None
+
+
+def _bench_filter(args):
+    articles = make_articles(args.articles)
+    return len(articles), lambda: filter_ai_articles(articles, config.AI_KEYWORDS), None
+
+
+def _bench_cluster(args):
+    articles = [Article.from_dict(article) for article in make_articles(args.cluster, duplicate_ratio=0)]
+    return len(articles), lambda: cluster_articles(articles), None
+
+
+def _bench_summarize(args):
+    patcher = patch(
+        "src.summarizer.anthropic.Anthropic",
+        lambda api_key: FakeAnthropic(latency=args.claude_latency),
+    )
+    patcher.start()
+    articles = make_articles(args.summarize, duplicate_ratio=0)
+
+    def run():
+        return summarize_articles(
+            articles, api_key="key", model=config.ANTHROPIC_MODEL,
+            chunk_input_tokens=config.SUMMARY_CHUNK_INPUT_TOKENS,
+            chunk_max_articles=config.SUMMARY_CHUNK_MAX_ARTICLES,
+            max_workers=config.SUMMARY_MAX_WORKERS,
+            stream=config.SUMMARY_STREAMING,
+        )
+
+    return len(articles), run, patcher.stop
+
+
+def _bench_render(args):
+    articles = [
+        {**article, "titulo_pt": f"PT {article['title']}", "resumo_pt": article["description"]}
+        for article in make_articles(args.summarize, duplicate_ratio=0)
+    ]
+    return len(articles), lambda: build_email_html(articles, "18 de Fevereiro de 2026"), None
+
+
+def _bench_send(args):
+    patcher = patch("src.email_sender.resend.Batch.send", fake_resend_batch_send(args.resend_latency))
+    patcher.start()
+    messages = [
+        {"to": f"user{i}@example.com", "subject": "Digest", "html": "<p>digest</p>", "text": "digest"}
+        for i in range(args.recipients)
+    ]
+
+    def run():
+        return send_digest_batch(
+            "key", "news@example.com", messages,
+            batch_size=config.RESEND_BATCH_SIZE, max_workers=config.RESEND_MAX_WORKERS,
+            rate_limiter=TokenBucket(rate=1e9, capacity=config.RESEND_MAX_WORKERS),
+        )
+
+    return len(messages), run, patcher.stop
+
+
+BENCHMARKS = {
+    "collect_rss": _bench_collect_rss,
+    "parse_feed_fast": _bench_parse_feed("fast"),
+    "parse_feedparser": _bench_parse_feed("feedparser"),
+    "collect_newsapi": _bench_collect_newsapi,
+    "dedup": _bench_dedup,
+    "filter": _bench_filter,
+    "cluster": _bench_cluster,
+    "summarize": _bench_summarize,
+    "render": _bench_render,
+    "send": _bench_send,
+}
+
+
+def run_benchmark(name: str, args) -> dict:
+    items, func, teardown = BENCHMARKS[name](args)
+    try:
+        started = time.perf_counter()
+        func()
+        # Fast benchmarks are looped so each timing covers at least ~50 ms.
+        number = max(1, int(0.05 / max(time.perf_counter() - started, 1e-9)))
+        timings = []
+        for _ in range(args.repeat):
+            gc.collect()
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            timings.append((time.perf_counter() - started) / number)
+    finally:
+        if teardown:
+            teardown()
+    median = statistics.median(timings)
+    return {
+        "items": items,
+        "median_s": round(median, 6),
+        "min_s": round(min(timings), 6),
+        "max_s": round(max(timings), 6),
+        "items_per_s": round(items / median, 1) if median else None,
+    }
+
+
+def _parse_args(argv: list[str] | None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    for option in ("feeds", "entries", "queries", "articles", "summarize", "recipients", "feed_entries", "cluster"):
+        parser.add_argument(f"--{option}", type=int, help=f"override the scale's {option}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="comma-separated benchmark names: " + ",".join(BENCHMARKS))
+    parser.add_argument("--http-latency", type=float, default=0.0, help="seconds per feed response")
+    parser.add_argument("--newsapi-latency", type=float, default=0.05, help="seconds per NewsAPI page")
+    parser.add_argument("--claude-latency", type=float, default=0.2, help="seconds per Claude reply")
+    parser.add_argument("--resend-latency", type=float, default=0.1, help="seconds per Resend batch request")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs. baseline")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+    for option, value in SCALES[args.scale].items():
+        if getattr(args, option) is None:
+            setattr(args, option, value)
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    scale_baseline = baselines.get(args.scale, {})
+
+    results: dict[str, dict] = {}
+    regressions = []
+    print(f"{'benchmark':16} {'items':>9} {'median':>10} {'items/s':>12}  vs baseline")
+    for name in names:
+        result = results[name] = run_benchmark(name, args)
+        baseline = scale_baseline.get(name)
+        comparison = ""
+        if baseline and baseline["items"] == result["items"] and baseline["min_s"]:
+            ratio = result["min_s"] / baseline["min_s"]
+            comparison = f"{ratio:5.2f}x"
+            if ratio > 1 + args.tolerance:
+                comparison += "  REGRESSION"
+                regressions.append(name)
+        print(
+            f"{name:16} {result['items']:>9} {result['median_s'] * 1000:>8.1f}ms "
+            f"{result['items_per_s'] or 0:>12,.0f}  {comparison}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps({"scale": args.scale, "results": results}, indent=2))
+    if args.save_baseline:
+        baselines[args.scale] = {**scale_baseline, **results}
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline for {args.scale!r} saved to {args.baseline}")
+    if regressions and not args.save_baseline:
+        print(f"Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Local stand-ins for the services a run talks to, with configurable latency."""
+import functools
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from benchmarks.synthetic import make_newsapi_page, make_rss
+
+
+class FeedServer:
+    """Serves synthetic RSS at /feeds/<i>.xml from a local HTTP server.
+
+        with FeedServer(feeds=100, entries=20) as server:
+            collect_rss_articles(server.feed_configs())
+    """
+
+    def __init__(self, feeds: int, entries: int, latency: float = 0.0):
+        self.feeds = feeds
+        render = functools.lru_cache(maxsize=None)(lambda i: make_rss(i, entries))
+        for i in range(feeds):
+            render(i)  # generate up front so serving time is not measured as parsing time
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                match = re.fullmatch(r"/feeds/(\d+)\.xml", self.path)
+                if not match or int(match.group(1)) >= feeds:
+                    self.send_error(404)
+                    return
+                if latency:
+                    time.sleep(latency)
+                body = render(int(match.group(1)))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._server.request_queue_size = 128
+
+    def __enter__(self) -> "FeedServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def feed_configs(self) -> list[dict]:
+        port = self._server.server_address[1]
+        return [
+            {"name": f"Feed {i}", "url": f"http://127.0.0.1:{port}/feeds/{i}.xml"}
+            for i in range(self.feeds)
+        ]
+
+
+class FakeNewsApiClient:
+    """Answers get_everything with synthetic pages of `total` results per query."""
+
+    def __init__(self, api_key: str = "", latency: float = 0.0, total: int = 100):
+        self.latency = latency
+        self.total = total
+
+    def get_everything(self, q: str, page_size: int = 20, page: int = 1, **params) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return make_newsapi_page(q, page, page_size, self.total)
+
+
+_ARTICLE_LINE = re.compile(r"^\[(\d+)\] (.*) \(", re.M)
+
+
+def _reply(request: dict) -> str:
+    prompt = request["messages"][0]["content"]
+    return json.dumps({"noticias": [
+        {"indice": int(index), "titulo_pt": f"PT {title}", "resumo_pt": f"Resumo de {title}. Segunda frase."}
+        for index, title in _ARTICLE_LINE.findall(prompt)
+    ]}, ensure_ascii=False)
+
+
+def _usage(request: dict, reply: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        input_tokens=len(request["messages"][0]["content"]) // 4,
+        output_tokens=len(reply) // 4,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=0,
+    )
+
+
+class _FakeStream:
+    def __init__(self, request: dict, latency: float):
+        self._request = request
+        self._latency = latency
+        self._reply = _reply(request)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    @property
+    def text_stream(self):
+        pieces = [self._reply[i:i + 64] for i in range(0, len(self._reply), 64)]
+        for piece in pieces:
+            time.sleep(self._latency / len(pieces))
+            yield piece
+
+    def get_final_message(self):
+        return SimpleNamespace(usage=_usage(self._request, self._reply))
+
+
+class _FakeMessages:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def create(self, **request):
+        time.sleep(self.latency)
+        reply = _reply(request)
+        return SimpleNamespace(content=[SimpleNamespace(text=reply)], usage=_usage(request, reply))
+
+    def stream(self, **request):
+        return _FakeStream(request, self.latency)
+
+
+class FakeAnthropic:
+    """Anthropic client whose replies summarize every article in the prompt after `latency` seconds."""
+
+    def __init__(self, api_key: str = "", latency: float = 0.0):
+        self.messages = _FakeMessages(latency)
+
+
+def fake_resend_batch_send(latency: float = 0.0):
+    """A resend.Batch.send replacement that answers after `latency` seconds."""
+    ids = itertools.count()
+
+    def send(params: list[dict], options: dict | None = None) -> dict:
+        time.sleep(latency)
+        return {"data": [{"id": f"email-{next(ids)}"} for _ in params]}
+
+    return send
@@ -0,0 +1,94 @@
+"""Deterministic synthetic inputs: RSS feeds, NewsAPI payloads and article dicts."""
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+SOURCES = ["Hacker News AI", "TechCrunch AI", "The Verge AI", "MIT Tech Review AI", "Ars Technica", "Wired"]
+
+AI_SUBJECTS = [
+    "OpenAI", "Anthropic", "Google DeepMind", "Meta AI", "Mistral", "a new LLM", "a generative model",
+    "machine learning researchers", "an AI chatbot", "a transformer model",
+]
+OTHER_SUBJECTS = ["Apple", "Tesla", "a city council", "NASA", "a startup", "the Fed", "a football club", "Netflix"]
+VERBS = ["releases", "announces", "unveils", "delays", "open-sources", "benchmarks", "ships", "cancels"]
+OBJECTS = [
+    "a faster model", "new reasoning features", "a coding assistant", "its quarterly results",
+    "a robotics platform", "a safety report", "an updated chip", "a research paper", "pricing changes",
+]
+
+
+def _headline(rng: random.Random, i: int, ai_ratio: float) -> str:
+    subject = rng.choice(AI_SUBJECTS if rng.random() < ai_ratio else OTHER_SUBJECTS)
+    return f"{subject} {rng.choice(VERBS)} {rng.choice(OBJECTS)} (#{i})"
+
+
+def make_articles(n: int, duplicate_ratio: float = 0.2, ai_ratio: float = 0.4, seed: int = 0) -> list[dict]:
+    """`n` article dicts; about `duplicate_ratio` of them repost an earlier story from another source."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    articles: list[dict] = []
+    for i in range(n):
+        if articles and rng.random() < duplicate_ratio:
+            original = articles[rng.randrange(len(articles))]
+            articles.append({
+                **original,
+                "source": rng.choice(SOURCES),
+                "link": f"{original['link']}?utm_source=rss&ref={i}",
+            })
+            continue
+        title = _headline(rng, i, ai_ratio)
+        articles.append({
+            "title": title,
+            "link": f"https://news{i % 97}.example.com/{i}/{title[:24].lower().replace(' ', '-')}",
+            "source": rng.choice(SOURCES),
+            "description": f"{title}. Details about the announcement and what it means for the industry.",
+            "published": (now - timedelta(minutes=rng.randrange(24 * 60))).isoformat(),
+        })
+    return articles
+
+
+def make_rss(
+    feed_index: int, entries: int, ai_ratio: float = 0.4, hours: int = 23, newest_first: bool = False,
+) -> bytes:
+    """An RSS 2.0 document with `entries` items published within the last `hours`."""
+    rng = random.Random(feed_index)
+    now = datetime.now(timezone.utc)
+    ages = [rng.randrange(hours * 60) for _ in range(entries)]
+    if newest_first:
+        ages.sort()
+    items = []
+    for i, age in enumerate(ages):
+        title = _headline(rng, feed_index * entries + i, ai_ratio)
+        items.append(
+            "<item>"
+            f"<title>{escape(title)}</title>"
+            f"<link>https://feed{feed_index}.example.com/{i}</link>"
+            f"<description>{escape(f'<p>{title}. More on the story.</p>')}</description>"
+            f"<pubDate>{format_datetime(now - timedelta(minutes=age))}</pubDate>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<rss version="2.0"><channel><title>Feed {feed_index}</title>'
+        f"<link>https://feed{feed_index}.example.com/</link><description>Synthetic feed</description>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def make_newsapi_page(query: str, page: int, page_size: int, total: int, seed: int = 0) -> dict:
+    """A NewsAPI /v2/everything response body."""
+    rng = random.Random(f"{seed}-{query}-{page}")
+    start = (page - 1) * page_size
+    articles = []
+    for i in range(start, min(start + page_size, total)):
+        title = _headline(rng, i, ai_ratio=0.8)
+        articles.append({
+            "source": {"id": None, "name": rng.choice(SOURCES)},
+            "title": title,
+            "description": f"{title}. Coverage of {query}.",
+            "url": f"https://newsapi.example.com/{query.replace(' ', '-')}/{i}",
+            "publishedAt": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+    return {"status": "ok", "totalResults": total, "articles": articles}
@@ -8,6 +8,12 @@ NEWSAPI_KEY = os.environ.get("NEWSAPI_KEY", "")
 NEWSAPI_QUERIES = ["artificial intelligence", "AI technology", "machine learning"]
 NEWSAPI_LANGUAGE = "en"
 NEWSAPI_PAGE_SIZE = 20
+NEWSAPI_MAX_PAGES = 1  # pages fetched per query
+NEWSAPI_MAX_WORKERS = 4  # queries fetched concurrently
+NEWSAPI_RATE_PER_SECOND = 1.0  # token bucket refill rate
+NEWSAPI_BURST = 3  # token bucket capacity
+NEWSAPI_MAX_REQUESTS_PER_RUN = 12  # free plan allows 100 requests/day
+NEWSAPI_MAX_RETRIES = 2
 
 # RSS Feeds (AI-focused only)
 RSS_FEEDS = [
@@ -16,21 +22,105 @@ RSS_FEEDS = [
     {"name": "The Verge AI", "url": "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml"},
     {"name": "MIT Tech Review AI", "url": "https://www.technologyreview.com/topic/artificial-intelligence/feed"},
 ]
+RSS_MAX_WORKERS = 8  # feeds fetched concurrently
+RSS_FETCH_TIMEOUT = 15  # seconds per feed
+# "feedparser" parses every feed with feedparser; the optional "fast" backend
+# streams RSS/Atom and stops at the 24h cutoff, falling back to feedparser for
+# feeds it cannot read.
+RSS_PARSER = os.environ.get("NEWS_AGENT_RSS_PARSER", "feedparser")
 
-# Keywords to filter articles — must match at least one
+# Local state (persisted between runs by the workflow cache)
+CACHE_DIR = os.environ.get("NEWS_AGENT_CACHE_DIR", ".cache")
+FEED_CACHE_PATH = os.path.join(CACHE_DIR, "feed_cache.json")
+FEED_CACHE_MAX_ENTRIES = 500
+FEED_CACHE_MAX_AGE_DAYS = 30
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, "checkpoints")  # per-stage pipeline outputs
+SEEN_INDEX_PATH = os.path.join(CACHE_DIR, "seen.sqlite3")
+SEEN_TTL_DAYS = 7  # delivered articles are skipped for this long
+SEEN_MAX_ENTRIES = 50_000
+ARTICLE_STORE_PATH = os.path.join(CACHE_DIR, "articles.sqlite3")  # filled by daemon mode
+ARTICLE_STORE_RETENTION_HOURS = 48
+
+# Keywords to filter articles — must match at least one whole word (plural "s" allowed)
 AI_KEYWORDS = [
     "ai", "artificial intelligence", "machine learning", "deep learning",
-    "llm", "gpt", "claude", "gemini", "neural network", "openai",
+    "llm", "gpt", "chatgpt", "claude", "gemini", "neural network", "openai",
     "anthropic", "chatbot", "generative", "transformer", "diffusion",
     "copilot", "inteligência artificial", "aprendizado de máquina",
 ]
 
+# Ranking — articles are scored before the top MAX_ARTICLES_TO_SUMMARIZE cut
+SOURCE_WEIGHTS = {
+    "MIT Tech Review AI": 1.2,
+    "TechCrunch AI": 1.1,
+    "The Verge AI": 1.1,
+    "Hacker News AI": 1.0,
+}  # unlisted sources (e.g. NewsAPI outlets) weigh 1.0
+RANKING_HALF_LIFE_HOURS = 12
+# Stories whose hashed TF-IDF vectors have at least this cosine similarity are one
+# topic: only the best-ranked is summarized, the others become "também em" links.
+CLUSTER_SIMILARITY = 0.3  # 0 disables clustering
+
 # Claude API
 ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY", "")
 ANTHROPIC_MODEL = "claude-haiku-4-5-20251001"
 MAX_ARTICLES_TO_SUMMARIZE = 15
+SUMMARY_CHUNK_INPUT_TOKENS = 2000  # estimated prompt tokens per request
+SUMMARY_CHUNK_MAX_ARTICLES = 10
+SUMMARY_MAX_WORKERS = 4  # chunks summarized concurrently
+SUMMARY_MAX_RETRIES = 1  # extra attempts for articles missing from a reply
+SUMMARY_STREAMING = True  # parse replies incrementally via the streaming API
+SUMMARY_BACKEND = os.environ.get("SUMMARY_BACKEND", "sync")  # "sync" or "batch" (Message Batches API)
+SUMMARY_BATCH_DEADLINE = 1800  # seconds before falling back to synchronous calls
+SUMMARY_BATCH_POLL_INTERVAL = 10  # first poll delay in seconds, doubled up to 5 minutes
+SUMMARY_CACHE_PATH = os.path.join(CACHE_DIR, "summaries.sqlite3")
+SUMMARY_CACHE_TTL_DAYS = 14
+SUMMARY_CACHE_MAX_ENTRIES = 5000
+
+# Full-article enrichment — the selected articles' pages are fetched so Claude
+# summarizes the story instead of the feed's 300-character teaser.
+FULLTEXT_ENABLED = os.environ.get("NEWS_AGENT_FULLTEXT", "") not in ("", "0")
+FULLTEXT_MAX_WORKERS = 8  # pages fetched concurrently
+FULLTEXT_PER_HOST = 2  # pages fetched concurrently from one host
+FULLTEXT_TIMEOUT = 10  # seconds per page
+FULLTEXT_MAX_BYTES = 2_000_000  # bytes read per page
+FULLTEXT_MAX_TOKENS = 600  # article text sent to Claude, per article
+FULLTEXT_CACHE_PATH = os.path.join(CACHE_DIR, "fulltext.sqlite3")
+FULLTEXT_CACHE_TTL_DAYS = 7
+FULLTEXT_CACHE_MAX_ENTRIES = 2000
 
 # Email
 RESEND_API_KEY = os.environ.get("RESEND_API_KEY", "")
 EMAIL_FROM = os.environ.get("EMAIL_FROM", "news@resend.dev")
-EMAIL_TO = os.environ.get("EMAIL_TO", "")
+EMAIL_TO = os.environ.get("EMAIL_TO", "")  # comma-separated for several recipients
+RESEND_BATCH_SIZE = 100  # emails per batch request (Resend's maximum)
+RESEND_MAX_WORKERS = 4  # batch requests in flight at once
+RESEND_RATE_PER_SECOND = 2.0  # Resend's default API rate limit
+RESEND_MAX_RETRIES = 3  # retries of a rate-limited (429) batch request
+
+# Digest profiles — each has its own keywords, article count and recipients.
+# Collection, dedup and Claude summaries are shared by all profiles.
+PROFILES = [
+    {
+        "name": "default",
+        "keywords": AI_KEYWORDS,
+        "recipients": [email.strip() for email in EMAIL_TO.split(",") if email.strip()],
+        "max_articles": MAX_ARTICLES_TO_SUMMARIZE,
+    },
+]
+
+# Instrumentation — per-stage timings, bytes, article counts and tokens for each run
+METRICS_ENABLED = os.environ.get("NEWS_AGENT_METRICS", "") not in ("", "0")
+METRICS_REPORT_PATH = os.environ.get("NEWS_AGENT_METRICS_REPORT", "run-report.json")
+METRICS_PROMETHEUS_PATH = os.environ.get("NEWS_AGENT_METRICS_PROMETHEUS")  # Prometheus text format, optional
+METRICS_OTLP_PATH = os.environ.get("NEWS_AGENT_METRICS_OTLP")  # OTLP/JSON metrics payload, optional
+
+# Daemon mode (python -m src.daemon) — each RSS feed and NewsAPI query is polled
+# on its own interval, adapted to how often it publishes; the digest is built
+# from the article store at DAEMON_DIGEST_TIME.
+DAEMON_DIGEST_TIME = os.environ.get("NEWS_AGENT_DIGEST_TIME", "08:00")  # UTC, HH:MM
+DAEMON_MIN_INTERVAL = 5 * 60  # seconds between polls of one source, at least
+DAEMON_MAX_INTERVAL = 6 * 3600  # and at most
+DAEMON_TARGET_NEW_PER_POLL = 3  # aim for about this many new articles per poll
+DAEMON_BACKOFF = 2.0  # interval multiplier after a poll with nothing new
+DAEMON_NEWSAPI_DAILY_REQUESTS = 90  # free plan allows 100 requests/day
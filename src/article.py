@@ -0,0 +1,86 @@
+import dataclasses
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+
+def parse_datetime(value) -> datetime | None:
+    """An aware datetime from a datetime or ISO 8601 string (naive means UTC); None if unparseable."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """A news article as it moves through the pipeline.
+
+    Source names are interned, since thousands of articles share a handful of
+    them, and `published` is parsed once into an aware datetime. Instances are
+    immutable; use `evolve` for updated copies. `related` is the one mutable
+    field: dedup appends later copies of a story to it in place.
+    """
+
+    title: str
+    link: str
+    source: str
+    description: str = ""
+    published: datetime | None = None
+    related: list[dict] = field(default_factory=list)
+    keyword_hits: dict[str, int] = field(default_factory=dict)
+    titulo_pt: str | None = None
+    resumo_pt: str | None = None
+    content: str = ""  # full article text, when the enrich stage fetched it
+
+    def __post_init__(self):
+        object.__setattr__(self, "title", self.title or "")
+        object.__setattr__(self, "link", self.link or "")
+        object.__setattr__(self, "source", sys.intern(self.source or "Unknown"))
+        object.__setattr__(self, "description", self.description or "")
+        if not isinstance(self.published, datetime) or not self.published.tzinfo:
+            object.__setattr__(self, "published", parse_datetime(self.published))
+
+    def evolve(self, **changes) -> "Article":
+        """Copy with some fields replaced."""
+        return dataclasses.replace(self, **changes)
+
+    # Dict-style reads, so templates and callers written against the old
+    # article dicts keep working. Unset optional fields behave as missing keys.
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__dataclass_fields__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def to_dict(self) -> dict:
+        """JSON-ready dict, used for checkpoints."""
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        data["published"] = self.published.isoformat() if self.published else None
+        data["related"] = list(self.related)
+        data["keyword_hits"] = dict(self.keyword_hits)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Article":
+        """Build from an article dict, ignoring unknown keys."""
+        fields = {key: value for key, value in data.items() if key in cls.__dataclass_fields__}
+        return cls(**{"title": "", "link": "", "source": "", **fields})
+
+
+def as_article(article: "Article | dict") -> Article:
+    """Accept either an Article or an article dict (e.g. loaded from a checkpoint)."""
+    return article if isinstance(article, Article) else Article.from_dict(article)
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from pathlib import Path
+
+from src.article import Article, as_article
+from src.dedup import canonicalize_url
+
+
+class ArticleStore:
+    """SQLite store of collected articles, filled incrementally by the daemon.
+
+    Articles are keyed by canonical URL, so re-polling a source only adds what
+    is new. Rows older than `retention_hours` (by publish time, or collection
+    time when unknown) are removed on every add. A small key/value `state`
+    table keeps daemon bookkeeping such as poll schedules.
+    """
+
+    def __init__(self, path: str | Path, retention_hours: int = 48):
+        self.path = Path(path)
+        self.retention_seconds = retention_hours * 3600
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "url_hash TEXT PRIMARY KEY, published_at REAL NOT NULL, collected_at REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_published_idx ON articles (published_at)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=16).hexdigest()
+
+    def add(self, articles: Iterable[Article | dict]) -> int:
+        """Store articles not seen before and return how many were new."""
+        now = time.time()
+        rows = [
+            (
+                self._key(article.link),
+                article.published.timestamp() if article.published else now,
+                now,
+                json.dumps(article.to_dict(), ensure_ascii=False),
+            )
+            for article in map(as_article, articles)
+            if article.link
+        ]
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO articles (url_hash, published_at, collected_at, data) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            added = self._conn.total_changes - before
+            self._conn.execute("DELETE FROM articles WHERE published_at < ?", (now - self.retention_seconds,))
+        return added
+
+    def iter_since(self, cutoff: datetime) -> Iterator[Article]:
+        """Yield stored articles published at or after `cutoff`, oldest collected first."""
+        rows = self._conn.execute(
+            "SELECT data FROM articles WHERE published_at >= ? ORDER BY collected_at, rowid",
+            (cutoff.timestamp(),),
+        )
+        for (data,) in rows:
+            yield Article.from_dict(json.loads(data))
+
+    def get_state(self, key: str, default=None):
+        row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key: str, value) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, json.dumps(value)),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
@@ -0,0 +1,113 @@
+import functools
+import math
+import re
+import zlib
+from collections.abc import Iterable
+
+from src.article import Article, as_article
+from src.keywords import fold_text
+from src.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+N_FEATURES = 1024  # hashed vector width; wider means fewer collisions but slower products
+BATCH_SIZE = 1024  # rows of the similarity matrix computed per matrix product
+
+_WORD_RE = re.compile(r"\w+")
+
+
+@functools.lru_cache(maxsize=65536)
+def _bucket(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % N_FEATURES
+
+
+def _features(article: Article) -> dict[int, int]:
+    """Hashed term counts: title words and bigrams count twice, then description words."""
+    title = _WORD_RE.findall(fold_text(article.title))
+    counts: dict[int, int] = {}
+    for feature in [*title, *title, *(f"{a} {b}" for a, b in zip(title, title[1:]))]:
+        bucket = _bucket(feature)
+        counts[bucket] = counts.get(bucket, 0) + 1
+    for word in _WORD_RE.findall(fold_text(article.description))[:100]:
+        bucket = _bucket(word)
+        counts[bucket] = counts.get(bucket, 0) + 1
+    return counts
+
+
+def tfidf_matrix(articles: list[Article]):
+    """Row-normalized hashed TF-IDF vectors, one float32 row per article."""
+    rows, cols, values = [], [], []
+    for row, article in enumerate(articles):
+        for col, count in _features(article).items():
+            rows.append(row)
+            cols.append(col)
+            values.append(1.0 + math.log(count))
+    matrix = np.zeros((len(articles), N_FEATURES), dtype=np.float32)
+    matrix[rows, cols] = values
+
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= (np.log((1 + len(articles)) / (1 + df)) + 1).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms > 0, norms, 1)
+    return matrix
+
+
+def cluster_leaders(matrix, threshold: float, batch_size: int = BATCH_SIZE):
+    """Greedy leader clustering: each row not yet taken leads a cluster of every later
+    untaken row with cosine similarity >= `threshold`. Returns each row's leader index.
+
+    Similarities are computed `batch_size` rows at a time against the rows still
+    untaken, so memory stays at batch_size × n and rows absorbed by earlier
+    clusters drop out of later products.
+    """
+    leaders = np.full(len(matrix), -1, dtype=np.int64)
+    pending = np.arange(len(matrix))
+    while pending.size:
+        batch = pending[:batch_size]
+        similar = (matrix[batch] @ matrix[pending].T) >= threshold
+        untaken = np.ones(pending.size, dtype=bool)
+        for row, i in enumerate(batch.tolist()):  # batch rows lead `pending`
+            if not untaken[row]:
+                continue
+            members = similar[row] & untaken
+            members[row] = True
+            leaders[pending[members]] = i
+            untaken &= ~members
+        pending = pending[untaken]
+    return leaders
+
+
+def cluster_articles(articles: Iterable[Article | dict], threshold: float = 0.3) -> list[Article]:
+    """Group stories about the same topic, keeping the first article of each group.
+
+    Input order is priority order (e.g. ranked best first): the first article
+    of a cluster represents it, and the other members are appended to its
+    `related` list as {"source", "link"} dicts, along with their own related
+    links. Representatives are returned in input order.
+    """
+    articles = [as_article(article) for article in articles]
+    if len(articles) < 2:
+        return articles
+
+    leaders = cluster_leaders(tfidf_matrix(articles), threshold).tolist()
+    members: dict[int, list[Article]] = {}
+    for i, leader in enumerate(leaders):
+        if leader != i:
+            members.setdefault(leader, []).append(articles[i])
+
+    clustered = []
+    for i, leader in enumerate(leaders):
+        if leader != i:
+            continue
+        article = articles[i]
+        if i in members:
+            links = {article.link, *(item.get("link") for item in article.related)}
+            related = list(article.related)
+            for member in members[i]:
+                for item in [{"source": member.source, "link": member.link}, *member.related]:
+                    if item.get("link") not in links:
+                        links.add(item.get("link"))
+                        related.append(item)
+            article = article.evolve(related=related)
+        clustered.append(article)
+    return clustered
@@ -0,0 +1,176 @@
+# src/collectors/fast_feed.py
+"""Streaming RSS/Atom parser that extracts only what the digest uses.
+
+feedparser builds and normalizes the whole document before the cutoff
+discards most of it. This parser reads the body incrementally, keeps just
+title, link, summary and published per entry, and stops reading once a
+newest-first feed has gone past the cutoff. Anything it does not understand
+raises `FeedParseError` so the caller can fall back to feedparser.
+"""
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+CHUNK_SIZE = 64 * 1024
+
+_FEED_ROOTS = {"rss", "feed", "RDF"}
+_ENTRY_TAGS = {"item", "entry"}
+_DATE_TAGS = ("pubDate", "published", "issued")
+# Stale entries in a row, after crossing the cutoff, before a sorted feed is abandoned.
+_STOP_AFTER = 3
+# Elements whose content is never text, dropped with everything inside them.
+_DROP_TAGS = {"script", "style", "noscript", "template", "iframe", "object", "embed", "svg", "math"}
+_BLOCK_TAGS = {"p", "br", "div", "li", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "tr"}
+
+
+class FeedParseError(ValueError):
+    """The body is not a feed this parser can read."""
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _text(element) -> str:
+    return "".join(element.itertext()).strip()
+
+
+class _PlainText(HTMLParser):
+    """Text content of an HTML fragment; scripts, styles and embeds are dropped."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._drop = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _DROP_TAGS:
+            self._drop += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _DROP_TAGS:
+            self._drop = max(0, self._drop - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._drop:
+            self.parts.append(data)
+
+
+def _plain_text(fragment: str) -> str:
+    """Strip markup from a feed's (escaped or CDATA) HTML, as feedparser sanitizes it.
+
+    Block elements become line breaks, so per-line cleanup still sees lines.
+    """
+    if "<" not in fragment and "&" not in fragment:
+        return fragment
+    parser = _PlainText()
+    parser.feed(fragment)
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _parse_date(text: str) -> datetime | None:
+    """Parse an RFC 822 or ISO 8601 date to UTC, None when it is neither."""
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(text)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc, microsecond=0)
+    return parsed.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _entry(element) -> dict:
+    """Read the fields of one <item>/<entry> from its direct children."""
+    fields: dict[str, str] = {}
+    for child in element:
+        name = _local(child.tag)
+        if name == "link":
+            href = child.get("href")
+            if href is None and child.text and child.text.strip():
+                fields["link"] = child.text.strip()
+            elif href and child.get("rel", "alternate") == "alternate":
+                fields.setdefault("link", href.strip())
+        elif name == "guid" and child.get("isPermaLink", "true") == "true":
+            fields["guid"] = _text(child)
+        elif name in ("title", "description", "summary", "encoded", "content") or name in _DATE_TAGS:
+            fields.setdefault(name, _text(child))
+
+    link = fields.get("link") or (fields.get("guid", "") if fields.get("guid", "").startswith("http") else "")
+    if not fields.get("title") or not link:
+        raise FeedParseError("entry without title or link")
+    date = next((fields[tag] for tag in _DATE_TAGS if fields.get(tag)), "")
+    return {
+        "title": _plain_text(fields["title"]),
+        "link": link,
+        "summary": (fields.get("description") or fields.get("summary")
+                    or fields.get("encoded") or fields.get("content") or ""),
+        "published": _parse_date(date) if date else None,
+    }
+
+
+def parse_feed(data: bytes, cutoff: datetime, stop_early: bool = True) -> list[dict]:
+    """Entries of an RSS 2.0, RSS 1.0 or Atom body published at or after `cutoff`.
+
+    Each entry is a dict with title, link, summary and published (aware UTC
+    datetime or None); title and summary are plain text, with markup and
+    scripts stripped. With `stop_early`, reading stops once a feed whose
+    dated entries have all been newest first crosses the cutoff and is
+    followed by a few more stale entries; feeds that are not sorted are read
+    to the end.
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    entries = []
+    depth = 0
+    previous: datetime | None = None
+    descending = True
+    crossed = False
+    stale = 0
+    try:
+        for offset in range(0, len(data), CHUNK_SIZE):
+            parser.feed(data[offset:offset + CHUNK_SIZE])
+            for event, element in parser.read_events():
+                if event == "start":
+                    if depth == 0 and _local(element.tag) not in _FEED_ROOTS:
+                        raise FeedParseError(f"not a feed: <{_local(element.tag)}>")
+                    depth += 1
+                    continue
+                depth -= 1
+                if _local(element.tag) not in _ENTRY_TAGS:
+                    continue
+                entry = _entry(element)
+                element.clear()
+                published = entry["published"]
+                if published is None or published >= cutoff:
+                    entry["summary"] = _plain_text(entry["summary"])
+                if published is None:
+                    entries.append(entry)
+                    continue
+                if previous is not None and published > previous:
+                    descending = False
+                previous = published
+                if published >= cutoff:
+                    entries.append(entry)
+                    crossed = True
+                    stale = 0
+                    continue
+                stale += 1
+                if stop_early and descending and crossed and stale >= _STOP_AFTER:
+                    return entries
+        parser.close()
+    except ParseError as exc:
+        raise FeedParseError(str(exc)) from exc
+    return entries
@@ -0,0 +1,80 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class FeedCache:
+    """File-backed store of per-feed HTTP validators (ETag, Last-Modified) and content hashes.
+
+    Entries not checked for `max_age_days` are evicted on save, and the store
+    is capped at `max_entries`, dropping the least recently checked feeds first.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 500, max_age_days: int = 30):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, url: str) -> dict | None:
+        """Return the cached validators for `url`, if any."""
+        with self._lock:
+            entry = self._entries.get(url)
+            return dict(entry) if entry else None
+
+    def store(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        content_hash: str,
+    ) -> None:
+        """Record the validators and body hash of a freshly downloaded feed."""
+        with self._lock:
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content_hash": content_hash,
+                "checked_at": time.time(),
+            }
+
+    def touch(self, url: str) -> None:
+        """Mark `url` as checked now without changing its validators."""
+        with self._lock:
+            if url in self._entries:
+                self._entries[url]["checked_at"] = time.time()
+
+    def _evict(self) -> None:
+        now = time.time()
+        entries = {
+            url: entry for url, entry in self._entries.items()
+            if now - entry.get("checked_at", 0) <= self.max_age_seconds
+        }
+        if len(entries) > self.max_entries:
+            newest = sorted(entries.items(), key=lambda item: item[1].get("checked_at", 0), reverse=True)
+            entries = dict(newest[: self.max_entries])
+        self._entries = entries
+
+    def save(self) -> None:
+        """Evict stale entries and atomically write the store to disk."""
+        with self._lock:
+            self._evict()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,44 +1,182 @@
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+
+import requests
 from newsapi import NewsApiClient
+from newsapi.newsapi_exception import NewsAPIException
 
+from src import http_client, instrumentation
+from src.article import Article
+from src.rate_limit import TokenBucket
 
-def collect_newsapi_articles(
+
+RETRYABLE_CODES = {"rateLimited", "unexpectedError"}
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Rate limits, server errors and network failures are worth retrying."""
+    if isinstance(exc, NewsAPIException):
+        return exc.get_code() in RETRYABLE_CODES
+    return isinstance(exc, requests.RequestException)
+
+
+def _get_page(
+    client: NewsApiClient,
+    limiter: TokenBucket,
+    max_retries: int,
+    backoff: float,
+    **params,
+) -> dict | None:
+    """Fetch one page, retrying with exponential backoff. None when out of budget."""
+    for attempt in range(max_retries + 1):
+        if not limiter.acquire():
+            return None
+        instrumentation.count("newsapi.requests")
+        try:
+            return client.get_everything(**params)
+        except Exception as exc:
+            if attempt == max_retries or not _is_retryable(exc):
+                raise
+            instrumentation.count("newsapi.retries")
+            time.sleep(backoff * 2 ** attempt)
+    return None
+
+
+def _fetch_query(
+    client: NewsApiClient,
+    limiter: TokenBucket,
+    query: str,
+    params: dict,
+    page_size: int,
+    max_pages: int,
+    max_retries: int,
+    backoff: float,
+) -> list[dict]:
+    """Fetch up to `max_pages` pages of results for a single query."""
+    with instrumentation.timer("newsapi.query", query=query):
+        items = _fetch_pages(client, limiter, query, params, page_size, max_pages, max_retries, backoff)
+    instrumentation.count("newsapi.articles", len(items), query=query)
+    return items
+
+
+def _fetch_pages(
+    client: NewsApiClient,
+    limiter: TokenBucket,
+    query: str,
+    params: dict,
+    page_size: int,
+    max_pages: int,
+    max_retries: int,
+    backoff: float,
+) -> list[dict]:
+    items: list[dict] = []
+    for page in range(1, max_pages + 1):
+        try:
+            response = _get_page(
+                client, limiter, max_retries, backoff,
+                q=query, page_size=page_size, page=page, **params,
+            )
+        except Exception as exc:
+            print(f"  NewsAPI query {query!r} failed on page {page}: {exc}")
+            instrumentation.count("newsapi.errors", query=query)
+            break
+        if response is None:
+            break
+
+        page_items = response.get("articles", [])
+        items.extend(page_items)
+        total = response.get("totalResults", 0)
+        if len(page_items) < page_size or page * page_size >= total:
+            break
+    return items
+
+
+def _to_article(item: dict) -> Article:
+    return Article(
+        title=item.get("title", ""),
+        link=item.get("url", ""),
+        source=item.get("source", {}).get("name", "Unknown"),
+        description=item.get("description", ""),
+        published=item.get("publishedAt"),
+    )
+
+
+def _iter_articles(
     api_key: str,
     queries: list[str],
-    language: str = "en",
-    page_size: int = 20,
-) -> list[dict]:
-    """Collect articles from NewsAPI for given queries, deduplicated by URL."""
-    client = NewsApiClient(api_key=api_key)
+    language: str,
+    page_size: int,
+    max_pages: int,
+    max_workers: int,
+    rate_limiter: TokenBucket | None,
+    max_retries: int,
+    backoff: float,
+) -> Iterator[Article]:
+    """Run queries concurrently and yield URL-deduplicated articles in query order."""
+    if not queries:
+        return
+
+    client = NewsApiClient(api_key=api_key, session=http_client.session())
+    limiter = rate_limiter or TokenBucket(rate=1.0, capacity=len(queries))
     seen_urls: set[str] = set()
-    articles: list[dict] = []
 
     yesterday = (datetime.now(timezone.utc) - timedelta(hours=24)).strftime("%Y-%m-%d")
+    params = {"language": language, "from_param": yesterday, "sort_by": "relevancy"}
 
-    for query in queries:
-        try:
-            response = client.get_everything(
-                q=query,
-                language=language,
-                from_param=yesterday,
-                sort_by="relevancy",
-                page_size=page_size,
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+        futures = [
+            executor.submit(
+                _fetch_query, client, limiter, query, params, page_size, max_pages, max_retries, backoff,
             )
-        except Exception:
-            continue
-
-        for item in response.get("articles", []):
-            url = item.get("url", "")
-            if url in seen_urls or not url:
-                continue
-            seen_urls.add(url)
-
-            articles.append({
-                "title": item.get("title", ""),
-                "link": url,
-                "source": item.get("source", {}).get("name", "Unknown"),
-                "description": item.get("description", ""),
-                "published": item.get("publishedAt"),
-            })
-
-    return articles
+            for query in queries
+        ]
+        for future in futures:
+            for item in future.result():
+                url = item.get("url", "")
+                if url in seen_urls or not url:
+                    continue
+                seen_urls.add(url)
+                yield _to_article(item)
+
+
+def collect_newsapi_articles(
+    api_key: str,
+    queries: list[str],
+    language: str = "en",
+    page_size: int = 20,
+    max_pages: int = 1,
+    max_workers: int = 4,
+    rate_limiter: TokenBucket | None = None,
+    max_retries: int = 2,
+    backoff: float = 1.0,
+) -> list[Article]:
+    """Collect articles from NewsAPI for given queries, deduplicated by URL.
+
+    Queries run concurrently and share `rate_limiter`, so every page request
+    counts against the same rate and quota. Results keep query order.
+    """
+    return list(_iter_articles(
+        api_key, queries, language, page_size, max_pages, max_workers, rate_limiter, max_retries, backoff,
+    ))
+
+
+def iter_newsapi_articles(
+    api_key: str,
+    queries: list[str],
+    language: str = "en",
+    page_size: int = 20,
+    max_pages: int = 1,
+    max_workers: int = 4,
+    rate_limiter: TokenBucket | None = None,
+    max_retries: int = 2,
+    backoff: float = 1.0,
+) -> Iterator[Article]:
+    """Yield NewsAPI articles in query order, as soon as each query's pages have been fetched.
+
+    Same requests and query order as `collect_newsapi_articles`.
+    """
+    return _iter_articles(
+        api_key, queries, language, page_size, max_pages, max_workers, rate_limiter, max_retries, backoff,
+    )
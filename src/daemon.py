@@ -0,0 +1,162 @@
+"""Resident mode: poll sources on adaptive intervals and send the digest from the store.
+
+    python -m src.daemon
+
+Each RSS feed and NewsAPI query is its own source on an `AdaptiveScheduler`.
+New articles accumulate in the `ArticleStore`, so at DAEMON_DIGEST_TIME the
+digest pipeline only reads the store instead of waiting on every source.
+"""
+import signal
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import config
+from src import instrumentation
+from src.article import Article
+from src.article_store import ArticleStore
+from src.collectors.feed_cache import FeedCache
+from src.collectors.newsapi import collect_newsapi_articles
+from src.collectors.rss import collect_rss_articles
+from src.main import STORE_STAGES, run
+from src.rate_limit import TokenBucket
+from src.scheduler import AdaptiveScheduler
+
+MAX_SLEEP = 60  # seconds; bounds how late a stop request or the digest time is noticed
+DIGEST_RETRY_DELAY = 15 * 60  # seconds before retrying a failed digest
+
+
+def _sources() -> dict[str, tuple[Callable[[], list[Article]], float]]:
+    """{source name: (poll function, minimum interval)} for every feed and query."""
+    feed_cache = FeedCache(
+        config.FEED_CACHE_PATH,
+        max_entries=config.FEED_CACHE_MAX_ENTRIES,
+        max_age_days=config.FEED_CACHE_MAX_AGE_DAYS,
+    )
+    sources = {}
+    for feed in config.RSS_FEEDS:
+        sources[f"rss:{feed['name']}"] = (
+            lambda feed=feed: collect_rss_articles(
+                [feed], max_workers=1, timeout=config.RSS_FETCH_TIMEOUT,
+                cache=feed_cache, parser=config.RSS_PARSER,
+            ),
+            config.DAEMON_MIN_INTERVAL,
+        )
+
+    # Polling every query at its floor must fit in the daily request quota.
+    requests_per_poll = len(config.NEWSAPI_QUERIES) * config.NEWSAPI_MAX_PAGES
+    newsapi_floor = 86400 * requests_per_poll / config.DAEMON_NEWSAPI_DAILY_REQUESTS
+    for query in config.NEWSAPI_QUERIES:
+        sources[f"newsapi:{query}"] = (
+            lambda query=query: collect_newsapi_articles(
+                api_key=config.NEWSAPI_KEY,
+                queries=[query],
+                language=config.NEWSAPI_LANGUAGE,
+                page_size=config.NEWSAPI_PAGE_SIZE,
+                max_pages=config.NEWSAPI_MAX_PAGES,
+                max_workers=1,
+                rate_limiter=TokenBucket(
+                    rate=config.NEWSAPI_RATE_PER_SECOND,
+                    capacity=config.NEWSAPI_BURST,
+                    budget=config.NEWSAPI_MAX_PAGES * (config.NEWSAPI_MAX_RETRIES + 1),
+                ),
+                max_retries=config.NEWSAPI_MAX_RETRIES,
+            ),
+            newsapi_floor,
+        )
+    return sources
+
+
+def _digest_due(now: datetime, last_digest: str | None) -> bool:
+    """Whether today's digest time (UTC) has passed without a digest being sent."""
+    hour, minute = map(int, config.DAEMON_DIGEST_TIME.split(":"))
+    today = now.strftime("%Y-%m-%d")
+    return last_digest != today and (now.hour, now.minute) >= (hour, minute)
+
+
+def _poll(name: str, poll: Callable[[], list[Article]]) -> list[Article]:
+    try:
+        with instrumentation.timer("daemon.poll", source=name):
+            return poll()
+    except Exception as exc:
+        print(f"  Polling {name} failed: {exc}")
+        return []
+
+
+def poll_due(
+    scheduler: AdaptiveScheduler,
+    sources: dict[str, tuple[Callable[[], list[Article]], float]],
+    store: ArticleStore,
+    now: float,
+    max_workers: int = 8,
+) -> dict[str, int]:
+    """Poll every due source concurrently, store what they return and reschedule them.
+
+    Returns {source name: new articles}. A failed poll counts as nothing new.
+    """
+    due = scheduler.due(now)
+    if not due:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(due)))) as executor:
+        results = dict(zip(due, executor.map(lambda name: _poll(name, sources[name][0]), due)))
+    new = {}
+    for name, articles in results.items():
+        new[name] = store.add(articles)
+        interval = scheduler.record(name, new[name], now)
+        print(f"  {name}: {new[name]} new, next poll in {interval / 60:.0f} min")
+    store.set_state("schedule", scheduler.state())
+    return new
+
+
+def run_daemon(stop: threading.Event | None = None) -> None:
+    """Poll sources until `stop` is set, sending the digest once a day."""
+    stop = stop or threading.Event()
+    store = ArticleStore(config.ARTICLE_STORE_PATH, retention_hours=config.ARTICLE_STORE_RETENTION_HOURS)
+    sources = _sources()
+    scheduler = AdaptiveScheduler(
+        min_interval=config.DAEMON_MIN_INTERVAL,
+        max_interval=config.DAEMON_MAX_INTERVAL,
+        target_new=config.DAEMON_TARGET_NEW_PER_POLL,
+        backoff=config.DAEMON_BACKOFF,
+    )
+    for name, (_, min_interval) in sources.items():
+        scheduler.add(name, min_interval=min_interval)
+    scheduler.load(store.get_state("schedule", {}))
+    print(f"Daemon polling {len(sources)} sources, digest daily at {config.DAEMON_DIGEST_TIME} UTC")
+
+    retry_at = 0.0
+    try:
+        while not stop.is_set():
+            poll_due(scheduler, sources, store, time.time(), max_workers=config.RSS_MAX_WORKERS)
+
+            now = datetime.now(timezone.utc)
+            if _digest_due(now, store.get_state("last_digest")) and time.time() >= retry_at:
+                try:
+                    run(STORE_STAGES)
+                except Exception as exc:
+                    # Checkpoints let the retry resume where this attempt failed.
+                    print(f"Digest failed, retrying in {DIGEST_RETRY_DELAY // 60} min: {exc}")
+                    retry_at = time.time() + DIGEST_RETRY_DELAY
+                else:
+                    store.set_state("last_digest", now.strftime("%Y-%m-%d"))
+
+            next_due = scheduler.next_due()
+            sleep = MAX_SLEEP if next_due is None else next_due - time.time()
+            stop.wait(min(max(sleep, 0.0), MAX_SLEEP))
+    finally:
+        store.close()
+
+
+def main() -> None:
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        run_daemon(stop)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
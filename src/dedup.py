@@ -0,0 +1,183 @@
+import functools
+import hashlib
+import itertools
+import re
+from collections.abc import Iterable, Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src import instrumentation
+from src.article import Article, as_article
+from src.keywords import fold_text
+
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "ref_url", "cmpid", "ocid", "guccounter", "sr_share",
+    "amp", "outputtype", "__twitter_impression",
+}
+HOST_PREFIXES = ("www.", "m.", "amp.", "mobile.")
+
+_WORD_RE = re.compile(r"\w+")
+_BAND_BITS = 8
+_BANDS = 64 // _BAND_BITS
+_BAND_PAIRS = list(itertools.combinations(range(_BANDS), 2))
+_LANE_BITS = 16
+_LANE_MASK = (1 << _LANE_BITS) - 1
+# Each byte value spread into eight 16-bit lanes, one lane per bit.
+_BYTE_LANES = [
+    sum(1 << (bit * _LANE_BITS) for bit in range(8) if value >> bit & 1)
+    for value in range(256)
+]
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize a URL so tracking, AMP and scheme variants of a story compare equal."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+
+    host = (parts.hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path
+    if path.startswith("/amp/"):
+        path = path[4:]
+    path = re.sub(r"(/amp|\.amp)/?$", "", path).rstrip("/") or "/"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def _tokens(text: str) -> list[str]:
+    return _WORD_RE.findall(fold_text(text))
+
+
+@functools.lru_cache(maxsize=65536)
+def _feature_lanes(feature: str) -> int:
+    """Hash a feature to 64 bits and spread them into lanes, so summing lane
+    ints counts every bit position in a single big-int addition."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    lanes = 0
+    for i, byte in enumerate(digest):
+        lanes |= _BYTE_LANES[byte] << (i * 8 * _LANE_BITS)
+    return lanes
+
+
+def simhash(title: str, description: str = "") -> int | None:
+    """64-bit SimHash over title unigrams/bigrams (weighted 2) and description words.
+
+    Returns None when there is too little text for a meaningful fingerprint.
+    """
+    title_tokens = _tokens(title)
+    if len(title_tokens) < 3:
+        return None
+
+    features: dict[str, int] = {}
+    for token in title_tokens:
+        features[token] = features.get(token, 0) + 2
+    for first, second in zip(title_tokens, title_tokens[1:]):
+        bigram = f"{first} {second}"
+        features[bigram] = features.get(bigram, 0) + 2
+    for token in _tokens(description)[:200]:
+        features[token] = features.get(token, 0) + 1
+
+    counts = sum(_feature_lanes(feature) * weight for feature, weight in features.items())
+    total = sum(features.values())
+    fingerprint = 0
+    for bit in range(64):
+        if 2 * (counts >> (bit * _LANE_BITS) & _LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """LSH index over SimHash fingerprints.
+
+    Fingerprints are cut into eight 8-bit bands and indexed under every pair of
+    bands (16-bit keys). Fingerprints at most 6 bits apart differ in at most six
+    bands, so they always share an identical pair: candidates come from a fixed
+    number of bucket lookups instead of pairwise comparison.
+    """
+
+    def __init__(self, max_distance: int = 6):
+        if max_distance > _BANDS - 2:
+            raise ValueError(f"max_distance must be at most {_BANDS - 2}")
+        self.max_distance = max_distance
+        self._buckets: dict[int, list[tuple[int, int]]] = {}
+
+    @staticmethod
+    def _keys(fingerprint: int) -> list[int]:
+        mask = (1 << _BAND_BITS) - 1
+        bands = [fingerprint >> (band * _BAND_BITS) & mask for band in range(_BANDS)]
+        return [
+            (pair << 16) | (bands[first] << 8) | bands[second]
+            for pair, (first, second) in enumerate(_BAND_PAIRS)
+        ]
+
+    def find(self, fingerprint: int) -> int | None:
+        """Return the id of an indexed near-duplicate, if any."""
+        for key in self._keys(fingerprint):
+            for other, item_id in self._buckets.get(key, ()):
+                if (fingerprint ^ other).bit_count() <= self.max_distance:
+                    return item_id
+        return None
+
+    def add(self, fingerprint: int, item_id: int) -> None:
+        for key in self._keys(fingerprint):
+            self._buckets.setdefault(key, []).append((fingerprint, item_id))
+
+
+def iter_unique_articles(articles: Iterable[Article | dict]) -> Iterator[Article]:
+    """Yield each story once, dropping copies by canonical URL or near-duplicate title/description.
+
+    Every yielded article is a copy with its own `related` list. Later copies of
+    the story from other sources or URLs are appended to that list as
+    {"source", "link"} dicts, even after the article has been yielded. Only
+    fingerprints and these lists are retained, not the articles themselves.
+    """
+    by_url: dict[str, int] = {}
+    index = NearDuplicateIndex()
+    kept: list[tuple[str, str | None, list[dict]]] = []
+
+    for article in map(as_article, articles):
+        with instrumentation.timer("dedup.lookup"):
+            url = canonicalize_url(article.link)
+            fingerprint = simhash(article.title, article.description)
+
+            match = by_url.get(url) if url else None
+            if match is None and fingerprint is not None:
+                match = index.find(fingerprint)
+
+        if match is None:
+            related = list(article.related)
+            if url:
+                by_url[url] = len(kept)
+            if fingerprint is not None:
+                index.add(fingerprint, len(kept))
+            kept.append((url, article.source, related))
+            yield article.evolve(related=related)
+            continue
+
+        kept_url, kept_source, related = kept[match]
+        if url != kept_url or article.source != kept_source:
+            related.append({"source": article.source, "link": article.link})
+        if url:
+            by_url.setdefault(url, match)
+
+
+def deduplicate_articles(articles: list[Article | dict]) -> list[Article]:
+    """Remove duplicate articles by canonical URL and near-duplicate title/description.
+
+    The first copy of a story is kept; other sources carrying it are listed in
+    its `related` field as {"source", "link"} dicts.
+    """
+    return list(iter_unique_articles(articles))
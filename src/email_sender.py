@@ -1,41 +1,151 @@
-import resend
+import html
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from src import instrumentation
+from src.article import Article
+from src.lazy import lazy_import
+from src.rate_limit import TokenBucket
 
-def build_email_html(articles: list[dict], date_str: str) -> str:
-    """Build a formatted HTML email with article links in titles."""
-    articles_html = ""
-    for i, article in enumerate(articles, 1):
-        titulo = article.get("titulo_pt", article["title"])
-        resumo = article.get("resumo_pt", article.get("description", ""))
-        articles_html += f"""
+resend = lazy_import("resend")
+
+MAX_RELATED_LINKS = 5  # "Também em" links listed per story
+
+
+class _Template:
+    """A str.format-style template parsed once into literal chunks and field names."""
+
+    def __init__(self, source: str):
+        self._parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(source)]
+
+    def render_into(self, out: list[str], fields: dict[str, str]) -> None:
+        """Append the rendered template to `out`; field values are inserted as given."""
+        for literal, field in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(fields[field])
+
+
+_HTML_HEADER = _Template("""
+    <div style="max-width: 600px; margin: 0 auto; font-family: -apple-system, sans-serif; color: #333;">
+        <h1 style="font-size: 22px; border-bottom: 3px solid #0066cc; padding-bottom: 8px;">
+            Novidades de IA no mundo — {date}
+        </h1>
+
+        <h2 style="font-size: 16px; margin-top: 20px;">Notícias de IA</h2>
+        <table style="width: 100%; border-collapse: collapse;">
+""")
+
+_HTML_ARTICLE = _Template("""
         <tr>
             <td style="padding: 14px 0; border-bottom: 1px solid #eee;">
-                <a href="{article['link']}" style="color: #0066cc; text-decoration: none; font-size: 16px; font-weight: bold;">
-                    {i}. {titulo}
+                <a href="{link}" style="color: #0066cc; text-decoration: none; font-size: 16px; font-weight: bold;">
+                    {n}. {titulo}
                 </a><br>
                 <p style="color: #444; font-size: 13px; line-height: 1.6; margin: 6px 0 4px 0;">
                     {resumo}
                 </p>
-                <span style="color: #999; font-size: 11px;">{article['source']}</span>
+                <span style="color: #999; font-size: 11px;">{source}</span>{related}
             </td>
-        </tr>"""
+        </tr>""")
 
-    return f"""
-    <div style="max-width: 600px; margin: 0 auto; font-family: -apple-system, sans-serif; color: #333;">
-        <h1 style="font-size: 22px; border-bottom: 3px solid #0066cc; padding-bottom: 8px;">
-            Novidades de IA no mundo — {date_str}
-        </h1>
-
-        <h2 style="font-size: 16px; margin-top: 20px;">Notícias de IA</h2>
-        <table style="width: 100%; border-collapse: collapse;">
-            {articles_html}
+_HTML_FOOTER = _Template("""
         </table>
 
         <p style="color: #999; font-size: 11px; margin-top: 24px; text-align: center;">
             Gerado automaticamente pelo Joshua AI News
         </p>
     </div>
+    """)
+
+_TEXT_HEADER = _Template("Novidades de IA no mundo — {date}\n\nNotícias de IA\n")
+_TEXT_ARTICLE = _Template("\n{n}. {titulo}\n{resumo}\n{source} — {link}\n{related}")
+_TEXT_FOOTER = _Template("\n--\nGerado automaticamente pelo Joshua AI News\n")
+
+
+def _safe_url(url: str) -> str:
+    """Only http(s) links are rendered; anything else (e.g. javascript:) becomes "#"."""
+    return url if url[:8].lower().startswith(("http://", "https://")) else "#"
+
+
+def _fields(article: Article | dict) -> tuple[str, str, str, str]:
+    """(link, title, summary, source), preferring the Portuguese title and summary.
+
+    Reads through `.get`, which Article and plain dicts both support, so
+    checkpointed dicts are rendered without converting them first.
+    """
+    return (
+        _safe_url(article.get("link") or ""),
+        article.get("titulo_pt") or article.get("title") or "",
+        article.get("resumo_pt") or article.get("description") or "",
+        article.get("source") or "",
+    )
+
+
+def _related(article: Article | dict) -> list[tuple[str, str]]:
+    """(link, source) of other coverage of the story, at most MAX_RELATED_LINKS."""
+    return [
+        (_safe_url(item.get("link") or ""), item.get("source") or "")
+        for item in (article.get("related") or [])[:MAX_RELATED_LINKS]
+    ]
+
+
+def _related_html(article: Article | dict) -> str:
+    related = _related(article)
+    if not related:
+        return ""
+    links = ", ".join(
+        f'<a href="{html.escape(link)}" style="color: #999;">{html.escape(source or link)}</a>'
+        for link, source in related
+    )
+    return f'<br><span style="color: #999; font-size: 11px;">Também em: {links}</span>'
+
+
+def _related_text(article: Article | dict) -> str:
+    related = _related(article)
+    if not related:
+        return ""
+    return "Também em: " + ", ".join(f"{source} ({link})" if source else link for link, source in related) + "\n"
+
+
+def build_email_html(articles: list[Article | dict], date_str: str) -> str:
+    """Build a formatted HTML email with article links in titles. All fields are HTML-escaped.
+
+    Other coverage of a story (its `related` list) is linked under it as "Também em".
     """
+    out: list[str] = []
+    _HTML_HEADER.render_into(out, {"date": html.escape(date_str)})
+    for i, article in enumerate(articles, 1):
+        link, titulo, resumo, source = _fields(article)
+        _HTML_ARTICLE.render_into(out, {
+            "n": str(i),
+            "link": html.escape(link),
+            "titulo": html.escape(titulo),
+            "resumo": html.escape(resumo),
+            "source": html.escape(source),
+            "related": _related_html(article),
+        })
+    _HTML_FOOTER.render_into(out, {})
+    return "".join(out)
+
+
+def build_email_text(articles: list[Article | dict], date_str: str) -> str:
+    """Build the plain-text alternative of the digest."""
+    out: list[str] = []
+    _TEXT_HEADER.render_into(out, {"date": date_str})
+    for i, article in enumerate(articles, 1):
+        link, titulo, resumo, source = _fields(article)
+        _TEXT_ARTICLE.render_into(out, {
+            "n": str(i),
+            "link": link,
+            "titulo": " ".join(titulo.split()),
+            "resumo": " ".join(resumo.split()),
+            "source": source,
+            "related": _related_text(article),
+        })
+    _TEXT_FOOTER.render_into(out, {})
+    return "".join(out)
 
 
 def send_digest_email(
@@ -44,13 +154,106 @@ def send_digest_email(
     to_email: str,
     subject: str,
     html_body: str,
+    text_body: str | None = None,
 ) -> dict:
-    """Send the digest email via Resend."""
+    """Send the digest email via Resend, with an optional plain-text part."""
     resend.api_key = api_key
 
-    return resend.Emails.send({
+    params = {
         "from": f"Joshua AI News <{from_email}>",
         "to": [to_email],
         "subject": subject,
         "html": html_body,
-    })
+    }
+    if text_body is not None:
+        params["text"] = text_body
+    return resend.Emails.send(params)
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    """A 429 that clears with time; an exhausted daily or monthly quota does not."""
+    return str(getattr(exc, "code", "")) == "429" and not str(getattr(exc, "error_type", "")).endswith("quota_exceeded")
+
+
+def _send_batch(
+    params: list[dict],
+    options: dict | None,
+    limiter: TokenBucket,
+    max_retries: int,
+    backoff: float,
+) -> dict:
+    """Send one chunk, retrying rate-limited requests with exponential backoff.
+
+    Retries reuse `options`, so the idempotency key stays the same and a chunk
+    Resend did accept is not delivered twice.
+    """
+    attempt = 0
+    while True:
+        limiter.acquire()
+        try:
+            with instrumentation.timer("resend.batch"):
+                response = resend.Batch.send(params, options)
+        except Exception as exc:
+            if attempt == max_retries or not _is_rate_limited(exc):
+                raise
+            instrumentation.count("resend.retries")
+            time.sleep(backoff * 2 ** attempt)
+            attempt += 1
+            continue
+        instrumentation.count("resend.emails", len(params))
+        return response
+
+
+def send_digest_batch(
+    api_key: str,
+    from_email: str,
+    messages: list[dict],
+    batch_size: int = 100,
+    max_workers: int = 4,
+    idempotency_key: str | None = None,
+    rate_limiter: TokenBucket | None = None,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+) -> list[dict]:
+    """Send one email per message ({"to", "subject", "html", optional "text"}) via Resend's batch endpoint.
+
+    Messages go out in chunks of `batch_size`, up to `max_workers` chunks at a
+    time, no faster than `rate_limiter` allows (by default Resend's 2 requests
+    per second). Rate-limited (429) chunks are retried up to `max_retries`
+    times. With an `idempotency_key`, each chunk carries a key derived from it,
+    so retries and reruns after a partial failure do not deliver a chunk twice.
+    Returns the sent email objects in message order.
+    """
+    resend.api_key = api_key
+    limiter = rate_limiter or TokenBucket(rate=2.0, capacity=1)
+    params = []
+    for message in messages:
+        email = {
+            "from": f"Joshua AI News <{from_email}>",
+            "to": [message["to"]],
+            "subject": message["subject"],
+            "html": message["html"],
+        }
+        if message.get("text") is not None:
+            email["text"] = message["text"]
+        params.append(email)
+    chunks = [params[start:start + batch_size] for start in range(0, len(params), batch_size)]
+    if not chunks:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        futures = [
+            executor.submit(
+                _send_batch,
+                chunk,
+                {"idempotency_key": f"{idempotency_key}/{n}"} if idempotency_key else None,
+                limiter,
+                max_retries,
+                backoff,
+            )
+            for n, chunk in enumerate(chunks)
+        ]
+    sent: list[dict] = []
+    for future in futures:
+        sent.extend(future.result().get("data", []))
+    return sent
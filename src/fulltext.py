@@ -0,0 +1,306 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src import http_client, instrumentation
+from src.article import Article, as_article
+from src.dedup import canonicalize_url
+
+MAX_TEXT_CHARS = 50_000  # extracted text kept in the cache; trimmed per use
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "button"}
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_TEXT_TAGS = {"p", "h2", "h3", "li", "blockquote", "pre"}
+_UNLIKELY = re.compile(
+    r"comment|sidebar|footer|header|menu|nav|share|social|related|promo|sponsor|advert|\bad-|cookie|subscribe|newsletter",
+    re.I,
+)
+_LIKELY = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+_CONTAINER_TAGS = {"article", "main"}
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+
+class FullTextCache:
+    """SQLite cache of extracted article text keyed by canonical URL.
+
+    Entries expire after `ttl_days` and the table is capped at `max_entries`,
+    oldest first. Pages that were fetched but yielded no text are cached as
+    "", so they are not fetched again within the TTL.
+    """
+
+    def __init__(self, path: str | Path, ttl_days: int = 7, max_entries: int = 2000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS texts (url_hash TEXT PRIMARY KEY, text TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS texts_fetched_at_idx ON texts (fetched_at)")
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.blake2b(canonicalize_url(url).encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, urls: list[str]) -> dict[str, str]:
+        """Cached text for the given URLs, keyed by the URL as passed in."""
+        keys = {self._key(url): url for url in urls}
+        found: dict[str, str] = {}
+        key_list = list(keys)
+        for start in range(0, len(key_list), 500):
+            batch = key_list[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT url_hash, text FROM texts WHERE fetched_at >= ? AND url_hash IN ({placeholders})",
+                [time.time() - self.ttl_seconds, *batch],
+            )
+            found.update((keys[key], text) for key, text in rows)
+        return found
+
+    def put_many(self, texts: dict[str, str]) -> None:
+        """Store extracted texts by URL, then expire and trim the cache."""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO texts (url_hash, text, fetched_at) VALUES (?, ?, ?)",
+                [(self._key(url), text, now) for url, text in texts.items()],
+            )
+            self._conn.execute("DELETE FROM texts WHERE fetched_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM texts WHERE url_hash IN "
+                "(SELECT url_hash FROM texts ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class _Extractor(HTMLParser):
+    """Collects text blocks with the chain of elements that contain them."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack: list[tuple[str, int]] = []  # (tag, element id)
+        self.bonus: dict[int, float] = {}
+        self.unlikely: set[int] = set()  # boilerplate-named elements, e.g. class="share-buttons"
+        self.containers: set[int] = set()  # <article> and <main> elements
+        self.blocks: list[tuple[tuple[int, ...], str, int]] = []  # (ancestor ids, text, link chars)
+        self._next_id = 0
+        self._skip = 0
+        self._block: list[str] | None = None
+        self._block_links = 0
+        self._in_link = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        if tag in _TEXT_TAGS and self._block is not None:
+            self._close_block()
+        attributes = dict(attrs)
+        names = f"{attributes.get('class') or ''} {attributes.get('id') or ''}"
+        if self._skip or tag in _SKIP_TAGS:
+            self._skip += 1
+        self._next_id += 1
+        self.stack.append((tag, self._next_id))
+        if tag in _CONTAINER_TAGS:
+            self.containers.add(self._next_id)
+        if tag in _CONTAINER_TAGS or _LIKELY.search(names):
+            self.bonus[self._next_id] = 25.0
+        elif tag != "body" and _UNLIKELY.search(names):
+            self.unlikely.add(self._next_id)
+        if self._skip:
+            return
+        if tag in _TEXT_TAGS:
+            self._block, self._block_links = [], 0
+        elif tag == "a":
+            self._in_link += 1
+
+    def handle_endtag(self, tag):
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return  # stray end tag
+        while self.stack:
+            open_tag, _ = self.stack.pop()
+            if self._skip:
+                self._skip -= 1
+            elif open_tag in _TEXT_TAGS and self._block is not None:
+                self._close_block()
+            elif open_tag == "a":
+                self._in_link = max(0, self._in_link - 1)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._block is not None and not self._skip:
+            self._block.append(data)
+            if self._in_link:
+                self._block_links += len(data.strip())
+
+    def _in_boilerplate(self, ancestors: tuple[int, ...]) -> bool:
+        """Whether a boilerplate-named element sits between the block and its nearest <article>/<main>.
+
+        Like readability's okMaybeItsACandidate: a layout wrapper named e.g.
+        "header-sticky" around the article does not hide the article itself.
+        """
+        for element_id in reversed(ancestors):
+            if element_id in self.containers:
+                return False
+            if element_id in self.unlikely:
+                return True
+        return False
+
+    def _close_block(self):
+        text = " ".join("".join(self._block).split())
+        if text:
+            ancestors = tuple(element_id for tag, element_id in self.stack if tag not in _TEXT_TAGS)
+            if not self._in_boilerplate(ancestors):
+                self.blocks.append((ancestors, text, self._block_links))
+        self._block = None
+
+
+def extract_text(html_text: str) -> str:
+    """Readability-style main text: paragraphs of the best-scoring container.
+
+    Paragraphs score their parent (and half to their grandparent) by length and
+    comma count; containers named like article/content/post get a bonus, and
+    boilerplate (nav, footer, comments, share widgets...) is skipped unless it
+    is also named like content or wraps the <article>. Link-heavy blocks are
+    ignored. Returns "" when no container has real paragraphs.
+    """
+    parser = _Extractor()
+    try:
+        parser.feed(html_text)
+        parser.close()
+    except Exception:
+        pass
+    if parser._block is not None:
+        parser._close_block()
+
+    blocks = [
+        (ancestors, text) for ancestors, text, link_chars in parser.blocks
+        if ancestors and link_chars <= len(text) / 2
+    ]
+    scores: dict[int, float] = {}
+    for ancestors, text in blocks:
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        scores[ancestors[-1]] = scores.get(ancestors[-1], parser.bonus.get(ancestors[-1], 0)) + score
+        if len(ancestors) > 1:
+            scores[ancestors[-2]] = scores.get(ancestors[-2], parser.bonus.get(ancestors[-2], 0)) + score / 2
+    if not scores:
+        return ""
+    best = max(scores, key=scores.get)
+    return "\n\n".join(text for ancestors, text in blocks if best in ancestors)[:MAX_TEXT_CHARS]
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to about `max_tokens` (~4 characters per token) at a word boundary."""
+    limit = max_tokens * 4
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    return (cut.rsplit(None, 1)[0] if " " in cut else cut) + " …"
+
+
+class _HostLimiter:
+    """One semaphore per host, so no publisher gets more than `per_host` requests at once."""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+
+def _fetch_html(url: str, timeout: float, max_bytes: int) -> str | None:
+    """Download up to `max_bytes` of an HTML page within `timeout` seconds in total.
+
+    Returns None for non-HTML responses. Bodies over the limit are cut, not
+    rejected: the article text usually comes early in the page.
+    """
+    deadline = time.monotonic() + timeout
+    with http_client.session().get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        if "html" not in response.headers.get("Content-Type", "text/html"):
+            return None
+        body = http_client.read_body(response, url, deadline, max_bytes)[:max_bytes]
+        declared = "charset" in response.headers.get("Content-Type", "").lower()
+        encoding = response.encoding if declared else None
+    instrumentation.count("fulltext.bytes", len(body))
+    if encoding is None:
+        # requests assumes ISO-8859-1 for HTML without a charset; most pages say so in a <meta>.
+        match = _META_CHARSET.search(body[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def _fetch_text(url: str, limiter: _HostLimiter, timeout: float, max_bytes: int) -> str | None:
+    """Extracted text of one page; None when the fetch failed (and should not be cached)."""
+    with limiter(url), instrumentation.timer("fulltext.fetch"):
+        try:
+            page = _fetch_html(url, timeout, max_bytes)
+        except Exception as exc:
+            print(f"  Could not fetch {url}: {exc}")
+            instrumentation.count("fulltext.pages", result="error")
+            return None
+    if page is None:
+        instrumentation.count("fulltext.pages", result="not_html")
+        return ""
+    text = extract_text(page)
+    instrumentation.count("fulltext.pages", result="extracted" if text else "empty")
+    return text
+
+
+def fetch_full_texts(
+    articles: Iterable[Article | dict],
+    cache: FullTextCache | None = None,
+    max_workers: int = 8,
+    per_host: int = 2,
+    timeout: float = 10.0,
+    max_bytes: int = 2_000_000,
+    max_tokens: int = 600,
+) -> dict[str, str]:
+    """Fetch and extract the main text of each article, trimmed to `max_tokens`.
+
+    Returns {link: text} for the articles where text was found. Pages are
+    fetched by up to `max_workers` threads over the shared keep-alive session,
+    at most `per_host` at a time per host, each read up to `max_bytes` within
+    `timeout` seconds. With a `cache`, pages extracted within its TTL are not
+    fetched again.
+    """
+    links = list(dict.fromkeys(as_article(article).link for article in articles))
+    links = [link for link in links if link.startswith(("http://", "https://"))]
+    texts = cache.get_many(links) if cache is not None else {}
+    instrumentation.count("fulltext.cache_hits", len(texts))
+    missing = [link for link in links if link not in texts]
+
+    if missing:
+        limiter = _HostLimiter(per_host)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(missing)))) as executor:
+            fetched = dict(zip(missing, executor.map(
+                lambda link: _fetch_text(link, limiter, timeout, max_bytes), missing,
+            )))
+        fetched = {link: text for link, text in fetched.items() if text is not None}
+        if cache is not None:
+            cache.put_many(fetched)
+        texts.update(fetched)
+
+    return {link: trim_to_tokens(text, max_tokens) for link, text in texts.items() if text}
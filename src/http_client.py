@@ -0,0 +1,86 @@
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "news-agent/1.0 (+https://github.com/fibonacciapp/news-agent)"
+POOL_CONNECTIONS = 32  # hosts with pooled connections kept
+POOL_MAXSIZE = 16  # keep-alive connections per host
+CHUNK_SIZE = 64 * 1024
+
+_session: requests.Session | None = None
+_lock = threading.Lock()
+
+
+def session() -> requests.Session:
+    """The process-wide keep-alive session shared by feeds, NewsAPI and article fetches.
+
+    Created on first use. Connections are pooled per host, so repeated requests
+    to one host (feeds, NewsAPI pages, several articles from one publisher)
+    skip the TCP and TLS handshakes.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def _socket(response: requests.Response) -> socket.socket | None:
+    """The socket a streamed response reads from, or None if it cannot be found."""
+    sock = getattr(getattr(response.raw, "connection", None), "sock", None)
+    if sock is None:
+        # http.client detaches the socket from the connection when the server
+        # will close it after this response; the body's reader still holds it.
+        reader = getattr(getattr(response.raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(reader, "raw", None), "_sock", None)
+    return sock
+
+
+def read_body(response: requests.Response, url: str, deadline: float, max_bytes: int | None = None) -> bytes:
+    """Read a streamed response body, raising TimeoutError once `deadline` (time.monotonic()) passes.
+
+    The per-request timeout only bounds each socket read, so a server that
+    trickles bytes could hold a read far past the deadline. A watchdog shuts
+    the connection down at the deadline instead, which unblocks a pending
+    read at once. Stops after `max_bytes`, if given; the body may then be
+    longer than that, by up to one chunk.
+    """
+    expired = threading.Event()
+
+    def expire() -> None:
+        expired.set()
+        sock = _socket(response)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    watchdog = threading.Timer(max(deadline - time.monotonic(), 0.0), expire)
+    watchdog.daemon = True
+    watchdog.start()
+    chunks, size = [], 0
+    try:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if expired.is_set() or time.monotonic() > deadline:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+            if max_bytes is not None and size >= max_bytes:
+                break
+    except Exception:
+        if not expired.is_set():
+            raise
+    finally:
+        watchdog.cancel()
+    # A shut-down socket can also look like a clean end of the body.
+    if expired.is_set() or time.monotonic() > deadline:
+        raise TimeoutError(f"Timed out fetching {url}")
+    return b"".join(chunks)
@@ -0,0 +1,217 @@
+import functools
+import json
+import re
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+_NULL_TIMER = nullcontext()
+
+_lock = threading.Lock()
+_enabled = False
+_started = time.time()
+_timers: dict[tuple, list[float]] = {}  # key → [count, total seconds, max seconds]
+_counters: dict[tuple, float] = {}
+
+
+def enable() -> None:
+    """Start recording, discarding anything recorded before."""
+    global _enabled
+    reset()
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    global _started
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+        _started = time.time()
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted((key, str(value)) for key, value in labels.items())))
+
+
+class _Timer:
+    __slots__ = ("_key", "_start")
+
+    def __init__(self, key: tuple):
+        self._key = key
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _observe(self._key, time.perf_counter() - self._start)
+        return False
+
+
+def _observe(key: tuple, seconds: float) -> None:
+    with _lock:
+        stats = _timers.setdefault(key, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+
+
+def timer(name: str, **labels):
+    """Context manager timing a block. A shared no-op when instrumentation is disabled."""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(_key(name, labels))
+
+
+def timed(name: str, **labels):
+    """Decorator form of `timer`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(_key(name, labels)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    """Record a duration measured elsewhere, as if it had been timed with `timer`."""
+    if _enabled:
+        _observe(_key(name, labels), seconds)
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Add `value` to a counter. Does nothing when instrumentation is disabled."""
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def report() -> dict:
+    """Everything recorded so far as a JSON-ready dict."""
+    with _lock:
+        timers = [
+            {"name": name, "labels": dict(labels), "count": stats[0],
+             "total_seconds": round(stats[1], 6), "max_seconds": round(stats[2], 6)}
+            for (name, labels), stats in sorted(_timers.items())
+        ]
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+    return {
+        "started_at": _started,
+        "duration_seconds": round(time.time() - _started, 6),
+        "timers": timers,
+        "counters": counters,
+    }
+
+
+def _metric_name(name: str) -> str:
+    return "news_agent_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _prometheus_labels(labels: dict, **extra: str) -> str:
+    parts = [
+        '{}="{}"'.format(key, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for key, value in {**labels, **extra}.items()
+    ]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def to_prometheus(data: dict | None = None) -> str:
+    """Render a report in the Prometheus text exposition format (e.g. for a textfile collector)."""
+    data = data or report()
+    lines: list[str] = []
+    declared: set[str] = set()
+    for entry in data["timers"]:
+        metric = _metric_name(entry["name"]) + "_seconds"
+        if metric not in declared:
+            declared.add(metric)
+            lines.append(f"# TYPE {metric} summary")
+        labels = entry["labels"]
+        lines.append(f"{metric}_sum{_prometheus_labels(labels)} {entry['total_seconds']}")
+        lines.append(f"{metric}_count{_prometheus_labels(labels)} {entry['count']}")
+        lines.append(f"{metric}{_prometheus_labels(labels, quantile='1')} {entry['max_seconds']}")
+    for entry in data["counters"]:
+        metric = _metric_name(entry["name"]) + "_total"
+        if metric not in declared:
+            declared.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{_prometheus_labels(entry['labels'])} {entry['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def _otlp_attributes(labels: dict) -> list[dict]:
+    return [{"key": key, "value": {"stringValue": value}} for key, value in labels.items()]
+
+
+def to_otlp(data: dict | None = None) -> dict:
+    """Render a report as an OTLP/JSON metrics payload (the body of an /v1/metrics export)."""
+    data = data or report()
+    start = int(data["started_at"] * 1e9)
+    end = int((data["started_at"] + data["duration_seconds"]) * 1e9)
+    metrics: dict[str, dict] = {}
+    for entry in data["timers"]:
+        metric = metrics.setdefault(entry["name"], {
+            "name": entry["name"], "unit": "s", "summary": {"dataPoints": []},
+        })
+        metric["summary"]["dataPoints"].append({
+            "attributes": _otlp_attributes(entry["labels"]),
+            "startTimeUnixNano": str(start),
+            "timeUnixNano": str(end),
+            "count": str(entry["count"]),
+            "sum": entry["total_seconds"],
+            "quantileValues": [{"quantile": 1.0, "value": entry["max_seconds"]}],
+        })
+    for entry in data["counters"]:
+        metric = metrics.setdefault(entry["name"], {
+            "name": entry["name"],
+            "sum": {"dataPoints": [], "aggregationTemporality": 2, "isMonotonic": True},
+        })
+        metric["sum"]["dataPoints"].append({
+            "attributes": _otlp_attributes(entry["labels"]),
+            "startTimeUnixNano": str(start),
+            "timeUnixNano": str(end),
+            "asDouble": float(entry["value"]),
+        })
+    return {
+        "resourceMetrics": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "news-agent"}}]},
+            "scopeMetrics": [{"scope": {"name": "news_agent"}, "metrics": list(metrics.values())}],
+        }],
+    }
+
+
+def write_reports(
+    report_path: str | Path | None,
+    prometheus_path: str | Path | None = None,
+    otlp_path: str | Path | None = None,
+) -> dict:
+    """Write the JSON run report and, when paths are given, the Prometheus and OTLP exports."""
+    data = report()
+    outputs = [
+        (report_path, lambda: json.dumps(data, indent=2)),
+        (prometheus_path, lambda: to_prometheus(data)),
+        (otlp_path, lambda: json.dumps(to_otlp(data))),
+    ]
+    for path, render in outputs:
+        if path:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(render(), encoding="utf-8")
+    return data
@@ -0,0 +1,49 @@
+import functools
+import re
+import unicodedata
+
+
+def fold_text(text: str) -> str:
+    """Casefold and strip accents, so "Inteligência" and "inteligencia" compare equal."""
+    folded = text.casefold()
+    if folded.isascii():
+        return folded
+    folded = unicodedata.normalize("NFKD", folded)
+    return "".join(c for c in folded if not unicodedata.combining(c))
+
+
+class KeywordMatcher:
+    """Whole-word, accent-insensitive matcher compiled once for a keyword list.
+
+    All keywords are folded into a single alternation regex, longest first.
+    A trailing plural "s" is accepted ("LLMs" matches "llm"), but a keyword
+    never matches inside a longer word ("ai" does not match "said").
+    """
+
+    def __init__(self, keywords: list[str] | tuple[str, ...]):
+        self._originals: dict[str, str] = {}
+        for keyword in keywords:
+            self._originals.setdefault(" ".join(fold_text(keyword).split()), keyword)
+        alternatives = sorted(self._originals, key=len, reverse=True)
+        body = "|".join(re.escape(keyword).replace(r"\ ", r"\s+") for keyword in alternatives)
+        self._pattern = re.compile(rf"(?<!\w)({body})s?(?!\w)") if alternatives else None
+
+    def matches(self, text: str) -> dict[str, int]:
+        """Return each matched keyword (as configured) with its number of hits."""
+        return self.matches_folded(fold_text(text))
+
+    def matches_folded(self, folded: str) -> dict[str, int]:
+        """`matches` for text already passed through `fold_text`, so it can be folded once for many matchers."""
+        if self._pattern is None:
+            return {}
+        hits: dict[str, int] = {}
+        for match in self._pattern.finditer(folded):
+            keyword = self._originals[" ".join(match.group(1).split())]
+            hits[keyword] = hits.get(keyword, 0) + 1
+        return hits
+
+
+@functools.lru_cache(maxsize=32)
+def get_matcher(keywords: tuple[str, ...]) -> KeywordMatcher:
+    """Return the compiled matcher for `keywords`, building it on first use."""
+    return KeywordMatcher(keywords)
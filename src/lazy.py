@@ -0,0 +1,44 @@
+import importlib
+import sys
+import threading
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Stands in for a module until an attribute is first read or written."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _lazy_load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = self.__dict__["_lazy_module"] = importlib.import_module(self.__name__)
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._lazy_load(), attr)
+
+    def __setattr__(self, attr: str, value) -> None:
+        setattr(self._lazy_load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._lazy_load(), attr)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """Return `name` as a module that is only imported when first used.
+
+    Keeps heavy SDKs (anthropic pulls in httpx and pydantic) off the startup
+    path of runs that never call them. Loading is thread-safe, and attribute
+    writes (e.g. `resend.api_key = ...` or `unittest.mock.patch`) go to the
+    real module.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name)
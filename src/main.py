@@ -1,86 +1,351 @@
-from datetime import datetime
+import hashlib
+import itertools
+import json
+import shutil
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 import config
-from src.collectors.rss import collect_rss_articles
-from src.collectors.newsapi import collect_newsapi_articles
+from src import instrumentation
+from src.article import Article, as_article
+from src.article_store import ArticleStore
+from src.clustering import cluster_articles
+from src.collectors.feed_cache import FeedCache
+from src.collectors.rss import iter_rss_articles
+from src.collectors.newsapi import iter_newsapi_articles
+from src.dedup import iter_unique_articles
+from src.keywords import get_matcher
+from src.pipeline import Pipeline, Stage
+from src.profiles import Profile, ProfileMatcher
+from src.rate_limit import TokenBucket
+from src.ranking import StreamRanker
+from src.seen_index import SeenIndex
 from src.summarizer import summarize_articles
-from src.email_sender import build_email_html, send_digest_email
+from src.summary_cache import SummaryCache
+from src.email_sender import build_email_html, build_email_text, send_digest_batch
+from src.fulltext import FullTextCache, fetch_full_texts
 
 
-def deduplicate_articles(articles: list[dict]) -> list[dict]:
-    """Remove duplicate articles by URL."""
-    seen: set[str] = set()
-    unique: list[dict] = []
-    for article in articles:
-        url = article.get("link", "")
-        if url not in seen:
-            seen.add(url)
-            unique.append(article)
-    return unique
+def iter_ai_articles(articles: Iterable[Article | dict], keywords: list[str]) -> Iterator[Article]:
+    """Yield articles that match AI-related keywords, with a `keyword_hits` dict of keyword → count."""
+    matcher = get_matcher(tuple(keywords))
+    for article in map(as_article, articles):
+        hits = matcher.matches(f"{article.title} {article.description}")
+        if hits:
+            yield article.evolve(keyword_hits=hits)
+
+
+def filter_ai_articles(articles: list[Article | dict], keywords: list[str]) -> list[Article]:
+    """Keep only articles that match AI-related keywords in title or description.
+
+    Kept articles carry a `keyword_hits` dict of matched keyword → count.
+    """
+    return list(iter_ai_articles(articles, keywords))
+
+
+class _Counter:
+    """Counts the items passing through an iterator, for progress output."""
+
+    def __init__(self, iterable: Iterable):
+        self.count = 0
+        self._iterable = iterable
+
+    def __iter__(self) -> Iterator:
+        for item in self._iterable:
+            self.count += 1
+            yield item
+
+
+MESES_PT = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro",
+}
 
 
-def filter_ai_articles(articles: list[dict], keywords: list[str]) -> list[dict]:
-    """Keep only articles that match AI-related keywords in title or description."""
-    filtered = []
+def _profiles() -> list[Profile]:
+    return [Profile.from_dict(profile) for profile in config.PROFILES]
+
+
+def _rank_profiles(articles: Iterable[Article]) -> tuple[dict[str, list[dict]], dict[str, int]]:
+    """Run deduplicated articles through each profile's keyword filter, delivered-skip,
+    ranking and topic clustering. Returns ({profile name: top-N articles},
+    {profile name: relevant count}); other coverage of a selected story is in its `related`."""
+    seen_index = SeenIndex(
+        config.SEEN_INDEX_PATH,
+        ttl_days=config.SEEN_TTL_DAYS,
+        max_entries=config.SEEN_MAX_ENTRIES,
+    )
+    profiles = _profiles()
+    matcher = ProfileMatcher(profiles)
+    rankers = {
+        profile.name: StreamRanker(
+            profile.max_articles,
+            source_weights=config.SOURCE_WEIGHTS,
+            half_life_hours=config.RANKING_HALF_LIFE_HOURS,
+        )
+        for profile in profiles
+    }
+    relevant = dict.fromkeys(rankers, 0)
+
     for article in articles:
-        text = f"{article.get('title', '')} {article.get('description', '')}".lower()
-        if any(kw in text for kw in keywords):
-            filtered.append(article)
-    return filtered
+        with instrumentation.timer("select.filter"):
+            for name, hits in matcher.matches(article).items():
+                if not seen_index.is_seen(article, scope=name):
+                    relevant[name] += 1
+                    rankers[name].add(article.evolve(keyword_hits=hits))
+    seen_index.close()
+    selected = {}
+    for name, ranker in rankers.items():
+        if config.CLUSTER_SIMILARITY:
+            # Cluster the whole candidate pool, so stories folded into a better-ranked
+            # one free their slots for the next topics.
+            with instrumentation.timer("select.cluster", profile=name):
+                ranked = cluster_articles(ranker.result(limit=ranker.capacity), config.CLUSTER_SIMILARITY)
+            ranked = ranked[:ranker.k]
+        else:
+            ranked = ranker.result()
+        selected[name] = [article.to_dict() for article in ranked]
+    return selected, relevant
 
 
-def run():
-    """Main pipeline: collect → filter → deduplicate → summarize → email."""
-    print("Collecting RSS articles...")
-    rss_articles = collect_rss_articles(config.RSS_FEEDS)
-    print(f"  Found {len(rss_articles)} RSS articles")
+def _report_selection(selected: dict[str, list[dict]], relevant: dict[str, int]) -> None:
+    for name, articles in selected.items():
+        print(f"  {name}: {relevant[name]} relevant and not yet delivered, top {len(articles)} selected")
+        instrumentation.count("articles", relevant[name], step="filter", profile=name)
+        instrumentation.count("articles", len(articles), step="rank", profile=name)
 
-    print("Collecting NewsAPI articles...")
-    newsapi_articles = collect_newsapi_articles(
+
+def _select_stage(results: dict) -> dict[str, list[dict]]:
+    """Stream collected articles through dedup once, then each profile's keyword filter,
+    delivered-skip and top-N ranking. Returns {profile name: articles}."""
+    print("Collecting RSS and NewsAPI articles...")
+    rss = _Counter(iter_rss_articles(
+        config.RSS_FEEDS,
+        max_workers=config.RSS_MAX_WORKERS,
+        timeout=config.RSS_FETCH_TIMEOUT,
+        parser=config.RSS_PARSER,
+        cache=FeedCache(
+            config.FEED_CACHE_PATH,
+            max_entries=config.FEED_CACHE_MAX_ENTRIES,
+            max_age_days=config.FEED_CACHE_MAX_AGE_DAYS,
+        ),
+    ))
+    newsapi = _Counter(iter_newsapi_articles(
         api_key=config.NEWSAPI_KEY,
         queries=config.NEWSAPI_QUERIES,
         language=config.NEWSAPI_LANGUAGE,
         page_size=config.NEWSAPI_PAGE_SIZE,
-    )
-    print(f"  Found {len(newsapi_articles)} NewsAPI articles")
+        max_pages=config.NEWSAPI_MAX_PAGES,
+        max_workers=config.NEWSAPI_MAX_WORKERS,
+        rate_limiter=TokenBucket(
+            rate=config.NEWSAPI_RATE_PER_SECOND,
+            capacity=config.NEWSAPI_BURST,
+            budget=config.NEWSAPI_MAX_REQUESTS_PER_RUN,
+        ),
+        max_retries=config.NEWSAPI_MAX_RETRIES,
+    ))
+
+    # Sources are read in a fixed order (RSS feeds, then NewsAPI queries, each in
+    # config order): dedup keeps the first copy of a story, so the digest must not
+    # depend on which fetch finished first.
+    unique = _Counter(iter_unique_articles(itertools.chain(rss, newsapi)))
+    selected, relevant = _rank_profiles(unique)
+
+    print(f"  Found {rss.count} RSS articles")
+    print(f"  Found {newsapi.count} NewsAPI articles")
+    print(f"  Total unique: {unique.count}")
+    instrumentation.count("articles", rss.count, step="collect_rss")
+    instrumentation.count("articles", newsapi.count, step="collect_newsapi")
+    instrumentation.count("articles", unique.count, step="dedup")
+    _report_selection(selected, relevant)
+    return selected
+
 
-    all_articles = deduplicate_articles(rss_articles + newsapi_articles)
-    print(f"  Total unique: {len(all_articles)}")
+def _store_select_stage(results: dict) -> dict[str, list[dict]]:
+    """Like `_select_stage`, but reads the last 24 hours from the article store
+    that daemon mode fills, instead of collecting from every source now."""
+    print("Selecting from the article store...")
+    store = ArticleStore(config.ARTICLE_STORE_PATH, retention_hours=config.ARTICLE_STORE_RETENTION_HOURS)
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
+    unique = _Counter(iter_unique_articles(store.iter_since(cutoff)))
+    selected, relevant = _rank_profiles(unique)
+    store.close()
 
-    ai_articles = filter_ai_articles(all_articles, config.AI_KEYWORDS)
-    top_articles = ai_articles[: config.MAX_ARTICLES_TO_SUMMARIZE]
-    print(f"  AI-related: {len(ai_articles)}, sending top {len(top_articles)}")
+    print(f"  Total unique: {unique.count}")
+    instrumentation.count("articles", unique.count, step="dedup")
+    _report_selection(selected, relevant)
+    return selected
 
+
+def _enrich_stage(results: dict) -> dict[str, str]:
+    """Full text of the selected articles, {link: text}. Empty when enrichment is off."""
+    if not config.FULLTEXT_ENABLED:
+        return {}
+    articles = list({
+        article["link"]: article for selected in results["select"].values() for article in selected
+    }.values())
+    print(f"Fetching full text of {len(articles)} articles...")
+    cache = FullTextCache(
+        config.FULLTEXT_CACHE_PATH,
+        ttl_days=config.FULLTEXT_CACHE_TTL_DAYS,
+        max_entries=config.FULLTEXT_CACHE_MAX_ENTRIES,
+    )
+    texts = fetch_full_texts(
+        articles,
+        cache=cache,
+        max_workers=config.FULLTEXT_MAX_WORKERS,
+        per_host=config.FULLTEXT_PER_HOST,
+        timeout=config.FULLTEXT_TIMEOUT,
+        max_bytes=config.FULLTEXT_MAX_BYTES,
+        max_tokens=config.FULLTEXT_MAX_TOKENS,
+    )
+    cache.close()
+    print(f"  Text extracted for {len(texts)} articles")
+    return texts
+
+
+def _summarize_stage(results: dict) -> dict:
     print("Summarizing with Claude...")
+    summary_cache = SummaryCache(
+        config.SUMMARY_CACHE_PATH,
+        ttl_days=config.SUMMARY_CACHE_TTL_DAYS,
+        max_entries=config.SUMMARY_CACHE_MAX_ENTRIES,
+    )
+    # Profiles often share articles; each is summarized once.
+    texts = results.get("enrich") or {}
+    articles = list({
+        article["link"]: {**article, "content": texts.get(article["link"], "")}
+        for selected in results["select"].values() for article in selected
+    }.values())
     result = summarize_articles(
-        articles=top_articles,
+        articles=articles,
         api_key=config.ANTHROPIC_API_KEY,
         model=config.ANTHROPIC_MODEL,
+        chunk_input_tokens=config.SUMMARY_CHUNK_INPUT_TOKENS,
+        chunk_max_articles=config.SUMMARY_CHUNK_MAX_ARTICLES,
+        max_workers=config.SUMMARY_MAX_WORKERS,
+        max_retries=config.SUMMARY_MAX_RETRIES,
+        cache=summary_cache,
+        stream=config.SUMMARY_STREAMING,
+        backend=config.SUMMARY_BACKEND,
+        batch_deadline=config.SUMMARY_BATCH_DEADLINE,
+        batch_poll_interval=config.SUMMARY_BATCH_POLL_INTERVAL,
     )
+    summary_cache.close()
+    if result.get("failed_indices"):
+        print(f"  {len(result['failed_indices'])} articles kept untranslated")
+    if result.get("usage"):
+        usage = result["usage"]
+        print(
+            f"  Tokens: {usage['input_tokens']} in "
+            f"({usage['cache_read_input_tokens']} cache reads, {usage['cache_creation_input_tokens']} cache writes), "
+            f"{usage['output_tokens']} out over {len(usage['calls'])} calls"
+        )
+    return {**result, "articles": [as_article(article).to_dict() for article in result["articles"]]}
 
-    MESES_PT = {
-        1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-        5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-        9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro",
-    }
+
+def _render_stage(results: dict) -> dict[str, dict]:
     now = datetime.now()
     date_str = f"{now.day} de {MESES_PT[now.month]} de {now.year}"
     subject = f"Novidades de IA no mundo — {date_str}"
 
-    html = build_email_html(
-        articles=result["articles"],
-        date_str=date_str,
-    )
+    summarized = {article["link"]: article for article in results["summarize"]["articles"]}
+    rendered = {}
+    for name, selected in results["select"].items():
+        articles = [summarized.get(article["link"], article) for article in selected]
+        rendered[name] = {
+            "subject": subject,
+            "html": build_email_html(articles=articles, date_str=date_str),
+            "text": build_email_text(articles=articles, date_str=date_str),
+        }
+    return rendered
+
 
-    print(f"Sending email to {config.EMAIL_TO}...")
-    send_result = send_digest_email(
+def _send_stage(results: dict) -> dict:
+    profiles = _profiles()
+    messages = [
+        {"to": recipient, **results["render"][profile.name]}
+        for profile in profiles
+        if profile.name in results["render"]
+        for recipient in profile.recipients
+    ]
+    print(f"Sending {len(messages)} emails to {len(profiles)} profiles...")
+    # Derived from the rendered digests: a resumed run reuses the key (no double
+    # delivery of chunks that went out), while a new digest gets a new one.
+    digest = hashlib.sha256(json.dumps(results["render"], sort_keys=True).encode("utf-8")).hexdigest()
+    sent = send_digest_batch(
         api_key=config.RESEND_API_KEY,
         from_email=config.EMAIL_FROM,
-        to_email=config.EMAIL_TO,
-        subject=subject,
-        html_body=html,
+        messages=messages,
+        batch_size=config.RESEND_BATCH_SIZE,
+        max_workers=config.RESEND_MAX_WORKERS,
+        idempotency_key=f"news-agent-{digest[:32]}",
+        rate_limiter=TokenBucket(rate=config.RESEND_RATE_PER_SECOND, capacity=1),
+        max_retries=config.RESEND_MAX_RETRIES,
     )
-    print(f"  Email sent! ID: {send_result.get('id', 'unknown')}")
+    print(f"  {len(sent)} emails sent")
+
+    seen_index = SeenIndex(
+        config.SEEN_INDEX_PATH,
+        ttl_days=config.SEEN_TTL_DAYS,
+        max_entries=config.SEEN_MAX_ENTRIES,
+    )
+    for profile in profiles:
+        if profile.recipients:
+            seen_index.mark_seen(results["select"].get(profile.name, []), scope=profile.name)
+    seen_index.close()
+    return {"ids": [email.get("id") for email in sent]}
+
+
+STAGES = [
+    Stage("select", _select_stage),
+    Stage("enrich", _enrich_stage, ["select"]),
+    Stage("summarize", _summarize_stage, ["select", "enrich"]),
+    Stage("render", _render_stage, ["summarize"]),
+    Stage("send", _send_stage, ["render"]),
+]
+# Daemon mode: the digest is assembled from articles already in the store.
+STORE_STAGES = [Stage("select", _store_select_stage), *STAGES[1:]]
+
+
+def _checkpoint_dir(now: datetime) -> Path:
+    """Checkpoints are kept per day; leftovers from earlier days are discarded."""
+    root = Path(config.CHECKPOINT_DIR)
+    run_dir = root / now.strftime("%Y-%m-%d")
+    if root.is_dir():
+        for old in root.iterdir():
+            if old != run_dir:
+                shutil.rmtree(old, ignore_errors=True)
+    return run_dir
+
+
+def run(stages: list[Stage] = STAGES):
+    """Main pipeline: collect → deduplicate → filter, skip delivered and rank per profile → fetch full text
+    → summarize → render → send.
+
+    Collection through ranking is one streaming stage: RSS and NewsAPI articles
+    flow through dedup once and then through each profile's filter, in feed
+    and query order as each source is fetched, and only the top-N candidates per profile are held in memory.
+    Articles selected by several profiles are summarized once. Each stage is
+    checkpointed, so rerunning after a failure (e.g. in sending) resumes
+    without re-fetching feeds or re-calling Claude. Daemon mode passes
+    `STORE_STAGES` to build the digest from its article store.
+    """
+    if config.METRICS_ENABLED:
+        instrumentation.enable()
+    try:
+        Pipeline(stages, _checkpoint_dir(datetime.now())).run()
+    finally:
+        if instrumentation.is_enabled():
+            data = instrumentation.write_reports(
+                config.METRICS_REPORT_PATH,
+                prometheus_path=config.METRICS_PROMETHEUS_PATH,
+                otlp_path=config.METRICS_OTLP_PATH,
+            )
+            print(f"Run report written to {config.METRICS_REPORT_PATH} ({data['duration_seconds']:.1f}s)")
+            instrumentation.disable()
 
 
 if __name__ == "__main__":
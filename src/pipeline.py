@@ -0,0 +1,137 @@
+import gzip
+import json
+import queue
+import shutil
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src import instrumentation
+
+
+_DONE = object()
+
+
+def merge_iterators(*iterables: Iterable, maxsize: int = 1000) -> Iterator:
+    """Interleave several iterators, each drained by its own thread, as items arrive.
+
+    The bounded queue applies backpressure to fast producers. An exception in
+    any producer is re-raised in the consumer.
+    """
+    items: queue.Queue = queue.Queue(maxsize=maxsize)
+
+    def drain(iterable: Iterable) -> None:
+        try:
+            for item in iterable:
+                items.put((True, item))
+        except Exception as exc:
+            items.put((False, exc))
+        finally:
+            items.put((True, _DONE))
+
+    for iterable in iterables:
+        threading.Thread(target=drain, args=(iterable,), daemon=True).start()
+
+    remaining = len(iterables)
+    while remaining:
+        ok, item = items.get()
+        if not ok:
+            raise item
+        if item is _DONE:
+            remaining -= 1
+            continue
+        yield item
+
+
+@dataclass
+class Stage:
+    """A pipeline step. `func` receives the outputs of earlier stages keyed by name."""
+
+    name: str
+    func: Callable[[dict[str, Any]], Any]
+    depends_on: list[str] = field(default_factory=list)
+
+
+class Pipeline:
+    """Runs stages as soon as their dependencies finish, checkpointing each output.
+
+    Every finished stage is written to `checkpoint_dir` as gzipped JSON, so a
+    rerun after a failure resumes from the first incomplete stage. Stages
+    without a dependency between them run concurrently. Checkpoints are removed
+    once the whole pipeline succeeds.
+    """
+
+    def __init__(self, stages: list[Stage], checkpoint_dir: str | Path, max_workers: int = 4):
+        names = {stage.name for stage in stages}
+        for stage in stages:
+            missing = set(stage.depends_on) - names
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown stages: {sorted(missing)}")
+        self.stages = stages
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.max_workers = max_workers
+
+    def _checkpoint_path(self, name: str) -> Path:
+        return self.checkpoint_dir / f"{name}.json.gz"
+
+    def load_checkpoint(self, name: str) -> tuple[bool, Any]:
+        """Return (found, output) for a stage's checkpoint."""
+        try:
+            with gzip.open(self._checkpoint_path(name), "rt", encoding="utf-8") as f:
+                return True, json.load(f)
+        except (FileNotFoundError, EOFError, OSError, json.JSONDecodeError):
+            return False, None
+
+    def _save_checkpoint(self, name: str, output: Any) -> None:
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self._checkpoint_path(name)
+        tmp_path = path.with_suffix(".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(output, f, ensure_ascii=False, separators=(",", ":"))
+        tmp_path.replace(path)
+
+    @staticmethod
+    def _run_stage(stage: Stage, results: dict[str, Any]) -> Any:
+        with instrumentation.timer("pipeline.stage", stage=stage.name):
+            return stage.func(results)
+
+    def run(self) -> dict[str, Any]:
+        """Run (or resume) the pipeline and return every stage's output."""
+        results: dict[str, Any] = {}
+        for stage in self.stages:
+            found, output = self.load_checkpoint(stage.name)
+            if found:
+                print(f"Resuming: {stage.name} loaded from checkpoint")
+                instrumentation.count("pipeline.resumed_stages", stage=stage.name)
+                results[stage.name] = output
+
+        pending = [stage for stage in self.stages if stage.name not in results]
+        running = {}
+        error: Exception | None = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while running or (pending and error is None):
+                if error is None:
+                    for stage in list(pending):
+                        if all(dep in results for dep in stage.depends_on):
+                            pending.remove(stage)
+                            running[executor.submit(self._run_stage, stage, dict(results))] = stage
+                    if not running:
+                        raise RuntimeError(f"Unsatisfiable stages: {[stage.name for stage in pending]}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        results[stage.name] = future.result()
+                    except Exception as exc:
+                        error = error or exc
+                        continue
+                    self._save_checkpoint(stage.name, results[stage.name])
+
+        if error is not None:
+            raise error
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+        return results
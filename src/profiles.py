@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+from src.article import Article
+from src.keywords import KeywordMatcher, fold_text, get_matcher
+
+
+@dataclass(frozen=True)
+class Profile:
+    """A digest audience: its keyword filter, how many articles it gets, and who receives it."""
+
+    name: str
+    keywords: tuple[str, ...]
+    recipients: tuple[str, ...]
+    max_articles: int = 15
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Profile":
+        return cls(
+            name=data["name"],
+            keywords=tuple(data["keywords"]),
+            recipients=tuple(data.get("recipients", ())),
+            max_articles=data.get("max_articles", 15),
+        )
+
+
+class ProfileMatcher:
+    """Keyword hits of one article for every profile.
+
+    Article text is folded once and shared by each profile's compiled matcher;
+    profiles with the same keywords share the matcher itself.
+    """
+
+    def __init__(self, profiles: list[Profile]):
+        self._matchers: dict[str, KeywordMatcher] = {
+            profile.name: get_matcher(profile.keywords) for profile in profiles
+        }
+
+    def matches(self, article: Article) -> dict[str, dict[str, int]]:
+        """Return {profile name: keyword hits} for the profiles the article matches."""
+        folded = fold_text(f"{article.title} {article.description}")
+        hits_by_profile = {}
+        for name, matcher in self._matchers.items():
+            hits = matcher.matches_folded(folded)
+            if hits:
+                hits_by_profile[name] = hits
+        return hits_by_profile
@@ -0,0 +1,118 @@
+import heapq
+import math
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from src.article import Article, parse_datetime
+
+
+def score_article(
+    article: Article | dict,
+    now: datetime,
+    source_weights: dict[str, float] | None = None,
+    half_life_hours: float = 12.0,
+) -> float:
+    """Score an article by keyword density, recency, source weight and corroboration.
+
+    - keywords: distinct keywords matched plus hit density over the text length
+    - recency: halves every `half_life_hours`; undated articles count as one half-life old
+    - corroboration: other sources that carried the same story (see `related`)
+    """
+    hits = article.get("keyword_hits") or {}
+    words = len(f"{article.get('title') or ''} {article.get('description') or ''}".split()) or 1
+    keyword_score = len(hits) + min(10 * sum(hits.values()) / words, 2.0)
+
+    published = parse_datetime(article.get("published"))
+    age_hours = (now - published).total_seconds() / 3600 if published else half_life_hours
+    recency = math.pow(0.5, max(age_hours, 0.0) / half_life_hours)
+
+    sources = {related.get("source") for related in article.get("related", [])}
+    sources.discard(article.get("source"))
+
+    weight = (source_weights or {}).get(article.get("source"), 1.0)
+    return weight * (1 + keyword_score) * (0.5 + recency) * (1 + 0.5 * len(sources))
+
+
+def _rank_key(score: float, article: Article | dict) -> tuple[float, float, str]:
+    """Ordering shared by rank_articles and StreamRanker: score, then the newer article, then link."""
+    published = parse_datetime(article.get("published"))
+    return score, published.timestamp() if published else -math.inf, article.get("link") or ""
+
+
+def rank_articles(
+    articles: list[Article | dict],
+    k: int,
+    source_weights: dict[str, float] | None = None,
+    half_life_hours: float = 12.0,
+    now: datetime | None = None,
+) -> list[Article | dict]:
+    """Return the `k` highest-scoring articles, best first.
+
+    Uses a heap-based top-k rather than a full sort. Equal scores go to the
+    newer article, then by link (see `_rank_key`); full ties keep input order.
+    """
+    now = now or datetime.now(timezone.utc)
+    scored = (
+        (_rank_key(score_article(article, now, source_weights, half_life_hours), article), -i, article)
+        for i, article in enumerate(articles)
+    )
+    return [article for _, _, article in heapq.nlargest(k, scored, key=lambda item: item[:2])]
+
+
+class StreamRanker:
+    """Incremental top-k: `add` articles as they arrive, then take the `result`.
+
+    Memory is bounded to `k * slack` candidates, kept in a min-heap by their
+    score on arrival. Corroboration can still grow after an article arrives
+    (see `related`), so the retained candidates are rescored before the final
+    cut. Eviction and the final cut break ties with the same key as
+    `rank_articles` (arrival order last), so unless corroboration changes a
+    score, the result is the top-k `rank_articles` returns for the same stream.
+    """
+
+    def __init__(
+        self,
+        k: int,
+        source_weights: dict[str, float] | None = None,
+        half_life_hours: float = 12.0,
+        now: datetime | None = None,
+        slack: int = 4,
+    ):
+        self.k = k
+        self.source_weights = source_weights
+        self.half_life_hours = half_life_hours
+        self.now = now or datetime.now(timezone.utc)
+        self.capacity = max(k * slack, k)
+        self._heap: list[tuple[tuple[float, float, str], int, Article | dict]] = []
+        self._seq = 0
+
+    def add(self, article: Article | dict) -> None:
+        score = score_article(article, self.now, self.source_weights, self.half_life_hours)
+        item = (_rank_key(score, article), -self._seq, article)
+        self._seq += 1
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def result(self, limit: int | None = None) -> list[Article | dict]:
+        """The best `limit` (default `k`) articles seen so far, best first."""
+        candidates = [article for _, _, article in sorted(self._heap, key=lambda item: -item[1])]
+        return rank_articles(
+            candidates, limit or self.k, self.source_weights, self.half_life_hours, self.now,
+        )
+
+
+def rank_stream(
+    articles: Iterable[Article | dict],
+    k: int,
+    source_weights: dict[str, float] | None = None,
+    half_life_hours: float = 12.0,
+    now: datetime | None = None,
+    slack: int = 4,
+) -> list[Article | dict]:
+    """Top-k over a stream with memory bounded to `k * slack` candidates (see StreamRanker)."""
+    ranker = StreamRanker(k, source_weights, half_life_hours, now, slack)
+    for article in articles:
+        ranker.add(article)
+    return ranker.result()
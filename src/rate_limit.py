@@ -0,0 +1,35 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second with bursts up to `capacity`.
+
+    `budget` caps the total number of requests for the bucket's lifetime, so a
+    run can never spend more of a daily quota (e.g. NewsAPI's) than configured.
+    """
+
+    def __init__(self, rate: float, capacity: int, budget: int | None = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.budget = budget
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Block until a request may be sent. Returns False once the budget is spent."""
+        while True:
+            with self._lock:
+                if self.budget is not None and self.budget <= 0:
+                    return False
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if self.budget is not None:
+                        self.budget -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,93 @@
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class _Source:
+    interval: float
+    min_interval: float
+    due: float = 0.0
+    last_polled: float | None = None
+    rate: float | None = None  # smoothed new articles per second
+
+
+class AdaptiveScheduler:
+    """Per-source poll intervals that follow each source's publish frequency.
+
+    After a poll with new articles the source's publish rate is updated
+    (exponentially smoothed) and its next poll is set `target_new / rate`
+    seconds away, so busy feeds are polled often and slow ones rarely. A poll
+    with nothing new multiplies the interval by `backoff`. Intervals stay
+    between the source's minimum and `max_interval`. Times are plain epoch
+    seconds passed in by the caller.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        target_new: float = 3,
+        backoff: float = 2.0,
+        smoothing: float = 0.3,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self._sources: dict[str, _Source] = {}
+
+    def add(self, name: str, min_interval: float | None = None) -> None:
+        """Register a source, due immediately. Re-adding keeps its current schedule."""
+        floor = max(self.min_interval, min_interval or 0)
+        source = self._sources.setdefault(name, _Source(interval=floor, min_interval=floor))
+        source.min_interval = floor
+        source.interval = max(source.interval, floor)
+
+    def due(self, now: float) -> list[str]:
+        """Sources whose next poll time has come, most overdue first."""
+        return sorted((name for name, source in self._sources.items() if source.due <= now),
+                      key=lambda name: self._sources[name].due)
+
+    def next_due(self) -> float | None:
+        return min((source.due for source in self._sources.values()), default=None)
+
+    def interval(self, name: str) -> float:
+        return self._sources[name].interval
+
+    def record(self, name: str, new_items: int, now: float) -> float:
+        """Reschedule `name` after a poll at `now` that found `new_items`; returns the new interval."""
+        source = self._sources[name]
+        elapsed = now - source.last_polled if source.last_polled is not None else None
+        source.last_polled = now
+        if new_items and elapsed:
+            observed = new_items / elapsed
+            source.rate = observed if source.rate is None else (
+                self.smoothing * observed + (1 - self.smoothing) * source.rate
+            )
+            interval = self.target_new / source.rate
+        elif new_items:
+            # First poll: everything is "new", which says nothing about the rate.
+            interval = source.interval
+        else:
+            interval = source.interval * self.backoff
+        source.interval = min(max(interval, source.min_interval), max(self.max_interval, source.min_interval))
+        source.due = now + source.interval
+        return source.interval
+
+    def state(self) -> dict[str, dict]:
+        """JSON-ready schedule, to survive restarts."""
+        return {name: asdict(source) for name, source in self._sources.items()}
+
+    def load(self, state: dict[str, dict]) -> None:
+        """Restore saved schedules for sources that are registered."""
+        for name, saved in state.items():
+            source = self._sources.get(name)
+            if source is None:
+                continue
+            source.due = saved.get("due", 0.0)
+            source.last_polled = saved.get("last_polled")
+            source.rate = saved.get("rate")
+            source.interval = min(
+                max(saved.get("interval", source.interval), source.min_interval),
+                max(self.max_interval, source.min_interval),
+            )
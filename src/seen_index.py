@@ -0,0 +1,77 @@
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+
+from src.article import Article
+from src.dedup import canonicalize_url
+
+
+class SeenIndex:
+    """SQLite index of article URLs already delivered in a digest.
+
+    Canonical URLs are stored as 64-bit hashes, expire after `ttl_days`, and the
+    table is capped at `max_entries` rows (oldest first), so it stays small as
+    history grows. A `scope` (e.g. a digest profile name) keeps separate
+    delivery histories in the same table.
+    """
+
+    def __init__(self, path: str | Path, ttl_days: int = 7, max_entries: int = 50_000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (url_hash INTEGER PRIMARY KEY, seen_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS seen_at_idx ON seen (seen_at)")
+
+    @staticmethod
+    def _key(url: str, scope: str = "") -> int:
+        key = canonicalize_url(url)
+        if scope:
+            key = f"{scope}\n{key}"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    def is_seen(self, article: Article, scope: str = "") -> bool:
+        """Whether the article's link was delivered within the TTL window: one primary-key lookup."""
+        row = self._conn.execute(
+            "SELECT 1 FROM seen WHERE url_hash = ? AND seen_at >= ?",
+            (self._key(article.link, scope), time.time() - self.ttl_seconds),
+        ).fetchone()
+        return row is not None
+
+    def mark_seen(self, articles: list[Article | dict], scope: str = "") -> None:
+        """Record articles as delivered now, then expire and trim old entries.
+
+        The links in each article's `related` list count as delivered too: the
+        digest showed them under the story, so a later copy under one of those
+        URLs is the same story again.
+        """
+        now = time.time()
+        links = []
+        for article in articles:
+            links.append(article.get("link", ""))
+            links.extend(related.get("link", "") for related in article.get("related", []))
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (url_hash, seen_at) VALUES (?, ?)",
+                [(self._key(link, scope), now) for link in links],
+            )
+            self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        self._conn.execute("DELETE FROM seen WHERE seen_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM seen WHERE url_hash IN "
+            "(SELECT url_hash FROM seen ORDER BY seen_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
@@ -1,6 +1,16 @@
+import hashlib
 import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import anthropic
+from src import instrumentation
+from src.article import Article, as_article
+from src.lazy import lazy_import
+from src.summary_cache import SummaryCache
+
+anthropic = lazy_import("anthropic")
 
 
 SYSTEM_PROMPT = """Você é um curador de notícias especializado em Inteligência Artificial.
@@ -24,32 +34,86 @@ USER_PROMPT_TEMPLATE = """Traduza e resuma estas notícias de IA:
 {articles_text}"""
 
 
-def summarize_articles(
-    articles: list[dict],
-    api_key: str,
-    model: str = "claude-haiku-4-5-20251001",
-) -> dict:
-    """Summarize and translate articles using Claude. Returns dict with enriched 'articles'."""
-    if not articles:
-        return {"articles": []}
+OUTPUT_TOKENS_PER_ARTICLE = 250
 
-    articles_text = "\n\n".join(
-        f"[{i}] {a['title']} ({a['source']})\n    {a.get('description', '')}"
-        for i, a in enumerate(articles)
-    )
 
-    client = anthropic.Anthropic(api_key=api_key.strip())
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
 
-    response = client.messages.create(
-        model=model,
-        max_tokens=3000,
-        system=SYSTEM_PROMPT,
-        messages=[
-            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(articles_text=articles_text)}
-        ],
-    )
 
-    raw_text = response.content[0].text.strip()
+def _format_article(i: int, article: Article) -> str:
+    text = " ".join(article.content.split()) if article.content else article.description
+    return f"[{i}] {article.title} ({article.source})\n    {text}"
+
+
+def _chunk_articles(articles: list[Article], max_input_tokens: int, max_articles: int) -> list[list[int]]:
+    """Split article indices into chunks within an input-token and article-count budget."""
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for i, article in enumerate(articles):
+        tokens = _estimate_tokens(_format_article(i, article))
+        if current and (current_tokens + tokens > max_input_tokens or len(current) >= max_articles):
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class NoticiasParser:
+    """Incremental parser that yields each `noticias` item as soon as its JSON object is complete.
+
+    Feed it text as it arrives; anything before the array (code fences, the
+    opening brace) is skipped, and a truncated trailing item is simply never
+    emitted, so every fully formed item survives a reply cut at `max_tokens`.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos: int | None = None
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text: str) -> list[dict]:
+        self._buffer += text
+        if self._pos is None:
+            key = self._buffer.find('"noticias"')
+            start = self._buffer.find("[", key) if key != -1 else -1
+            if start == -1:
+                return []
+            self._pos = start + 1
+
+        items = []
+        while True:
+            pos = self._pos
+            while pos < len(self._buffer) and self._buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(self._buffer) or self._buffer[pos] != "{" or "}" not in self._buffer[pos:]:
+                self._pos = pos
+                return items
+            try:
+                item, end = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                self._pos = pos
+                return items
+            self._pos = end
+            if isinstance(item, dict):
+                items.append(item)
+
+
+def iter_noticias(text_chunks) -> Iterator[dict]:
+    """Yield complete `noticias` items from an iterable of reply text fragments."""
+    parser = NoticiasParser()
+    for text in text_chunks:
+        yield from parser.feed(text)
+
+
+def _parse_noticias(raw_text: str) -> dict[int, dict]:
+    """Parse Claude's JSON reply into {indice: noticia}, salvaging complete items when it is malformed."""
+    raw_text = raw_text.strip()
     if raw_text.startswith("```"):
         raw_text = raw_text.split("\n", 1)[-1]
     if raw_text.endswith("```"):
@@ -57,18 +121,355 @@ def summarize_articles(
     raw_text = raw_text.strip()
 
     try:
-        data = json.loads(raw_text)
-    except (json.JSONDecodeError, IndexError):
-        return {"articles": articles}
+        items = json.loads(raw_text).get("noticias", [])
+    except (json.JSONDecodeError, AttributeError):
+        items = iter_noticias([raw_text])
+    return _index_noticias(items)
+
+
+def _index_noticias(items) -> dict[int, dict]:
+    """Map well-formed items (integer indice, string title and summary) by indice."""
+    noticias = {}
+    for item in items:
+        if (
+            isinstance(item, dict)
+            and isinstance(item.get("indice"), int)
+            and isinstance(item.get("titulo_pt"), str)
+            and isinstance(item.get("resumo_pt"), str)
+        ):
+            noticias[item["indice"]] = item
+    return noticias
+
+
+USAGE_FIELDS = ("input_tokens", "cache_creation_input_tokens", "cache_read_input_tokens", "output_tokens")
+
+
+class UsageLog:
+    """Thread-safe record of token usage and latency for every Claude call."""
+
+    def __init__(self):
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, usage, latency_s: float | None, articles: int, mode: str) -> None:
+        call = {"mode": mode, "articles": articles, "latency_s": latency_s}
+        for field in USAGE_FIELDS:
+            value = getattr(usage, field, None)
+            call[field] = value if isinstance(value, int) else 0
+            instrumentation.count("claude.tokens", call[field], type=field)
+        with self._lock:
+            self.calls.append(call)
+        if latency_s is not None:
+            instrumentation.observe("claude.call", latency_s, mode=mode)
+        instrumentation.count("claude.articles", articles, mode=mode)
+
+    def summary(self) -> dict:
+        """Totals across calls, plus the per-call records under 'calls'."""
+        with self._lock:
+            calls = list(self.calls)
+        totals = {field: sum(call[field] for call in calls) for field in USAGE_FIELDS}
+        totals["latency_s"] = round(sum(call["latency_s"] or 0 for call in calls), 3)
+        return {**totals, "calls": calls}
+
+
+def _build_request(model: str, articles: list[Article]) -> dict:
+    """Messages API parameters for summarizing one chunk of articles.
+
+    The system prompt is identical on every call and comes first, so it is
+    marked as a prompt-cache breakpoint; only the article list varies.
+    """
+    articles_text = "\n\n".join(_format_article(i, a) for i, a in enumerate(articles))
+    return {
+        "model": model,
+        "max_tokens": OUTPUT_TOKENS_PER_ARTICLE * len(articles) + 200,
+        "system": [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}],
+        "messages": [
+            {"role": "user", "content": USER_PROMPT_TEMPLATE.format(articles_text=articles_text)}
+        ],
+    }
+
+
+def _summarize_chunk(
+    client,
+    model: str,
+    articles: list[Article],
+    stream: bool = False,
+    on_item: Callable[[dict], None] | None = None,
+    usage_log: UsageLog | None = None,
+) -> dict[int, dict]:
+    """Summarize one chunk; indices in the result are local to the chunk.
+
+    In streaming mode items are parsed as the reply arrives and passed to
+    `on_item` (with the chunk-local "indice") as soon as each is complete.
+    """
+    request = _build_request(model, articles)
+    started = time.monotonic()
+
+    if not stream:
+        response = client.messages.create(**request)
+        if usage_log:
+            usage_log.record(getattr(response, "usage", None), time.monotonic() - started, len(articles), "sync")
+        noticias = _parse_noticias(response.content[0].text)
+        if on_item:
+            for noticia in noticias.values():
+                on_item(noticia)
+        return noticias
+
+    noticias = {}
+    with client.messages.stream(**request) as response_stream:
+        for item in iter_noticias(response_stream.text_stream):
+            indexed = _index_noticias([item])
+            noticias.update(indexed)
+            if on_item and indexed:
+                on_item(item)
+        if usage_log:
+            usage = getattr(response_stream.get_final_message(), "usage", None)
+            usage_log.record(usage, time.monotonic() - started, len(articles), "stream")
+    return noticias
+
+
+def _cache_key(model: str, article: Article) -> str:
+    """Content address of a summary: model, prompts and the article text sent to Claude."""
+    payload = json.dumps(
+        [model, SYSTEM_PROMPT, USER_PROMPT_TEMPLATE, _format_article(0, article)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _summarize_in_chunks(
+    client,
+    model: str,
+    articles: list[Article],
+    chunk_input_tokens: int,
+    chunk_max_articles: int,
+    max_workers: int,
+    max_retries: int,
+    stream: bool = False,
+    on_summary: Callable[[int, dict], None] | None = None,
+    on_chunk: Callable[[dict[int, dict]], None] | None = None,
+    usage_log: UsageLog | None = None,
+) -> dict[int, dict]:
+    """Summarize articles chunk by chunk, returning {index into articles: noticia}.
+
+    After each round, only the articles missing from their chunk's reply are
+    re-requested, re-chunked, up to `max_retries` times. A chunk whose call
+    raises keeps the items that streamed in before the error, and the rest
+    count as missing; the error is raised only if articles are still missing
+    after a last round in which a call failed.
+
+    `on_chunk` receives each chunk's {index: noticia} as soon as that chunk
+    returns, in completion order, so callers can persist paid-for results
+    without waiting on slower chunks.
+    """
+    noticias_por_indice: dict[int, dict] = {}
+
+    def run_chunk(chunk: list[int]) -> tuple[dict[int, dict], Exception | None]:
+        received: dict[int, dict] = {}
+
+        def emit(item: dict) -> None:
+            received[item["indice"]] = item
+            if on_summary and 0 <= item["indice"] < len(chunk):
+                on_summary(chunk[item["indice"]], item)
+
+        try:
+            return _summarize_chunk(
+                client, model, [articles[i] for i in chunk], stream=stream, on_item=emit, usage_log=usage_log,
+            ), None
+        except Exception as exc:
+            # A stream can fail partway; the items that arrived before the error are kept.
+            print(f"  Summarizing a chunk of {len(chunk)} articles failed: {exc}")
+            instrumentation.count("claude.errors")
+            return received, exc
+
+    pending = list(range(len(articles)))
+    errors: list[Exception] = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for _ in range(max_retries + 1):
+            chunks = _chunk_articles([articles[i] for i in pending], chunk_input_tokens, chunk_max_articles)
+            chunks = [[pending[i] for i in chunk] for chunk in chunks]
+            errors = []
+            futures = {executor.submit(run_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                noticias, error = future.result()
+                if error is not None:
+                    errors.append(error)
+                merged = {chunk[i]: noticia for i, noticia in noticias.items() if 0 <= i < len(chunk)}
+                noticias_por_indice.update(merged)
+                if on_chunk and merged:
+                    on_chunk(merged)
+            pending = [i for i in pending if i not in noticias_por_indice]
+            if not pending:
+                break
+
+    if errors and pending:
+        raise errors[0]
+    return noticias_por_indice
+
+
+@instrumentation.timed("claude.batch")
+def _summarize_via_batch(
+    client,
+    model: str,
+    articles: list[Article],
+    chunk_input_tokens: int,
+    chunk_max_articles: int,
+    deadline: float,
+    poll_interval: float,
+    max_poll_interval: float = 300.0,
+    usage_log: UsageLog | None = None,
+) -> dict[int, dict]:
+    """Summarize articles through the Message Batches API, one request per chunk.
+
+    Polls with exponential backoff until the batch ends. If it is still running
+    after `deadline` seconds it is cancelled and polled until the cancellation
+    ends, and whatever succeeded is returned; callers summarize the rest
+    synchronously.
+    """
+    chunks = _chunk_articles(articles, chunk_input_tokens, chunk_max_articles)
+    batch = client.messages.batches.create(
+        requests=[
+            {"custom_id": f"chunk-{n}", "params": _build_request(model, [articles[i] for i in chunk])}
+            for n, chunk in enumerate(chunks)
+        ],
+    )
+
+    give_up_at = time.monotonic() + deadline
+    interval = poll_interval
+    cancelled = False
+    while batch.processing_status != "ended":
+        if not cancelled and time.monotonic() >= give_up_at:
+            # Requests that already succeeded stay in the results once the cancellation ends.
+            client.messages.batches.cancel(batch.id)
+            cancelled = True
+            interval = poll_interval
+            print(f"  Batch {batch.id} missed its {deadline:.0f}s deadline, cancelling the unfinished requests")
+        time.sleep(interval if cancelled else min(interval, max(give_up_at - time.monotonic(), 0)))
+        interval = min(interval * 2, max_poll_interval)
+        batch = client.messages.batches.retrieve(batch.id)
+
+    noticias_por_indice: dict[int, dict] = {}
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type != "succeeded" or not entry.custom_id.startswith("chunk-"):
+            continue
+        chunk = chunks[int(entry.custom_id.removeprefix("chunk-"))]
+        if usage_log:
+            usage_log.record(getattr(entry.result.message, "usage", None), None, len(chunk), "batch")
+        for local_index, noticia in _parse_noticias(entry.result.message.content[0].text).items():
+            if 0 <= local_index < len(chunk):
+                noticias_por_indice[chunk[local_index]] = noticia
+    return noticias_por_indice
+
+
+def summarize_articles(
+    articles: list[Article | dict],
+    api_key: str,
+    model: str = "claude-haiku-4-5-20251001",
+    chunk_input_tokens: int = 2000,
+    chunk_max_articles: int = 10,
+    max_workers: int = 4,
+    max_retries: int = 1,
+    cache: SummaryCache | None = None,
+    stream: bool = False,
+    on_summary: Callable[[int, dict], None] | None = None,
+    backend: str = "sync",
+    batch_deadline: float = 1800.0,
+    batch_poll_interval: float = 10.0,
+) -> dict:
+    """Summarize and translate articles using Claude. Returns dict with enriched 'articles'
+    and the token 'usage' of every call made (see UsageLog.summary).
+
+    Articles are split into token-budgeted chunks summarized concurrently by up
+    to `max_workers` threads. Complete items are salvaged from malformed or
+    truncated replies, and only the missing articles are re-requested, up to
+    `max_retries` times. Articles still missing keep their original text and
+    are listed in 'failed_indices'. With a `cache`, only articles without a
+    cached summary are sent to Claude, and each chunk's summaries are cached as
+    soon as it returns, so a run that fails later does not pay for them again.
+
+    With `stream`, replies are parsed while they arrive and `on_summary(index,
+    noticia)` fires as soon as each summary is complete (from worker threads).
+
+    `backend="batch"` submits the chunks through the Message Batches API
+    (cheaper, minutes of latency). Articles the batch does not summarize
+    within `batch_deadline` seconds go through the synchronous path.
+    """
+    usage_log = UsageLog()
+    if not articles:
+        return {"articles": [], "failed_indices": [], "usage": usage_log.summary()}
+    articles = [as_article(article) for article in articles]
+
+    noticias_por_indice: dict[int, dict] = {}
+    keys: list[str] = []
+    if cache is not None:
+        keys = [_cache_key(model, article) for article in articles]
+        cached = cache.get_many(keys)
+        noticias_por_indice = {i: cached[key] for i, key in enumerate(keys) if key in cached}
+        instrumentation.count("summary_cache.hits", len(noticias_por_indice))
+        instrumentation.count("summary_cache.misses", len(articles) - len(noticias_por_indice))
+        if on_summary:
+            for i, noticia in noticias_por_indice.items():
+                on_summary(i, noticia)
+
+    misses = [i for i in range(len(articles)) if i not in noticias_por_indice]
+    if misses:
+        client = anthropic.Anthropic(api_key=api_key.strip())
+        miss_articles = [articles[i] for i in misses]
+        summarized: dict[int, dict] = {}
+
+        def keep(local: dict[int, dict]) -> None:
+            """Merge freshly summarized articles (indexed into `misses`) and cache them right away."""
+            fresh = {
+                misses[local_index]: {"titulo_pt": noticia["titulo_pt"], "resumo_pt": noticia["resumo_pt"]}
+                for local_index, noticia in local.items()
+            }
+            noticias_por_indice.update(fresh)
+            if cache is not None:
+                cache.put_many({keys[i]: noticia for i, noticia in fresh.items()})
+
+        if backend == "batch":
+            summarized = _summarize_via_batch(
+                client,
+                model,
+                miss_articles,
+                chunk_input_tokens,
+                chunk_max_articles,
+                deadline=batch_deadline,
+                poll_interval=batch_poll_interval,
+                usage_log=usage_log,
+            )
+            keep(summarized)
+            if on_summary:
+                for local_index, noticia in summarized.items():
+                    on_summary(misses[local_index], noticia)
+
+        remaining = [i for i in range(len(miss_articles)) if i not in summarized]
+        if remaining:
+            _summarize_in_chunks(
+                client,
+                model,
+                [miss_articles[i] for i in remaining],
+                chunk_input_tokens,
+                chunk_max_articles,
+                max_workers,
+                max_retries,
+                stream=stream,
+                on_summary=(
+                    (lambda local_index, noticia: on_summary(misses[remaining[local_index]], noticia))
+                    if on_summary else None
+                ),
+                on_chunk=lambda synced: keep({remaining[i]: noticia for i, noticia in synced.items()}),
+                usage_log=usage_log,
+            )
 
-    noticias_por_indice = {n["indice"]: n for n in data.get("noticias", [])}
     enriched = []
     for i, article in enumerate(articles):
         noticia = noticias_por_indice.get(i, {})
-        enriched.append({
-            **article,
-            "titulo_pt": noticia.get("titulo_pt", article["title"]),
-            "resumo_pt": noticia.get("resumo_pt", article.get("description", "")),
-        })
+        enriched.append(article.evolve(
+            titulo_pt=noticia.get("titulo_pt", article.title),
+            resumo_pt=noticia.get("resumo_pt", article.description),
+        ))
 
-    return {"articles": enriched}
+    failed_indices = [i for i in range(len(articles)) if i not in noticias_por_indice]
+    return {"articles": enriched, "failed_indices": failed_indices, "usage": usage_log.summary()}
@@ -0,0 +1,66 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+
+class SummaryCache:
+    """SQLite cache of Claude summaries keyed by a content hash.
+
+    Entries older than `ttl_days` are ignored and removed, and the table is
+    capped at `max_entries` rows, evicting the least recently used first.
+    """
+
+    def __init__(self, path: str | Path, ttl_days: int = 14, max_entries: int = 5000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS summaries_used_at_idx ON summaries (used_at)")
+
+    def get_many(self, keys: list[str]) -> dict[str, dict]:
+        """Return cached values for the given keys and mark them as recently used."""
+        now = time.time()
+        found: dict[str, dict] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), 500):
+            batch = unique_keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, value FROM summaries WHERE created_at >= ? AND key IN ({placeholders})",
+                [now - self.ttl_seconds, *batch],
+            )
+            found.update((key, json.loads(value)) for key, value in rows)
+        if found:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE summaries SET used_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        return found
+
+    def put_many(self, items: dict[str, dict]) -> None:
+        """Store values, then expire and trim the cache."""
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, value, created_at, used_at) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False), now, now) for key, value in items.items()],
+            )
+            self._conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key IN "
+                "(SELECT key FROM summaries ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
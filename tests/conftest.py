@@ -0,0 +1,15 @@
+import pytest
+
+import config
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Keep caches and indexes written by the pipeline out of the working tree."""
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "FEED_CACHE_PATH", str(tmp_path / "cache" / "feed_cache.json"))
+    monkeypatch.setattr(config, "SEEN_INDEX_PATH", str(tmp_path / "cache" / "seen.sqlite3"))
+    monkeypatch.setattr(config, "SUMMARY_CACHE_PATH", str(tmp_path / "cache" / "summaries.sqlite3"))
+    monkeypatch.setattr(config, "CHECKPOINT_DIR", str(tmp_path / "cache" / "checkpoints"))
+    monkeypatch.setattr(config, "ARTICLE_STORE_PATH", str(tmp_path / "cache" / "articles.sqlite3"))
+    monkeypatch.setattr(config, "FULLTEXT_CACHE_PATH", str(tmp_path / "cache" / "fulltext.sqlite3"))
@@ -0,0 +1,45 @@
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from src.article import Article, as_article
+
+
+def test_article_parses_published_and_interns_source():
+    a = Article(title="A", link="https://a.com", source="".join(["Hacker", " News"]), published="2026-02-18T10:00:00Z")
+    b = Article(title="B", link="https://b.com", source="".join(["Hacker", " News"]))
+
+    assert a.published == datetime(2026, 2, 18, 10, 0, tzinfo=timezone.utc)
+    assert a.source is b.source
+
+
+def test_article_is_frozen_and_evolves_into_copies():
+    article = Article(title="A", link="https://a.com", source="HN")
+    summarized = article.evolve(titulo_pt="PT A")
+
+    with pytest.raises(AttributeError):
+        article.title = "changed"
+    assert article.titulo_pt is None
+    assert summarized.titulo_pt == "PT A" and summarized.link == article.link
+
+
+def test_article_supports_dict_style_reads():
+    article = Article(title="A", link="https://a.com", source="HN")
+
+    assert article["title"] == "A"
+    assert article.get("titulo_pt", "fallback") == "fallback"
+    assert "link" in article and "resumo_pt" not in article
+    with pytest.raises(KeyError):
+        article["nope"]
+
+
+def test_article_round_trips_through_dict_and_pickle():
+    article = Article(
+        title="A", link="https://a.com", source="HN", published="2026-02-18T10:00:00+00:00",
+        related=[{"source": "TC", "link": "https://tc.com/a"}], keyword_hits={"ai": 1},
+    )
+
+    assert as_article(article.to_dict()) == article
+    assert as_article({"title": "A", "link": "https://a.com", "source": "HN", "extra": 1}).title == "A"
+    assert pickle.loads(pickle.dumps(article)) == article
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+from src.article import Article
+from src.article_store import ArticleStore
+
+NOW = datetime.now(timezone.utc)
+
+
+def _article(slug, hours_ago=1):
+    return Article(title=slug.upper(), link=f"https://example.com/{slug}", source="Feed",
+                   published=NOW - timedelta(hours=hours_ago))
+
+
+def test_article_store_adds_only_new_articles(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+
+    assert store.add([_article("a"), _article("b")]) == 2
+    assert store.add([_article("a"), {"title": "C", "link": "https://example.com/c?utm_source=rss"}]) == 1
+    assert store.add([{"title": "C again", "link": "https://example.com/c"}]) == 0
+    assert len(store) == 3
+
+
+def test_article_store_reads_window_and_prunes_past_retention(tmp_path):
+    path = tmp_path / "articles.sqlite3"
+    store = ArticleStore(path, retention_hours=48)
+    store.add([_article("fresh", 2), _article("yesterday", 30), _article("old", 72)])
+    store.close()
+
+    reopened = ArticleStore(path, retention_hours=48)
+
+    assert [a.title for a in reopened.iter_since(NOW - timedelta(hours=24))] == ["FRESH"]
+    assert len(reopened) == 2
+    assert next(reopened.iter_since(NOW - timedelta(hours=48))).published is not None
+
+
+def test_article_store_keeps_state(tmp_path):
+    path = tmp_path / "articles.sqlite3"
+    store = ArticleStore(path)
+    store.set_state("last_digest", "2026-02-18")
+    store.close()
+
+    reopened = ArticleStore(path)
+
+    assert reopened.get_state("last_digest") == "2026-02-18"
+    assert reopened.get_state("missing", {}) == {}
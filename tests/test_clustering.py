@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.article import Article
+from src.clustering import cluster_articles, cluster_leaders, tfidf_matrix
+
+STORIES = [
+    ("OpenAI launches GPT-6 with faster reasoning", "OpenAI on Tuesday released GPT-6, its newest model.", "TechCrunch"),
+    ("Nvidia unveils new AI chip for data centers", "The chip targets inference workloads in data centers.", "Wired"),
+    ("GPT-6 is here: OpenAI's new model reasons faster", "OpenAI released GPT-6 today.", "The Verge"),
+    ("Nvidia's next data center AI chip is official", "Nvidia announced a new chip for AI inference in data centers.", "NewsAPI"),
+    ("Apple plans AI features for Siri", "Apple is reportedly working on new AI capabilities for Siri.", "Wired"),
+]
+
+
+def _articles():
+    return [
+        Article(title=title, link=f"https://example.com/{i}", source=source, description=description)
+        for i, (title, description, source) in enumerate(STORIES)
+    ]
+
+
+def test_cluster_articles_keeps_first_of_each_topic_with_others_as_related():
+    articles = _articles()
+    articles[2] = articles[2].evolve(related=[{"source": "Mirror", "link": "https://mirror.example.com/2"}])
+
+    clustered = cluster_articles(articles)
+
+    assert [a.link for a in clustered] == ["https://example.com/0", "https://example.com/1", "https://example.com/4"]
+    assert clustered[0].related == [
+        {"source": "The Verge", "link": "https://example.com/2"},
+        {"source": "Mirror", "link": "https://mirror.example.com/2"},
+    ]
+    assert clustered[1].related == [{"source": "NewsAPI", "link": "https://example.com/3"}]
+    assert clustered[2].related == []
+
+
+def test_cluster_articles_threshold_one_keeps_everything():
+    articles = _articles()
+
+    assert cluster_articles(articles, threshold=1.01) == articles
+    assert cluster_articles(articles[:1]) == articles[:1]
+
+
+def test_cluster_leaders_matches_pairwise_greedy_across_batches():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 32))
+    matrix = (centers[rng.integers(0, 20, size=300)] + rng.normal(scale=0.3, size=(300, 32))).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    expected = np.full(300, -1)
+    similarity = matrix @ matrix.T
+    for i in range(300):
+        if expected[i] < 0:
+            expected[(similarity[i] >= 0.8) & (expected < 0)] = i
+
+    assert cluster_leaders(matrix, 0.8, batch_size=7).tolist() == expected.tolist()
+    assert tfidf_matrix(_articles()).shape[0] == len(STORIES)
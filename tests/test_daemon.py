@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import config
+from src.article import Article
+from src.article_store import ArticleStore
+from src.daemon import _digest_due, poll_due
+from src.scheduler import AdaptiveScheduler
+
+
+def test_poll_due_stores_new_articles_and_reschedules(tmp_path):
+    store = ArticleStore(tmp_path / "articles.sqlite3")
+    article = Article(title="AI news", link="https://example.com/ai", source="Feed")
+    sources = {
+        "rss:Feed": (MagicMock(return_value=[article]), 60),
+        "newsapi:ai": (MagicMock(side_effect=RuntimeError("quota")), 600),
+    }
+    scheduler = AdaptiveScheduler(min_interval=60, max_interval=3600)
+    for name, (_, floor) in sources.items():
+        scheduler.add(name, min_interval=floor)
+
+    assert poll_due(scheduler, sources, store, now=0) == {"rss:Feed": 1, "newsapi:ai": 0}
+    assert poll_due(scheduler, sources, store, now=60) == {"rss:Feed": 0}
+    assert scheduler.interval("newsapi:ai") == 1200  # failure backs off like an unchanged source
+    assert store.get_state("schedule")["rss:Feed"]["interval"] == 120
+
+
+def test_digest_due_once_a_day_after_digest_time(monkeypatch):
+    monkeypatch.setattr(config, "DAEMON_DIGEST_TIME", "08:00")
+
+    assert not _digest_due(datetime(2026, 2, 18, 7, 59, tzinfo=timezone.utc), None)
+    assert _digest_due(datetime(2026, 2, 18, 8, 0, tzinfo=timezone.utc), "2026-02-17")
+    assert not _digest_due(datetime(2026, 2, 18, 20, 0, tzinfo=timezone.utc), "2026-02-18")
+
+
+@patch("src.main.send_digest_batch", return_value=[{"id": "sent"}])
+@patch("src.main.summarize_articles")
+def test_store_stages_build_digest_from_store(mock_summarize, mock_send, monkeypatch):
+    from src.main import STORE_STAGES, run
+
+    monkeypatch.setattr(config, "PROFILES", [
+        {"name": "default", "keywords": config.AI_KEYWORDS, "recipients": ["user@example.com"], "max_articles": 15},
+    ])
+    store = ArticleStore(config.ARTICLE_STORE_PATH)
+    store.add([
+        Article(title="OpenAI ships GPT-6", link="https://a.com", source="HN",
+                published=datetime.now(timezone.utc)),
+        Article(title="Pizza review", link="https://b.com", source="HN", published=datetime.now(timezone.utc)),
+    ])
+    store.close()
+    mock_summarize.side_effect = lambda articles, **kwargs: {"articles": articles}
+
+    with patch("src.main.iter_rss_articles") as mock_rss:
+        run(STORE_STAGES)
+
+    mock_rss.assert_not_called()
+    [articles] = [call.kwargs["articles"] for call in mock_summarize.call_args_list]
+    assert [article["link"] for article in articles] == ["https://a.com"]
+    assert mock_send.call_args.kwargs["messages"][0]["to"] == "user@example.com"
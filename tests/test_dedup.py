@@ -0,0 +1,70 @@
+from src.article import Article
+from src.dedup import NearDuplicateIndex, canonicalize_url, deduplicate_articles, iter_unique_articles, simhash
+
+
+def test_canonicalize_url_strips_tracking_amp_and_scheme_variants():
+    variants = [
+        "http://www.example.com/story/amp/?utm_source=rss&b=2&a=1#comments",
+        "https://example.com/story?a=1&b=2&fbclid=xyz",
+        "https://m.example.com/amp/story/?b=2&a=1",
+    ]
+
+    assert {canonicalize_url(url) for url in variants} == {"https://example.com/story?a=1&b=2"}
+
+
+def test_canonicalize_url_keeps_distinct_stories_apart():
+    assert canonicalize_url("https://example.com/story?id=1") != canonicalize_url("https://example.com/story?id=2")
+
+
+def test_simhash_is_close_for_near_duplicate_text():
+    a = simhash("OpenAI releases GPT-5 with improved reasoning", "The new model is better at math")
+    b = simhash("OpenAI Releases GPT-5 With Improved Reasoning", "The new model is better at math and code")
+    c = simhash("Apple announces M5 chip with neural engine", "The new model is better at math")
+
+    assert (a ^ b).bit_count() <= 6
+    assert (a ^ c).bit_count() > 6
+
+
+def test_near_duplicate_index_finds_fingerprints_within_distance():
+    index = NearDuplicateIndex(max_distance=6)
+    index.add(0b1011, item_id=7)
+
+    assert index.find(0b1011 ^ (1 << 40) ^ (1 << 63)) == 7
+    assert index.find(~0b1011 & (2**64 - 1)) is None
+
+
+def test_deduplicate_articles_collapses_syndicated_copies():
+    articles = [
+        {"title": "OpenAI releases GPT-5 with improved reasoning", "link": "https://techcrunch.com/gpt5?utm_source=rss",
+         "source": "TechCrunch AI", "description": "The new model is better at math"},
+        {"title": "OpenAI releases GPT-5 with improved reasoning", "link": "http://www.techcrunch.com/gpt5",
+         "source": "NewsAPI", "description": "The new model is better at math"},
+        {"title": "OpenAI Releases GPT-5 With Improved Reasoning", "link": "https://other.com/openai-gpt5",
+         "source": "Other", "description": "The new model is better at math and code"},
+        {"title": "Apple announces M5 chip with neural engine", "link": "https://theverge.com/m5",
+         "source": "The Verge AI", "description": "A faster neural engine"},
+    ]
+
+    unique = deduplicate_articles(articles)
+
+    assert [a["source"] for a in unique] == ["TechCrunch AI", "The Verge AI"]
+    assert [r["source"] for r in unique[0]["related"]] == ["NewsAPI", "Other"]
+    assert "related" not in articles[0]
+
+
+def test_deduplicate_articles_drops_repeated_urls_from_the_same_source():
+    article = {"title": "Short", "link": "https://a.com/x", "source": "HN", "description": ""}
+
+    assert deduplicate_articles([article, dict(article)]) == [Article.from_dict(article)]
+
+
+def test_iter_unique_articles_attaches_late_duplicates_to_yielded_article():
+    stream = iter_unique_articles([
+        {"title": "OpenAI releases GPT-5 with improved reasoning", "link": "https://a.com/gpt5", "source": "A"},
+        {"title": "OpenAI releases GPT-5 with improved reasoning", "link": "https://b.com/gpt5", "source": "B"},
+    ])
+
+    first = next(stream)
+    assert first["related"] == []
+    assert list(stream) == []
+    assert first["related"] == [{"source": "B", "link": "https://b.com/gpt5"}]
@@ -1,5 +1,11 @@
+import time
 from unittest.mock import patch
-from src.email_sender import build_email_html, send_digest_email
+
+import pytest
+from resend.exceptions import ResendError
+
+from src.email_sender import build_email_html, build_email_text, send_digest_batch, send_digest_email
+from src.rate_limit import TokenBucket
 
 
 SAMPLE_ARTICLES = [
@@ -28,6 +34,30 @@ def test_build_email_html_contains_articles_with_linked_titles():
     assert "Resumo do Dia" not in html
 
 
+def test_build_email_html_escapes_fields_and_drops_unsafe_links():
+    html = build_email_html(
+        articles=[{
+            "title": 'Why <b>"AGI"</b> & you',
+            "source": "Feed <x>",
+            "link": "javascript:alert(1)",
+            "description": "",
+        }],
+        date_str="18 de Fevereiro de 2026",
+    )
+
+    assert "Why &lt;b&gt;&quot;AGI&quot;&lt;/b&gt; &amp; you" in html
+    assert "Feed &lt;x&gt;" in html
+    assert 'href="#"' in html and "javascript" not in html
+
+
+def test_build_email_text_lists_articles_with_links():
+    text = build_email_text(articles=SAMPLE_ARTICLES, date_str="18 de Fevereiro de 2026")
+
+    assert text.startswith("Novidades de IA no mundo — 18 de Fevereiro de 2026")
+    assert "1. GPT-5 Lançado\n" in text
+    assert "TechCrunch — https://example.com/1" in text
+    assert "<" not in text
+
 @patch("src.email_sender.resend.Emails.send")
 def test_send_digest_email_calls_resend(mock_send):
     mock_send.return_value = {"id": "abc123"}
@@ -42,3 +72,71 @@ def test_send_digest_email_calls_resend(mock_send):
 
     mock_send.assert_called_once()
     assert result == {"id": "abc123"}
+
+
+@patch("src.email_sender.resend.Batch.send")
+def test_send_digest_batch_sends_chunks_with_derived_idempotency_keys(mock_batch):
+    mock_batch.side_effect = lambda params, options: {"data": [{"id": p["to"][0]} for p in params]}
+    messages = [{"to": f"user{i}@example.com", "subject": "Test", "html": "<p>Hi</p>", "text": "Hi"} for i in range(5)]
+
+    sent = send_digest_batch(
+        "fake-key", "test@resend.dev", messages, batch_size=2, idempotency_key="digest",
+        rate_limiter=TokenBucket(rate=100, capacity=3),
+    )
+
+    assert [email["id"] for email in sent] == [m["to"] for m in messages]
+    assert mock_batch.call_count == 3
+    assert mock_batch.call_args_list[0].args[0][0]["text"] == "Hi"
+    keys = sorted(call.args[1]["idempotency_key"] for call in mock_batch.call_args_list)
+    assert keys == ["digest/0", "digest/1", "digest/2"]
+
+
+@patch("src.email_sender.resend.Batch.send")
+def test_send_digest_batch_retries_rate_limited_chunks_with_the_same_key(mock_batch):
+    rate_limited = ResendError(code=429, error_type="rate_limit_exceeded", message="Too many requests", suggested_action="")
+    mock_batch.side_effect = [rate_limited, {"data": [{"id": "a"}]}]
+
+    sent = send_digest_batch(
+        "fake-key", "test@resend.dev", [{"to": "a@example.com", "subject": "Test", "html": "<p>Hi</p>"}],
+        idempotency_key="digest", backoff=0,
+    )
+
+    assert sent == [{"id": "a"}]
+    assert [call.args[1] for call in mock_batch.call_args_list] == [{"idempotency_key": "digest/0"}] * 2
+
+    quota = ResendError(code=429, error_type="daily_quota_exceeded", message="Quota", suggested_action="")
+    mock_batch.reset_mock(side_effect=True)
+    mock_batch.side_effect = quota
+    with pytest.raises(ResendError):
+        send_digest_batch("fake-key", "test@resend.dev", [{"to": "a@example.com", "subject": "Test", "html": "<p>Hi</p>"}])
+    assert mock_batch.call_count == 1
+
+
+@patch("src.email_sender.resend.Batch.send", return_value={"data": []})
+def test_send_digest_batch_stays_within_the_rate_limit(mock_batch):
+    messages = [{"to": f"user{i}@example.com", "subject": "Test", "html": "<p>Hi</p>"} for i in range(4)]
+
+    start = time.monotonic()
+    send_digest_batch("fake-key", "test@resend.dev", messages, batch_size=1, max_workers=4,
+                      rate_limiter=TokenBucket(rate=20, capacity=1))
+
+    assert mock_batch.call_count == 4
+    assert time.monotonic() - start >= 0.14
+
+
+def test_build_email_lists_other_coverage_as_also_in_links():
+    article = {
+        **SAMPLE_ARTICLES[0],
+        "related": [
+            {"source": "The Verge", "link": "https://verge.example.com/gpt-5"},
+            {"source": "<b>Bad</b>", "link": "javascript:alert(1)"},
+        ],
+    }
+
+    html = build_email_html(articles=[article], date_str="18 de Fevereiro de 2026")
+    text = build_email_text(articles=[article], date_str="18 de Fevereiro de 2026")
+
+    assert 'Também em: <a href="https://verge.example.com/gpt-5" style="color: #999;">The Verge</a>' in html
+    assert '<a href="#" style="color: #999;">&lt;b&gt;Bad&lt;/b&gt;</a>' in html
+    assert "Também em: The Verge (https://verge.example.com/gpt-5), <b>Bad</b> (#)\n" in text
+    assert "Também em" not in build_email_html(articles=SAMPLE_ARTICLES, date_str="18 de Fevereiro de 2026")
@@ -0,0 +1,85 @@
+# tests/test_fast_feed.py
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.collectors.fast_feed import FeedParseError, parse_feed
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+CUTOFF = NOW - timedelta(hours=24)
+
+
+def _rss(items, tail=""):
+    body = "".join(
+        f"<item><title>{title}</title><link>https://example.com/{i}</link>"
+        f"<description>About {title}</description><pubDate>{format_datetime(published)}</pubDate></item>"
+        for i, (title, published) in enumerate(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>{body}{tail}</channel></rss>'.encode()
+
+
+def test_parse_feed_reads_rss_entries_after_cutoff():
+    data = _rss([("Fresh", NOW - timedelta(hours=1)), ("Stale", NOW - timedelta(hours=30))])
+
+    entries = parse_feed(data, CUTOFF)
+
+    assert entries == [{
+        "title": "Fresh",
+        "link": "https://example.com/0",
+        "summary": "About Fresh",
+        "published": NOW - timedelta(hours=1),
+    }]
+
+
+def test_parse_feed_reads_atom_entries():
+    data = b"""<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>T</title>
+    <entry><title>A &amp; B</title><link rel="self" href="https://example.com/self"/>
+    <link href="https://example.com/a"/><published>2099-01-01T10:00:00+02:00</published>
+    <content type="html">&lt;p&gt;Body&lt;/p&gt;</content><source><title>Elsewhere</title></source></entry></feed>"""
+
+    [entry] = parse_feed(data, CUTOFF)
+
+    assert entry["title"] == "A & B"
+    assert entry["link"] == "https://example.com/a"
+    assert entry["summary"] == "Body"
+    assert entry["published"] == datetime(2099, 1, 1, 8, tzinfo=timezone.utc)
+
+
+def test_parse_feed_strips_markup_and_scripts_from_summaries():
+    data = f"""<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>
+    <item><title>&lt;b&gt;Fresh&lt;/b&gt;</title><link>https://example.com/0</link>
+    <description><![CDATA[<p>GPT-6 &amp; friends</p><script>alert('x')</script><style>p {{}}</style>
+    <p>Read <a href="https://example.com">more</a><br/>now</p>]]></description>
+    <pubDate>{format_datetime(NOW)}</pubDate></item></channel></rss>""".encode()
+
+    [entry] = parse_feed(data, CUTOFF)
+
+    assert entry["title"] == "Fresh"
+    assert entry["summary"] == "GPT-6 & friends\nRead more\nnow"
+
+
+def test_parse_feed_stops_reading_sorted_feed_past_cutoff():
+    items = [(f"Item {i}", NOW - timedelta(hours=i * 6)) for i in range(10)]
+    data = _rss(items, tail="<item><title>broken")  # never reached
+
+    entries = parse_feed(data, CUTOFF)
+
+    assert [entry["title"] for entry in entries] == ["Item 0", "Item 1", "Item 2", "Item 3", "Item 4"]
+    with pytest.raises(FeedParseError):
+        parse_feed(data, CUTOFF, stop_early=False)
+
+
+def test_parse_feed_reads_unsorted_feed_to_the_end():
+    ages = [30, 1, 40, 50, 60, 2]
+    data = _rss([(f"Age {age}", NOW - timedelta(hours=age)) for age in ages])
+
+    entries = parse_feed(data, CUTOFF)
+
+    assert [entry["title"] for entry in entries] == ["Age 1", "Age 2"]
+
+
+@pytest.mark.parametrize("data", [b"", b"<html><body>Not a feed</body></html>", b"<rss><channel>&nbsp;</channel></rss>"])
+def test_parse_feed_rejects_what_it_cannot_read(data):
+    with pytest.raises(FeedParseError):
+        parse_feed(data, CUTOFF)
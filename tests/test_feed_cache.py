@@ -0,0 +1,41 @@
+import time
+
+from src.collectors.feed_cache import FeedCache
+
+
+def test_feed_cache_persists_validators(tmp_path):
+    path = tmp_path / "feeds.json"
+    cache = FeedCache(path)
+    cache.store("https://example.com/rss", '"v1"', "Wed, 18 Feb 2026 08:00:00 GMT", "abc")
+    cache.save()
+
+    reloaded = FeedCache(path)
+
+    entry = reloaded.get("https://example.com/rss")
+    assert entry["etag"] == '"v1"'
+    assert entry["last_modified"] == "Wed, 18 Feb 2026 08:00:00 GMT"
+    assert entry["content_hash"] == "abc"
+
+
+def test_feed_cache_evicts_stale_and_oldest_entries(tmp_path):
+    path = tmp_path / "feeds.json"
+    cache = FeedCache(path, max_entries=2, max_age_days=1)
+    for i in range(3):
+        cache.store(f"https://example.com/{i}", None, None, str(i))
+    cache._entries["https://example.com/0"]["checked_at"] = time.time() - 2 * 86400
+    cache._entries["https://example.com/1"]["checked_at"] = time.time() - 60
+    cache.store("https://example.com/3", None, None, "3")
+    cache.save()
+
+    reloaded = FeedCache(path)
+
+    assert len(reloaded) == 2
+    assert reloaded.get("https://example.com/0") is None
+    assert reloaded.get("https://example.com/1") is None
+
+
+def test_feed_cache_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "feeds.json"
+    path.write_text("{not json")
+
+    assert len(FeedCache(path)) == 0
@@ -0,0 +1,112 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.fulltext import FullTextCache, extract_text, fetch_full_texts, trim_to_tokens
+
+PAGE = """<html><head><script>var tracking = "ignore me, please, really";</script></head><body>
+<header><nav><a href="/">Home</a> <a href="/ai">AI</a></nav></header>
+<div class="layout">
+<aside class="sidebar"><p>Trending: another story entirely, with commas, many, many of them</p></aside>
+<article class="post-body"><h1>Big news</h1>
+<p>OpenAI released GPT-6 on Tuesday, saying the model reasons faster, costs less and reads longer documents.
+<p>The company said the model would reach paying customers first, followed by free users next month.</p>
+<div class="share-buttons"><p>Share this on Twitter, Facebook, LinkedIn, and more</p></div>
+<p><a href="/more">Read more: a related story link that is not part of the article</a></p>
+<p>Analysts said the release, which follows months of speculation, puts pressure on rivals.</p>
+</article></div>
+<footer><p>Copyright 2026, Example Media, all rights reserved, and so on.</p></footer></body></html>"""
+
+
+def test_extract_text_keeps_article_paragraphs_only():
+    text = extract_text(PAGE)
+
+    assert text.split("\n\n") == [
+        "OpenAI released GPT-6 on Tuesday, saying the model reasons faster, costs less and reads longer documents.",
+        "The company said the model would reach paying customers first, followed by free users next month.",
+        "Analysts said the release, which follows months of speculation, puts pressure on rivals.",
+    ]
+    assert extract_text("<html><body><a href='/'>Home</a></body></html>") == ""
+    assert trim_to_tokens(text, 10) == "OpenAI released GPT-6 on Tuesday, …"
+
+
+def test_extract_text_keeps_article_inside_boilerplate_named_wrappers():
+    expected = extract_text(PAGE)
+
+    for wrapper in ("site-content has-sidebar", "entry-content share-enabled", "layout header-sticky"):
+        page = PAGE.replace('<div class="layout">', f'<div class="{wrapper}">')
+        assert extract_text(page) == expected, wrapper
+
+
+def _serve(pages: dict[str, tuple[str, bytes]], delay: float = 0.0):
+    """Local stand-in for publishers; records request paths and peak concurrency."""
+    hits, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            with lock:
+                hits.append(path)
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(delay)
+            with lock:
+                active[0] -= 1
+            if path not in pages:
+                self.send_error(404)
+                return
+            content_type, body = pages[path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits, peak
+
+
+def test_fetch_full_texts_caps_per_host_trims_and_caches(tmp_path):
+    pages = {f"/{i}": ("text/html; charset=utf-8", PAGE.encode()) for i in range(6)}
+    server, hits, peak = _serve(pages, delay=0.05)
+    base = f"http://127.0.0.1:{server.server_port}"
+    articles = [{"title": f"A{i}", "link": f"{base}/{i}?utm_source=rss", "source": "X"} for i in range(6)]
+    try:
+        first = fetch_full_texts(articles, cache=FullTextCache(tmp_path / "text.sqlite3"),
+                                 max_workers=6, per_host=2, max_tokens=10)
+        second = fetch_full_texts([{**a, "link": a["link"].split("?")[0]} for a in articles],
+                                  cache=FullTextCache(tmp_path / "text.sqlite3"), max_tokens=1000)
+    finally:
+        server.shutdown()
+
+    assert set(first) == {article["link"] for article in articles}
+    assert all(text.endswith("…") and len(text) <= 42 for text in first.values())
+    assert peak[0] <= 2
+    assert len(hits) == 6  # the second run is served from the cache, matched by canonical URL
+    assert all(text.startswith("OpenAI released GPT-6") and "Analysts" in text for text in second.values())
+
+
+def test_fetch_full_texts_limits_bytes_and_skips_failures(tmp_path):
+    long_page = ("<article>" + "<p>Paragraph of the story, long enough to count.</p>" * 5000 + "</article>").encode()
+    pages = {"/long": ("text/html", long_page), "/feed": ("application/rss+xml", b"<rss/>")}
+    server, hits, _ = _serve(pages)
+    base = f"http://127.0.0.1:{server.server_port}"
+    cache = FullTextCache(tmp_path / "text.sqlite3")
+    try:
+        texts = fetch_full_texts(
+            [{"link": f"{base}/long"}, {"link": f"{base}/feed"}, {"link": f"{base}/missing"}, {"link": "ftp://x"}],
+            cache=cache, max_bytes=10_000, max_tokens=100_000,
+        )
+    finally:
+        server.shutdown()
+
+    assert list(texts) == [f"{base}/long"]
+    assert 100 < len(texts[f"{base}/long"]) < 10_000
+    assert cache.get_many([f"{base}/long", f"{base}/feed", f"{base}/missing"]).keys() == {
+        f"{base}/long", f"{base}/feed",  # the 404 is retried next run
+    }
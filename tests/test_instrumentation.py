@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from src import instrumentation
+
+
+@pytest.fixture
+def metrics():
+    instrumentation.enable()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_instrumentation_records_nothing():
+    instrumentation.disable()
+
+    with instrumentation.timer("rss.feed", feed="HN"):
+        instrumentation.count("rss.bytes", 100)
+
+    assert instrumentation.timer("a") is instrumentation.timer("b")
+    assert instrumentation.report()["timers"] == []
+    assert instrumentation.report()["counters"] == []
+
+
+def test_timers_and_counters_aggregate_by_name_and_labels(metrics):
+    @metrics.timed("claude.batch")
+    def batch():
+        return "done"
+
+    for _ in range(3):
+        with metrics.timer("rss.feed", feed="HN"):
+            pass
+    metrics.count("rss.bytes", 100, feed="HN")
+    metrics.count("rss.bytes", 50, feed="HN")
+    metrics.observe("claude.call", 1.5, mode="stream")
+
+    assert batch() == "done"
+    report = metrics.report()
+    timers = {(t["name"], tuple(t["labels"].items())): t for t in report["timers"]}
+    assert timers[("rss.feed", (("feed", "HN"),))]["count"] == 3
+    assert timers[("claude.call", (("mode", "stream"),))]["total_seconds"] == 1.5
+    assert timers[("claude.batch", ())]["count"] == 1
+    assert report["counters"] == [{"name": "rss.bytes", "labels": {"feed": "HN"}, "value": 150}]
+
+
+def test_exports_prometheus_text_and_otlp_json(metrics, tmp_path):
+    metrics.observe("pipeline.stage", 2.0, stage="select")
+    metrics.count("claude.tokens", 1200, type="input_tokens")
+
+    data = metrics.write_reports(
+        tmp_path / "report.json",
+        prometheus_path=tmp_path / "metrics.prom",
+        otlp_path=tmp_path / "metrics.otlp.json",
+    )
+
+    assert json.loads((tmp_path / "report.json").read_text()) == data
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE news_agent_pipeline_stage_seconds summary" in prom
+    assert 'news_agent_pipeline_stage_seconds_sum{stage="select"} 2.0' in prom
+    assert 'news_agent_claude_tokens_total{type="input_tokens"} 1200' in prom
+    otlp = json.loads((tmp_path / "metrics.otlp.json").read_text())
+    metrics_by_name = {m["name"]: m for m in otlp["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]}
+    assert metrics_by_name["claude.tokens"]["sum"]["dataPoints"][0]["asDouble"] == 1200.0
+    assert metrics_by_name["pipeline.stage"]["summary"]["dataPoints"][0]["count"] == "1"
@@ -0,0 +1,24 @@
+from src.keywords import KeywordMatcher, fold_text, get_matcher
+
+
+def test_keyword_matcher_requires_whole_words():
+    matcher = KeywordMatcher(["ai"])
+
+    assert matcher.matches("He said they maintain every detail") == {}
+    assert matcher.matches("New AI model; AI-powered search") == {"ai": 2}
+
+
+def test_keyword_matcher_counts_phrases_plurals_and_accents():
+    matcher = KeywordMatcher(["llm", "machine learning", "inteligência artificial"])
+
+    hits = matcher.matches("LLMs and machine  learning: a Inteligencia Artificial avança. Another LLM.")
+
+    assert hits == {"llm": 2, "machine learning": 1, "inteligência artificial": 1}
+
+
+def test_get_matcher_reuses_compiled_matcher():
+    assert get_matcher(("ai", "gpt")) is get_matcher(("ai", "gpt"))
+
+
+def test_fold_text_strips_accents():
+    assert fold_text("Aprendizado de Máquina") == "aprendizado de maquina"
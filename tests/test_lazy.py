@@ -0,0 +1,29 @@
+import sys
+
+from src.lazy import lazy_import
+
+
+def _write_module(tmp_path, monkeypatch, name):
+    (tmp_path / f"{name}.py").write_text("api_key = None\n\ndef whoami():\n    return api_key\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+def test_lazy_import_defers_loading_until_first_use(tmp_path, monkeypatch):
+    _write_module(tmp_path, monkeypatch, "lazy_sdk_a")
+
+    module = lazy_import("lazy_sdk_a")
+    assert "lazy_sdk_a" not in sys.modules
+
+    assert module.whoami() is None
+    assert "lazy_sdk_a" in sys.modules
+
+
+def test_lazy_import_writes_attributes_to_the_real_module(tmp_path, monkeypatch):
+    _write_module(tmp_path, monkeypatch, "lazy_sdk_b")
+
+    module = lazy_import("lazy_sdk_b")
+    module.api_key = "secret"
+
+    assert sys.modules["lazy_sdk_b"].api_key == "secret"
+    assert module.whoami() == "secret"
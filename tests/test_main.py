@@ -1,5 +1,20 @@
+import json
+import time
 from unittest.mock import patch, MagicMock
+
+import pytest
+
+import config
+from src.article import as_article
 from src.main import run, filter_ai_articles
+from src.seen_index import SeenIndex
+
+
+@pytest.fixture(autouse=True)
+def _profiles(monkeypatch):
+    monkeypatch.setattr(config, "PROFILES", [
+        {"name": "default", "keywords": config.AI_KEYWORDS, "recipients": ["user@example.com"], "max_articles": 15},
+    ])
 
 
 def test_filter_ai_articles_keeps_only_ai_related():
@@ -17,11 +32,11 @@ def test_filter_ai_articles_keeps_only_ai_related():
     assert result[1]["title"] == "Machine learning breakthrough"
 
 
-@patch("src.main.send_digest_email")
+@patch("src.main.send_digest_batch")
 @patch("src.main.build_email_html")
 @patch("src.main.summarize_articles")
-@patch("src.main.collect_newsapi_articles")
-@patch("src.main.collect_rss_articles")
+@patch("src.main.iter_newsapi_articles")
+@patch("src.main.iter_rss_articles")
 def test_run_orchestrates_full_pipeline(
     mock_rss, mock_newsapi, mock_summarize, mock_build_html, mock_send
 ):
@@ -38,7 +53,7 @@ def test_run_orchestrates_full_pipeline(
         ],
     }
     mock_build_html.return_value = "<html>email</html>"
-    mock_send.return_value = {"id": "sent123"}
+    mock_send.return_value = [{"id": "sent123"}]
 
     run()
 
@@ -46,3 +61,195 @@ def test_run_orchestrates_full_pipeline(
     mock_newsapi.assert_called_once()
     mock_summarize.assert_called_once()
     mock_send.assert_called_once()
+
+
+@patch("src.main.send_digest_batch")
+@patch("src.main.build_email_html")
+@patch("src.main.summarize_articles")
+@patch("src.main.iter_newsapi_articles")
+@patch("src.main.iter_rss_articles")
+def test_run_skips_articles_delivered_in_previous_runs(
+    mock_rss, mock_newsapi, mock_summarize, mock_build_html, mock_send
+):
+    delivered = {"title": "New AI model", "link": "https://a.com", "source": "HN", "description": "AI research"}
+    fresh = {"title": "GPT update", "link": "https://b.com", "source": "TC", "description": "OpenAI GPT"}
+    index = SeenIndex(config.SEEN_INDEX_PATH)
+    index.mark_seen([delivered], scope="default")
+    index.close()
+
+    mock_rss.return_value = [delivered]
+    mock_newsapi.return_value = [fresh]
+    mock_summarize.return_value = {"articles": [fresh]}
+    mock_build_html.return_value = "<html>email</html>"
+    mock_send.return_value = [{"id": "sent123"}]
+
+    run()
+
+    assert [a["link"] for a in mock_summarize.call_args.kwargs["articles"]] == ["https://b.com"]
+
+
+def test_filter_ai_articles_ignores_substring_matches_and_reports_hits():
+    articles = [
+        {"title": "Senator said the detail was maintained", "description": "Politics"},
+        {"title": "AI startup ships LLM", "description": "The AI model is an LLM"},
+    ]
+
+    result = filter_ai_articles(articles, ["ai", "llm"])
+
+    assert len(result) == 1
+    assert result[0]["keyword_hits"] == {"ai": 2, "llm": 2}
+
+
+@patch("src.main.send_digest_batch")
+@patch("src.main.build_email_html")
+@patch("src.main.summarize_articles")
+@patch("src.main.iter_newsapi_articles")
+@patch("src.main.iter_rss_articles")
+def test_run_resumes_after_send_failure_without_recollecting(
+    mock_rss, mock_newsapi, mock_summarize, mock_build_html, mock_send
+):
+    article = {"title": "New AI model", "link": "https://a.com", "source": "HN", "description": "AI research"}
+    mock_rss.return_value = [article]
+    mock_newsapi.return_value = []
+    mock_summarize.return_value = {"articles": [{**article, "titulo_pt": "Novo modelo", "resumo_pt": "Resumo"}]}
+    mock_build_html.return_value = "<html>email</html>"
+    mock_send.side_effect = [ConnectionError("resend down"), [{"id": "sent123"}]]
+
+    with pytest.raises(ConnectionError):
+        run()
+    run()
+
+    mock_rss.assert_called_once()
+    mock_summarize.assert_called_once()
+    assert mock_send.call_count == 2
+
+
+@patch("src.main.send_digest_batch")
+@patch("src.main.summarize_articles")
+@patch("src.main.iter_newsapi_articles")
+@patch("src.main.iter_rss_articles")
+def test_run_fans_out_profiles_with_shared_summaries(
+    mock_rss, mock_newsapi, mock_summarize, mock_send, monkeypatch
+):
+    monkeypatch.setattr(config, "PROFILES", [
+        {"name": "llm", "keywords": ["llm"], "recipients": ["a@example.com", "b@example.com"]},
+        {"name": "robots", "keywords": ["robot", "llm"], "recipients": ["c@example.com"]},
+    ])
+    llm = {"title": "New LLM released", "link": "https://a.com", "source": "HN", "description": ""}
+    robot = {"title": "Robot learns to cook", "link": "https://b.com", "source": "TC", "description": ""}
+    mock_rss.return_value = [llm, robot]
+    mock_newsapi.return_value = []
+    mock_summarize.side_effect = lambda articles, **kwargs: {
+        "articles": [{**article, "titulo_pt": f"PT {article['title']}"} for article in articles],
+    }
+    mock_send.return_value = [{"id": "1"}, {"id": "2"}, {"id": "3"}]
+
+    run()
+
+    assert [a["link"] for a in mock_summarize.call_args.kwargs["articles"]] == ["https://a.com", "https://b.com"]
+    messages = mock_send.call_args.kwargs["messages"]
+    assert [m["to"] for m in messages] == ["a@example.com", "b@example.com", "c@example.com"]
+    assert "PT New LLM released" in messages[0]["html"] and "Robot" not in messages[0]["html"]
+    assert "PT Robot learns to cook" in messages[2]["html"]
+
+    index = SeenIndex(config.SEEN_INDEX_PATH)
+    assert [index.is_seen(as_article(a), scope="llm") for a in (llm, robot)] == [True, False]
+    assert [index.is_seen(as_article(a), scope="robots") for a in (llm, robot)] == [True, True]
+
+
+@patch("src.main.send_digest_batch")
+@patch("src.main.summarize_articles")
+@patch("src.main.iter_newsapi_articles")
+@patch("src.main.iter_rss_articles")
+def test_run_writes_report_when_metrics_are_enabled(
+    mock_rss, mock_newsapi, mock_summarize, mock_send, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(config, "METRICS_ENABLED", True)
+    monkeypatch.setattr(config, "METRICS_REPORT_PATH", str(tmp_path / "report.json"))
+    article = {"title": "New AI model", "link": "https://a.com", "source": "HN", "description": ""}
+    mock_rss.return_value = [article]
+    mock_newsapi.return_value = []
+    mock_summarize.return_value = {"articles": [article]}
+    mock_send.return_value = [{"id": "sent123"}]
+
+    run()
+
+    report = json.loads((tmp_path / "report.json").read_text())
+    stages = {t["labels"]["stage"] for t in report["timers"] if t["name"] == "pipeline.stage"}
+    assert stages == {"select", "enrich", "summarize", "render", "send"}
+    assert {"name": "articles", "labels": {"step": "dedup"}, "value": 1} in report["counters"]
+
+
+@patch("src.main.send_digest_batch", return_value=[{"id": "sent123"}])
+@patch("src.main.summarize_articles")
+@patch("src.main.iter_newsapi_articles")
+@patch("src.main.iter_rss_articles")
+def test_run_summarizes_one_article_per_topic_and_links_the_rest(
+    mock_rss, mock_newsapi, mock_summarize, mock_send, monkeypatch
+):
+    monkeypatch.setattr(config, "SOURCE_WEIGHTS", {"TC": 1.2})
+    mock_rss.return_value = [
+        {"title": "OpenAI launches GPT-6 with faster reasoning", "link": "https://tc.com/gpt6", "source": "TC",
+         "description": "OpenAI on Tuesday released GPT-6, its newest model."},
+        {"title": "Nvidia unveils new AI chip for data centers", "link": "https://hn.com/chip", "source": "HN",
+         "description": "The chip targets inference workloads."},
+    ]
+    mock_newsapi.return_value = [
+        {"title": "GPT-6 is here: OpenAI's new model reasons faster", "link": "https://verge.com/gpt6",
+         "source": "The Verge", "description": "OpenAI released GPT-6 today."},
+    ]
+    mock_summarize.side_effect = lambda articles, **kwargs: {"articles": articles}
+
+    run()
+
+    summarized = mock_summarize.call_args.kwargs["articles"]
+    assert sorted(a["link"] for a in summarized) == ["https://hn.com/chip", "https://tc.com/gpt6"]
+    html = mock_send.call_args.kwargs["messages"][0]["html"]
+    assert 'Também em: <a href="https://verge.com/gpt6"' in html
+
+
+@patch("src.main.send_digest_batch", return_value=[{"id": "sent123"}])
+@patch("src.main.summarize_articles")
+@patch("src.main.fetch_full_texts")
+@patch("src.main.iter_newsapi_articles", return_value=[])
+@patch("src.main.iter_rss_articles")
+def test_run_passes_fetched_full_text_to_summarizer(
+    mock_rss, mock_newsapi, mock_fetch, mock_summarize, mock_send, monkeypatch
+):
+    monkeypatch.setattr(config, "FULLTEXT_ENABLED", True)
+    mock_rss.return_value = [
+        {"title": "New AI model", "link": "https://a.com", "source": "HN", "description": "Teaser"},
+        {"title": "AI chip", "link": "https://b.com", "source": "HN", "description": "Chip teaser"},
+    ]
+    mock_fetch.return_value = {"https://a.com": "The whole story."}
+    mock_summarize.side_effect = lambda articles, **kwargs: {"articles": articles}
+
+    run()
+
+    assert sorted(a["link"] for a in mock_fetch.call_args.args[0]) == ["https://a.com", "https://b.com"]
+    contents = {a["link"]: a["content"] for a in mock_summarize.call_args.kwargs["articles"]}
+    assert contents == {"https://a.com": "The whole story.", "https://b.com": ""}
+
+
+@patch("src.main.send_digest_batch", return_value=[{"id": "sent123"}])
+@patch("src.main.summarize_articles")
+@patch("src.main.iter_newsapi_articles")
+@patch("src.main.iter_rss_articles")
+def test_run_keeps_the_rss_copy_of_a_story_however_fetches_finish(
+    mock_rss, mock_newsapi, mock_summarize, mock_send
+):
+    def slow_rss():
+        time.sleep(0.1)
+        yield {"title": "New AI model", "link": "https://a.com/story", "source": "TC", "description": "AI"}
+
+    mock_rss.return_value = slow_rss()
+    mock_newsapi.return_value = [
+        {"title": "New AI model", "link": "https://a.com/story?utm_source=x", "source": "Verge", "description": "AI"},
+    ]
+    mock_summarize.side_effect = lambda articles, **kwargs: {"articles": articles}
+
+    run()
+
+    summarized = mock_summarize.call_args.kwargs["articles"]
+    assert [(a["source"], a["link"]) for a in summarized] == [("TC", "https://a.com/story")]
+    assert summarized[0]["related"] == [{"source": "Verge", "link": "https://a.com/story?utm_source=x"}]
@@ -1,5 +1,24 @@
+import time
 from unittest.mock import patch, MagicMock
+
+from newsapi.newsapi_exception import NewsAPIException
+
 from src.collectors.newsapi import collect_newsapi_articles
+from src.rate_limit import TokenBucket
+
+
+def _item(n):
+    return {
+        "title": f"Article {n}",
+        "url": f"https://example.com/{n}",
+        "source": {"name": "Source"},
+        "description": "Desc",
+        "publishedAt": "2026-02-18T06:00:00Z",
+    }
+
+
+def _rate_limited():
+    return NewsAPIException({"status": "error", "code": "rateLimited", "message": "Too many requests"})
 
 
 @patch("src.collectors.newsapi.NewsApiClient")
@@ -55,3 +74,90 @@ def test_collect_newsapi_deduplicates_across_queries(mock_client_class):
     )
 
     assert len(articles) == 1  # Deduplicated by URL
+
+
+@patch("src.collectors.newsapi.NewsApiClient")
+def test_collect_newsapi_runs_queries_concurrently(mock_client_class):
+    def slow_search(q, **kwargs):
+        time.sleep(0.2)
+        return {"status": "ok", "articles": [_item(q)]}
+
+    mock_client_class.return_value.get_everything.side_effect = slow_search
+
+    start = time.monotonic()
+    articles = collect_newsapi_articles(
+        api_key="fake-key",
+        queries=["a", "b", "c"],
+        rate_limiter=TokenBucket(rate=100, capacity=3),
+    )
+    elapsed = time.monotonic() - start
+
+    assert [a["title"] for a in articles] == ["Article a", "Article b", "Article c"]
+    assert elapsed < 0.5
+
+
+@patch("src.collectors.newsapi.NewsApiClient")
+def test_collect_newsapi_retries_rate_limited_requests(mock_client_class):
+    mock_client = mock_client_class.return_value
+    mock_client.get_everything.side_effect = [
+        _rate_limited(),
+        {"status": "ok", "articles": [_item(1)]},
+    ]
+
+    articles = collect_newsapi_articles(
+        api_key="fake-key", queries=["AI"], rate_limiter=TokenBucket(rate=100, capacity=5), backoff=0,
+    )
+
+    assert len(articles) == 1
+    assert mock_client.get_everything.call_count == 2
+
+
+@patch("src.collectors.newsapi.NewsApiClient")
+def test_collect_newsapi_does_not_retry_client_errors(mock_client_class):
+    mock_client = mock_client_class.return_value
+    mock_client.get_everything.side_effect = NewsAPIException(
+        {"status": "error", "code": "apiKeyInvalid", "message": "Bad key"}
+    )
+
+    articles = collect_newsapi_articles(api_key="fake-key", queries=["AI"], backoff=0)
+
+    assert articles == []
+    assert mock_client.get_everything.call_count == 1
+
+
+@patch("src.collectors.newsapi.NewsApiClient")
+def test_collect_newsapi_paginates_until_total_results(mock_client_class):
+    mock_client = mock_client_class.return_value
+    mock_client.get_everything.side_effect = [
+        {"status": "ok", "totalResults": 3, "articles": [_item(1), _item(2)]},
+        {"status": "ok", "totalResults": 3, "articles": [_item(3)]},
+    ]
+
+    articles = collect_newsapi_articles(
+        api_key="fake-key",
+        queries=["AI"],
+        page_size=2,
+        max_pages=5,
+        rate_limiter=TokenBucket(rate=100, capacity=5),
+    )
+
+    assert len(articles) == 3
+    assert [c.kwargs["page"] for c in mock_client.get_everything.call_args_list] == [1, 2]
+
+
+@patch("src.collectors.newsapi.NewsApiClient")
+def test_collect_newsapi_stops_when_request_budget_is_spent(mock_client_class):
+    mock_client = mock_client_class.return_value
+    mock_client.get_everything.side_effect = lambda q, **kwargs: {
+        "status": "ok", "totalResults": 100, "articles": [_item(f"{q}-{kwargs['page']}")],
+    }
+
+    articles = collect_newsapi_articles(
+        api_key="fake-key",
+        queries=["AI"],
+        page_size=1,
+        max_pages=10,
+        rate_limiter=TokenBucket(rate=100, capacity=10, budget=3),
+    )
+
+    assert len(articles) == 3
@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from src.pipeline import Pipeline, Stage, merge_iterators
+
+
+def test_pipeline_passes_outputs_between_stages_and_clears_checkpoints(tmp_path):
+    stages = [
+        Stage("a", lambda r: [1, 2]),
+        Stage("b", lambda r: sum(r["a"]), ["a"]),
+    ]
+
+    results = Pipeline(stages, tmp_path / "run").run()
+
+    assert results == {"a": [1, 2], "b": 3}
+    assert not (tmp_path / "run").exists()
+
+
+def test_pipeline_resumes_from_first_incomplete_stage(tmp_path):
+    calls = []
+
+    def flaky(results):
+        calls.append("send")
+        if calls.count("send") == 1:
+            raise ConnectionError("email provider down")
+        return {"sent": results["collect"]}
+
+    stages = [
+        Stage("collect", lambda r: calls.append("collect") or ["story"]),
+        Stage("send", flaky, ["collect"]),
+    ]
+
+    with pytest.raises(ConnectionError):
+        Pipeline(stages, tmp_path / "run").run()
+    results = Pipeline(stages, tmp_path / "run").run()
+
+    assert calls == ["collect", "send", "send"]
+    assert results["send"] == {"sent": ["story"]}
+
+
+def test_pipeline_runs_independent_stages_concurrently(tmp_path):
+    barrier = threading.Barrier(2, timeout=2)
+
+    def collector(name):
+        def collect(results):
+            barrier.wait()  # only passes if both collectors are running at once
+            return name
+        return collect
+
+    stages = [
+        Stage("rss", collector("rss")),
+        Stage("newsapi", collector("newsapi")),
+        Stage("merge", lambda r: [r["rss"], r["newsapi"]], ["rss", "newsapi"]),
+    ]
+
+    assert Pipeline(stages, tmp_path / "run").run()["merge"] == ["rss", "newsapi"]
+
+
+def test_pipeline_keeps_finished_sibling_when_another_stage_fails(tmp_path):
+    def broken(results):
+        raise TimeoutError("newsapi down")
+
+    stages = [
+        Stage("rss", lambda r: ["rss story"]),
+        Stage("newsapi", broken),
+    ]
+    pipeline = Pipeline(stages, tmp_path / "run")
+
+    with pytest.raises(TimeoutError):
+        pipeline.run()
+
+    assert pipeline.load_checkpoint("rss") == (True, ["rss story"])
+
+
+def test_pipeline_rejects_unknown_dependencies(tmp_path):
+    with pytest.raises(ValueError):
+        Pipeline([Stage("b", lambda r: None, ["a"])], tmp_path)
+
+
+def test_merge_iterators_interleaves_as_items_arrive():
+    release = threading.Event()
+
+    def slow():
+        release.wait(timeout=2)
+        yield "slow"
+
+    merged = merge_iterators(slow(), iter(["fast 1", "fast 2"]))
+
+    assert [next(merged), next(merged)] == ["fast 1", "fast 2"]
+    release.set()
+    assert list(merged) == ["slow"]
+
+
+def test_merge_iterators_reraises_producer_errors():
+    def broken():
+        yield 1
+        raise ValueError("feed exploded")
+
+    with pytest.raises(ValueError, match="feed exploded"):
+        list(merge_iterators(broken(), iter([2, 3])))
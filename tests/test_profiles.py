@@ -0,0 +1,21 @@
+from src.article import Article
+from src.profiles import Profile, ProfileMatcher
+
+
+def test_profile_from_dict_fills_defaults():
+    profile = Profile.from_dict({"name": "llm", "keywords": ["llm", "gpt"]})
+
+    assert profile.keywords == ("llm", "gpt")
+    assert profile.recipients == ()
+    assert profile.max_articles == 15
+
+
+def test_profile_matcher_reports_hits_per_matching_profile():
+    matcher = ProfileMatcher([
+        Profile("llm", ("llm",), ()),
+        Profile("robots", ("robot", "llm"), ()),
+        Profile("chips", ("gpu",), ()),
+    ])
+    article = Article(title="Robots powered by LLMs", link="https://a.com", source="HN")
+
+    assert matcher.matches(article) == {"llm": {"llm": 1}, "robots": {"robot": 1, "llm": 1}}
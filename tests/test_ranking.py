@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+from src.ranking import rank_articles, rank_stream, score_article
+
+
+NOW = datetime(2026, 2, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _article(title, hours_ago=1, source="HN", hits=None, related=None):
+    return {
+        "title": title,
+        "description": "",
+        "source": source,
+        "published": (NOW - timedelta(hours=hours_ago)).isoformat(),
+        "keyword_hits": hits or {"ai": 1},
+        "related": related or [],
+    }
+
+
+def test_score_prefers_recent_corroborated_and_weighted_articles():
+    base = score_article(_article("AI news"), NOW)
+
+    assert score_article(_article("AI news", hours_ago=30), NOW) < base
+    assert score_article(_article("AI news", related=[{"source": "TC", "link": "x"}]), NOW) > base
+    assert score_article(_article("AI news", source="MIT"), NOW, source_weights={"MIT": 1.5}) > base
+    assert score_article(_article("AI news", hits={"ai": 1, "llm": 2}), NOW) > base
+
+
+def test_score_handles_missing_or_invalid_published():
+    article = _article("AI news")
+    article["published"] = None
+    undated = score_article(article, NOW)
+    article["published"] = "not a date"
+
+    assert score_article(article, NOW) == undated
+
+
+def test_rank_articles_returns_top_k_best_first():
+    articles = [
+        _article("old", hours_ago=48),
+        _article("fresh", hours_ago=1),
+        _article("corroborated", hours_ago=1, related=[{"source": "TC", "link": "x"}]),
+    ]
+
+    ranked = rank_articles(articles, k=2, now=NOW)
+
+    assert [a["title"] for a in ranked] == ["corroborated", "fresh"]
+
+
+def test_rank_articles_keeps_input_order_for_ties():
+    articles = [_article(f"same {i}") for i in range(4)]
+
+    assert [a["title"] for a in rank_articles(articles, k=3, now=NOW)] == ["same 0", "same 1", "same 2"]
+
+
+def test_rank_stream_matches_rank_articles_and_ignores_arrival_order():
+    articles = [
+        {**_article(f"story {i}", hours_ago=i % 7, hits={"ai": 1 + i % 3}), "link": f"https://x.com/{i}"}
+        for i in range(50)
+    ]
+    expected = [a["link"] for a in rank_articles(articles, k=5, now=NOW)]
+
+    assert [a["link"] for a in rank_stream(iter(articles), k=5, now=NOW)] == expected
+    assert [a["link"] for a in rank_stream(reversed(articles), k=5, now=NOW)] == expected
+
+
+def test_rank_stream_breaks_score_ties_like_rank_articles():
+    articles = [{**_article("same story"), "link": f"https://x.com/{i}"} for i in (3, 1, 4, 0, 5, 9, 2, 6)]
+
+    expected = [a["link"] for a in rank_articles(articles, k=2, now=NOW)]
+
+    assert expected == ["https://x.com/9", "https://x.com/6"]
+    assert [a["link"] for a in rank_stream(iter(articles), k=2, now=NOW, slack=1)] == expected
+    assert [a["link"] for a in rank_stream(reversed(articles), k=2, now=NOW, slack=1)] == expected
+
+
+def test_rank_stream_rescores_corroboration_added_after_arrival():
+    late = {**_article("late", hours_ago=5), "link": "https://x.com/late"}
+    fresh = [{**_article(f"fresh {i}"), "link": f"https://x.com/{i}"} for i in range(3)]
+
+    def stream():
+        yield late
+        yield from fresh
+        late["related"].extend({"source": s, "link": "x"} for s in ("A", "B", "C"))
+
+    assert rank_stream(stream(), k=1, now=NOW, slack=4)[0]["title"] == "late"
@@ -1,6 +1,19 @@
 # tests/test_rss.py
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
-from src.collectors.rss import collect_rss_articles
+
+import pytest
+
+from src.collectors.feed_cache import FeedCache
+from src.collectors.rss import _fetch_feed, collect_rss_articles, iter_rss_articles
+
+
+def _recent_parsed_time():
+    return (datetime.now(timezone.utc) - timedelta(hours=1)).timetuple()
 
 
 def _fake_feed(titles):
@@ -11,13 +24,14 @@ def _fake_feed(titles):
         entry.title = title
         entry.link = f"https://example.com/{title.lower().replace(' ', '-')}"
         entry.get.return_value = "Test source description"
-        entry.published_parsed = (2026, 2, 18, 8, 0, 0, 2, 49, 0)
+        entry.published_parsed = _recent_parsed_time()
         feed.entries.append(entry)
     return feed
 
 
+@patch("src.collectors.rss._fetch_feed", return_value=(b"", {}))
 @patch("src.collectors.rss.feedparser.parse")
-def test_collect_rss_returns_articles(mock_parse):
+def test_collect_rss_returns_articles(mock_parse, mock_fetch):
     mock_parse.return_value = _fake_feed(["AI Breakthrough", "New Chip Released"])
 
     feeds = [{"name": "TestFeed", "url": "https://example.com/rss"}]
@@ -29,11 +43,205 @@ def test_collect_rss_returns_articles(mock_parse):
     assert "link" in articles[0]
 
 
+@patch("src.collectors.rss._fetch_feed", return_value=(b"", {}))
 @patch("src.collectors.rss.feedparser.parse")
-def test_collect_rss_handles_empty_feed(mock_parse):
+def test_collect_rss_handles_empty_feed(mock_parse, mock_fetch):
     mock_parse.return_value = _fake_feed([])
 
     feeds = [{"name": "Empty", "url": "https://example.com/rss"}]
     articles = collect_rss_articles(feeds)
 
     assert articles == []
+
+
+@patch("src.collectors.rss.feedparser.parse")
+@patch("src.collectors.rss._fetch_feed")
+def test_collect_rss_keeps_feed_order_when_fetched_concurrently(mock_fetch, mock_parse):
+    delays = {"https://slow.example.com/rss": 0.2, "https://fast.example.com/rss": 0.0}
+
+    def fake_fetch(url, timeout, cached=None):
+        time.sleep(delays[url])
+        return url.encode(), {}
+
+    mock_fetch.side_effect = fake_fetch
+    mock_parse.side_effect = lambda data, **kwargs: _fake_feed(
+        ["Slow Story"] if b"slow" in data else ["Fast Story"]
+    )
+
+    feeds = [
+        {"name": "Slow", "url": "https://slow.example.com/rss"},
+        {"name": "Fast", "url": "https://fast.example.com/rss"},
+    ]
+    articles = collect_rss_articles(feeds, max_workers=2)
+
+    assert [a["source"] for a in articles] == ["Slow", "Fast"]
+
+
+@patch("src.collectors.rss.feedparser.parse")
+@patch("src.collectors.rss._fetch_feed")
+def test_iter_rss_yields_in_feed_order_while_fetching_concurrently(mock_fetch, mock_parse):
+    delays = {"https://slow.example.com/rss": 0.2, "https://fast.example.com/rss": 0.0}
+    started = []
+
+    def fake_fetch(url, timeout, cached=None):
+        started.append(url)
+        time.sleep(delays[url])
+        return url.encode(), {}
+
+    mock_fetch.side_effect = fake_fetch
+    mock_parse.side_effect = lambda data, **kwargs: _fake_feed(
+        ["Slow Story"] if b"slow" in data else ["Fast Story"]
+    )
+
+    feeds = [
+        {"name": "Slow", "url": "https://slow.example.com/rss"},
+        {"name": "Fast", "url": "https://fast.example.com/rss"},
+    ]
+    articles = iter_rss_articles(feeds, max_workers=2)
+
+    assert next(articles)["source"] == "Slow"
+    assert len(started) == 2
+    assert [a["source"] for a in articles] == ["Fast"]
+
+
+@patch("src.collectors.rss.feedparser.parse")
+@patch("src.collectors.rss._fetch_feed")
+def test_collect_rss_isolates_failing_feed(mock_fetch, mock_parse):
+    def fake_fetch(url, timeout, cached=None):
+        if "broken" in url:
+            raise TimeoutError("feed hung")
+        return b"", {}
+
+    mock_fetch.side_effect = fake_fetch
+    mock_parse.return_value = _fake_feed(["AI Breakthrough"])
+
+    feeds = [
+        {"name": "Broken", "url": "https://broken.example.com/rss"},
+        {"name": "Working", "url": "https://example.com/rss"},
+    ]
+    articles = collect_rss_articles(feeds, timeout=1.0)
+
+    assert len(articles) == 1
+    assert articles[0]["source"] == "Working"
+
+
+RSS_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Local</title>
+<item><title>AI Breakthrough</title><link>https://example.com/ai</link>
+<description>Test</description><pubDate>{pub_date}</pubDate></item>
+</channel></rss>"""
+
+
+def _serve_feed(send_validators):
+    """Start a local HTTP stand-in server for a single RSS feed."""
+    body = RSS_XML.format(pub_date=format_datetime(datetime.now(timezone.utc))).encode()
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.headers.get("If-None-Match"))
+            if send_validators and self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            if send_validators:
+                self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+def test_collect_rss_uses_conditional_get_with_cache(tmp_path):
+    server, hits = _serve_feed(send_validators=True)
+    feeds = [{"name": "Local", "url": f"http://127.0.0.1:{server.server_port}/rss"}]
+    try:
+        first = collect_rss_articles(feeds, cache=FeedCache(tmp_path / "feeds.json"))
+        with patch("src.collectors.rss.feedparser.parse") as mock_parse:
+            second = collect_rss_articles(feeds, cache=FeedCache(tmp_path / "feeds.json"))
+    finally:
+        server.shutdown()
+
+    assert [a["title"] for a in first] == ["AI Breakthrough"]
+    assert second == []
+    assert hits == [None, '"v1"']
+    mock_parse.assert_not_called()
+
+
+def test_collect_rss_skips_unchanged_body_without_validators(tmp_path):
+    server, hits = _serve_feed(send_validators=False)
+    feeds = [{"name": "Local", "url": f"http://127.0.0.1:{server.server_port}/rss"}]
+    try:
+        first = collect_rss_articles(feeds, cache=FeedCache(tmp_path / "feeds.json"))
+        with patch("src.collectors.rss.feedparser.parse") as mock_parse:
+            second = collect_rss_articles(feeds, cache=FeedCache(tmp_path / "feeds.json"))
+    finally:
+        server.shutdown()
+
+    assert len(first) == 1
+    assert second == []
+    assert len(hits) == 2
+    mock_parse.assert_not_called()
+
+
+@patch("src.collectors.rss.feedparser.parse")
+@patch("src.collectors.rss._fetch_feed")
+def test_collect_rss_fast_parser_skips_feedparser(mock_fetch, mock_parse):
+    body = RSS_XML.format(pub_date=format_datetime(datetime.now(timezone.utc)))
+    mock_fetch.return_value = (body.replace("Test", "Test\nPoints: 12").encode(), {})
+
+    articles = collect_rss_articles([{"name": "Local", "url": "https://example.com/rss"}], parser="fast")
+
+    assert [(a.title, a.source, a.description) for a in articles] == [("AI Breakthrough", "Local", "Test")]
+    mock_parse.assert_not_called()
+
+
+@patch("src.collectors.rss.feedparser.parse")
+@patch("src.collectors.rss._fetch_feed", return_value=(b"<rss><channel><item>&nbsp;", {}))
+def test_collect_rss_falls_back_to_feedparser_for_malformed_feed(mock_fetch, mock_parse):
+    mock_parse.return_value = _fake_feed(["AI Breakthrough"])
+
+    articles = collect_rss_articles([{"name": "Loose", "url": "https://example.com/rss"}], parser="fast")
+
+    assert [a.title for a in articles] == ["AI Breakthrough"]
+    mock_parse.assert_called_once()
+
+
+def test_fetch_feed_enforces_total_timeout_on_trickling_server():
+    stop = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(1024 * 1024))
+            self.end_headers()
+            while not stop.is_set():  # one byte per 50 ms: every read succeeds, the body never ends
+                try:
+                    self.wfile.write(b" ")
+                    self.wfile.flush()
+                except OSError:
+                    return
+                time.sleep(0.05)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    start = time.monotonic()
+    try:
+        with pytest.raises(TimeoutError):
+            _fetch_feed(f"http://127.0.0.1:{server.server_port}/rss", timeout=0.5)
+    finally:
+        stop.set()
+        server.shutdown()
+
+    assert time.monotonic() - start < 1.5
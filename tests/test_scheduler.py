@@ -0,0 +1,43 @@
+import pytest
+
+from src.scheduler import AdaptiveScheduler
+
+
+def test_scheduler_polls_busy_sources_more_often_than_quiet_ones():
+    scheduler = AdaptiveScheduler(min_interval=60, max_interval=3600, target_new=3)
+    scheduler.add("busy")
+    scheduler.add("quiet")
+    for name in scheduler.due(0):
+        scheduler.record(name, 20, now=0)  # first poll: backlog, no rate yet
+
+    scheduler.record("busy", 6, now=600)  # 1 article / 100 s
+    scheduler.record("quiet", 1, now=600)  # 1 article / 600 s
+
+    assert scheduler.interval("busy") == pytest.approx(300)
+    assert scheduler.interval("quiet") == pytest.approx(1800)
+    assert scheduler.due(900) == ["busy"]
+    assert scheduler.next_due() == pytest.approx(900)
+
+
+def test_scheduler_backs_off_when_unchanged_and_respects_bounds():
+    scheduler = AdaptiveScheduler(min_interval=60, max_interval=500, backoff=2.0)
+    scheduler.add("feed")
+    scheduler.add("api", min_interval=1000)
+
+    assert [scheduler.record("feed", 0, now=t) for t in (0, 1, 2, 3)] == [120, 240, 480, 500]
+    assert scheduler.record("api", 0, now=0) == 1000
+
+
+def test_scheduler_state_round_trips():
+    scheduler = AdaptiveScheduler(min_interval=60, max_interval=3600)
+    scheduler.add("feed")
+    scheduler.record("feed", 0, now=100)
+
+    restored = AdaptiveScheduler(min_interval=60, max_interval=3600)
+    restored.add("feed")
+    restored.add("new")
+    restored.load(scheduler.state())
+
+    assert restored.interval("feed") == 120
+    assert restored.due(150) == ["new"]
+    assert restored.due(220) == ["new", "feed"]
@@ -0,0 +1,56 @@
+import time
+
+from src.article import Article
+from src.seen_index import SeenIndex
+
+
+ARTICLES = [
+    Article(title="A", link="https://example.com/a", source="X"),
+    Article(title="B", link="https://example.com/b", source="X"),
+]
+
+
+def _unseen(index: SeenIndex, scope: str = "") -> list[Article]:
+    return [article for article in ARTICLES if not index.is_seen(article, scope)]
+
+
+def test_seen_index_skips_delivered_articles_across_runs(tmp_path):
+    path = tmp_path / "seen.sqlite3"
+    index = SeenIndex(path)
+    index.mark_seen(ARTICLES[:1])
+    index.close()
+
+    reopened = SeenIndex(path)
+
+    assert _unseen(reopened) == ARTICLES[1:]
+
+
+def test_seen_index_expires_entries_after_ttl(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite3", ttl_days=1)
+    index.mark_seen(ARTICLES)
+    index._conn.execute("UPDATE seen SET seen_at = ?", (time.time() - 2 * 86400,))
+
+    assert _unseen(index) == ARTICLES
+
+
+def test_seen_index_is_bounded(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite3", max_entries=10)
+    for batch in range(5):
+        index.mark_seen([{"link": f"https://example.com/{batch}-{i}"} for i in range(5)])
+
+    assert len(index) == 10
+
+
+def test_seen_index_keeps_scopes_apart(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite3")
+    index.mark_seen(ARTICLES, scope="llm")
+
+    assert _unseen(index, scope="llm") == []
+    assert _unseen(index, scope="robots") == ARTICLES
+
+
+def test_seen_index_marks_related_links_as_delivered(tmp_path):
+    index = SeenIndex(tmp_path / "seen.sqlite3")
+    index.mark_seen([{"link": "https://example.com/a", "related": [{"source": "Y", "link": "https://example.com/b"}]}])
+
+    assert _unseen(index) == []
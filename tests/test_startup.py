@@ -0,0 +1,43 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cumulative `-X importtime` budget for `import src.main`, in microseconds. It
+# is far above the current cost (~0.1 s) but well below what an eagerly
+# imported anthropic SDK alone adds (>1 s).
+IMPORT_BUDGET_US = 500_000
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def test_importing_main_does_not_load_heavy_sdks():
+    result = _python("-c", (
+        "import sys, src.main; "
+        "print(','.join(m for m in ('anthropic', 'resend', 'feedparser', 'httpx', 'pydantic', 'numpy') if m in sys.modules))"
+    ))
+
+    assert result.stdout.strip() == ""
+
+
+def test_import_time_of_main_is_within_budget():
+    result = _python("-X", "importtime", "-c", "import src.main")
+
+    cumulative = {
+        match.group(2): int(match.group(1))
+        for match in re.finditer(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", result.stderr, re.M)
+    }
+    assert cumulative["src.main"] < IMPORT_BUDGET_US
+
+
+def test_config_imports_without_side_effects():
+    result = _python("-c", (
+        "import os, sys; before = set(sys.modules); import config; "
+        "print(sorted(set(sys.modules) - before - {'config'}))"
+    ))
+
+    assert result.stdout.strip() == "[]"
@@ -1,6 +1,13 @@
 import json
+import re
+import threading
+import time
 from unittest.mock import patch, MagicMock
-from src.summarizer import summarize_articles
+
+import pytest
+
+from src.summarizer import NoticiasParser, iter_noticias, summarize_articles
+from src.summary_cache import SummaryCache
 
 
 SAMPLE_ARTICLES = [
@@ -72,3 +79,416 @@ def test_summarize_fallback_on_invalid_json(mock_anthropic_class):
     )
 
     assert len(result["articles"]) == 2
+
+
+def _echo_response(**kwargs):
+    """Stub reply that summarizes every [i] article present in the prompt."""
+    indices = [int(i) for i in re.findall(r"^\[(\d+)\]", kwargs["messages"][0]["content"], re.M)]
+    titles = re.findall(r"^\[\d+\] (.*) \(", kwargs["messages"][0]["content"], re.M)
+    response = MagicMock()
+    response.content = [MagicMock(text=json.dumps({
+        "noticias": [{"titulo_pt": f"PT {t}", "resumo_pt": "Resumo.", "indice": i} for i, t in zip(indices, titles)],
+    }))]
+    return response
+
+
+def _many_articles(n):
+    return [
+        {"title": f"Story {i}", "description": "AI news", "source": "Src", "link": f"https://example.com/{i}"}
+        for i in range(n)
+    ]
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_splits_large_sets_into_chunks_and_merges_by_index(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.create.side_effect = _echo_response
+
+    result = summarize_articles(
+        articles=_many_articles(105),
+        api_key="fake-key",
+        chunk_max_articles=10,
+    )
+
+    assert mock_client.messages.create.call_count == 11
+    assert [a["titulo_pt"] for a in result["articles"]] == [f"PT Story {i}" for i in range(105)]
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_retries_only_chunks_that_failed_to_parse(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    calls = []
+    lock = threading.Lock()
+
+    def flaky(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        with lock:
+            calls.append(content)
+            first_try = calls.count(content) == 1
+        if "Story 0 " in content and first_try:
+            response = MagicMock()
+            response.content = [MagicMock(text='{"noticias": [{"titulo_pt": "trunc')]
+            return response
+        return _echo_response(**kwargs)
+
+    mock_client.messages.create.side_effect = flaky
+
+    result = summarize_articles(articles=_many_articles(4), api_key="fake-key", chunk_max_articles=2)
+
+    assert len(calls) == 3
+    assert [a["titulo_pt"] for a in result["articles"]] == [f"PT Story {i}" for i in range(4)]
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_retries_chunks_whose_call_raised(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    failures = {"Story 2 ": 1}
+    lock = threading.Lock()
+
+    def flaky(**kwargs):
+        content = kwargs["messages"][0]["content"]
+        with lock:
+            for needle, remaining in failures.items():
+                if needle in content and remaining:
+                    failures[needle] -= 1
+                    raise ConnectionError("reset by peer")
+        return _echo_response(**kwargs)
+
+    mock_client.messages.create.side_effect = flaky
+
+    result = summarize_articles(articles=_many_articles(4), api_key="fake-key", chunk_max_articles=2)
+
+    assert mock_client.messages.create.call_count == 3
+    assert [a["titulo_pt"] for a in result["articles"]] == [f"PT Story {i}" for i in range(4)]
+
+    failures["Story 2 "] = 2
+    with pytest.raises(ConnectionError):
+        summarize_articles(articles=_many_articles(4), api_key="fake-key", chunk_max_articles=2)
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_runs_chunks_concurrently(mock_anthropic_class):
+    def slow(**kwargs):
+        time.sleep(0.2)
+        return _echo_response(**kwargs)
+
+    mock_anthropic_class.return_value.messages.create.side_effect = slow
+
+    start = time.monotonic()
+    summarize_articles(articles=_many_articles(40), api_key="fake-key", chunk_max_articles=10, max_workers=4)
+
+    assert time.monotonic() - start < 0.5
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_sends_only_cache_misses_to_claude(mock_anthropic_class, tmp_path):
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.create.side_effect = _echo_response
+    cache = SummaryCache(tmp_path / "summaries.sqlite3")
+    articles = _many_articles(3)
+
+    summarize_articles(articles=articles[1:2], api_key="fake-key", cache=cache)
+    result = summarize_articles(articles=articles, api_key="fake-key", cache=cache)
+
+    second_prompt = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+    assert "Story 1" not in second_prompt
+    assert [a["titulo_pt"] for a in result["articles"]] == ["PT Story 0", "PT Story 1", "PT Story 2"]
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_skips_claude_when_everything_is_cached(mock_anthropic_class, tmp_path):
+    mock_anthropic_class.return_value.messages.create.side_effect = _echo_response
+    cache = SummaryCache(tmp_path / "summaries.sqlite3")
+    summarize_articles(articles=SAMPLE_ARTICLES, api_key="fake-key", cache=cache)
+    mock_anthropic_class.reset_mock()
+
+    result = summarize_articles(articles=SAMPLE_ARTICLES, api_key="fake-key", cache=cache)
+
+    mock_anthropic_class.assert_not_called()
+    assert result["articles"][1]["titulo_pt"] == "PT Apple announces AI chip"
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_does_not_cache_fallback_text(mock_anthropic_class, tmp_path):
+    mock_response = MagicMock()
+    mock_response.content = [MagicMock(text="Texto livre, não é JSON")]
+    mock_anthropic_class.return_value.messages.create.return_value = mock_response
+    cache = SummaryCache(tmp_path / "summaries.sqlite3")
+
+    summarize_articles(articles=SAMPLE_ARTICLES, api_key="fake-key", cache=cache)
+
+    assert len(cache) == 0
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_caches_finished_chunks_when_another_chunk_fails(mock_anthropic_class, tmp_path):
+    def failing(**kwargs):
+        if "Story 2 " in kwargs["messages"][0]["content"]:
+            raise ConnectionError("reset by peer")
+        return _echo_response(**kwargs)
+
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.create.side_effect = failing
+    cache = SummaryCache(tmp_path / "summaries.sqlite3")
+
+    with pytest.raises(ConnectionError):
+        summarize_articles(articles=_many_articles(4), api_key="fake-key", chunk_max_articles=2, cache=cache)
+
+    assert len(cache) == 2
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_caches_each_chunk_without_waiting_for_slower_ones(mock_anthropic_class, tmp_path):
+    cache = SummaryCache(tmp_path / "summaries.sqlite3")
+    put_many = cache.put_many
+    cached = threading.Event()
+    cache.put_many = lambda entries: (put_many(entries), cached.set())
+    cached_while_first_chunk_ran = []
+
+    def slow_first(**kwargs):
+        if "Story 0 " in kwargs["messages"][0]["content"]:
+            cached_while_first_chunk_ran.append(cached.wait(timeout=2))
+        return _echo_response(**kwargs)
+
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.create.side_effect = slow_first
+
+    summarize_articles(articles=_many_articles(4), api_key="fake-key", chunk_max_articles=2, cache=cache)
+
+    assert cached_while_first_chunk_ran == [True]
+    assert len(cache) == 4
+
+
+def test_noticias_parser_emits_items_as_soon_as_they_complete():
+    parser = NoticiasParser()
+    emitted = [parser.feed(char) for char in "```json\n" + MOCK_JSON_RESPONSE]
+
+    completed_at = [i for i, items in enumerate(emitted) if items]
+    assert len(completed_at) == 2
+    assert completed_at[0] < len(emitted) - 10
+    assert [items[0]["indice"] for items in emitted if items] == [0, 1]
+
+
+def test_iter_noticias_salvages_complete_items_from_truncated_reply():
+    truncated = MOCK_JSON_RESPONSE[: MOCK_JSON_RESPONSE.index('"indice": 1') - 20]
+
+    items = list(iter_noticias([truncated]))
+
+    assert [item["titulo_pt"] for item in items] == ["OpenAI lança GPT-5"]
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_keeps_salvaged_items_and_reports_missing_indices(mock_anthropic_class):
+    truncated = MOCK_JSON_RESPONSE[: MOCK_JSON_RESPONSE.index('"indice": 1') - 20]
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.create.side_effect = [
+        MagicMock(content=[MagicMock(text=truncated)]),
+        MagicMock(content=[MagicMock(text="Texto livre, não é JSON")]),
+    ]
+
+    result = summarize_articles(articles=SAMPLE_ARTICLES, api_key="fake-key", max_retries=1)
+
+    retry_prompt = mock_client.messages.create.call_args_list[1].kwargs["messages"][0]["content"]
+    assert "OpenAI releases GPT-5" not in retry_prompt
+    assert "[0] Apple announces AI chip" in retry_prompt
+    assert result["articles"][0]["titulo_pt"] == "OpenAI lança GPT-5"
+    assert result["articles"][1]["titulo_pt"] == "Apple announces AI chip"
+    assert result["failed_indices"] == [1]
+
+
+class _FakeStream:
+    def __init__(self, text, chunk_size=7, fail_at=None):
+        self.text_stream = self._chunks(text, chunk_size, fail_at)
+
+    @staticmethod
+    def _chunks(text, chunk_size, fail_at):
+        for i in range(0, len(text), chunk_size):
+            if fail_at is not None and i >= fail_at:
+                raise ConnectionError("overloaded")
+            yield text[i:i + chunk_size]
+
+    def get_final_message(self):
+        return MagicMock(usage=MagicMock(
+            input_tokens=50, cache_creation_input_tokens=0, cache_read_input_tokens=400, output_tokens=120,
+        ))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_streaming_reports_each_item_as_it_arrives(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.stream.side_effect = lambda **kwargs: _FakeStream(MOCK_JSON_RESPONSE)
+    received = []
+
+    result = summarize_articles(
+        articles=SAMPLE_ARTICLES,
+        api_key="fake-key",
+        stream=True,
+        on_summary=lambda index, noticia: received.append((index, noticia["titulo_pt"])),
+    )
+
+    mock_client.messages.create.assert_not_called()
+    assert received == [(0, "OpenAI lança GPT-5"), (1, "Apple anuncia chip de IA")]
+    assert result["articles"][1]["titulo_pt"] == "Apple anuncia chip de IA"
+    assert result["failed_indices"] == []
+    assert result["usage"]["cache_read_input_tokens"] == 400
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_streaming_keeps_items_received_before_the_stream_failed(mock_anthropic_class):
+    second_item_at = MOCK_JSON_RESPONSE.index('"indice": 1') - 20
+    retry_reply = json.dumps({"noticias": [{"titulo_pt": "Apple anuncia chip de IA", "resumo_pt": "Resumo.", "indice": 0}]})
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.stream.side_effect = [
+        _FakeStream(MOCK_JSON_RESPONSE, fail_at=second_item_at),
+        _FakeStream(retry_reply),
+    ]
+    received = []
+
+    result = summarize_articles(
+        articles=SAMPLE_ARTICLES,
+        api_key="fake-key",
+        stream=True,
+        on_summary=lambda index, noticia: received.append(index),
+    )
+
+    retry_prompt = mock_client.messages.stream.call_args_list[1].kwargs["messages"][0]["content"]
+    assert "OpenAI releases GPT-5" not in retry_prompt
+    assert received == [0, 1]
+    assert [a["titulo_pt"] for a in result["articles"]] == ["OpenAI lança GPT-5", "Apple anuncia chip de IA"]
+    assert result["failed_indices"] == []
+
+
+class _FakeBatches:
+    """Local stand-in for client.messages.batches that answers each request via `reply`."""
+
+    def __init__(self, reply, polls_until_done=2, finished_before_cancel=0):
+        self.reply = reply
+        self.polls_until_done = polls_until_done
+        self.finished_before_cancel = finished_before_cancel
+        self.requests = []
+        self.cancelled = []
+
+    def create(self, requests):
+        self.requests = requests
+        return MagicMock(id="batch_1", processing_status="in_progress")
+
+    def retrieve(self, batch_id):
+        self.polls_until_done -= 1
+        status = "ended" if self.polls_until_done <= 0 else "in_progress"
+        return MagicMock(id=batch_id, processing_status=status)
+
+    def cancel(self, batch_id):
+        self.cancelled.append(batch_id)
+        self.polls_until_done = 2  # the cancellation itself takes a couple of polls to end
+
+    def results(self, batch_id):
+        for n, request in reversed(list(enumerate(self.requests))):
+            if self.cancelled and n >= self.finished_before_cancel:
+                yield MagicMock(custom_id=request["custom_id"], result=MagicMock(type="canceled"))
+                continue
+            text = self.reply(**request["params"]).content[0].text
+            result = MagicMock(type="succeeded")
+            result.message.content = [MagicMock(text=text)]
+            yield MagicMock(custom_id=request["custom_id"], result=result)
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_batch_backend_maps_results_by_custom_id(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.batches = _FakeBatches(_echo_response)
+
+    result = summarize_articles(
+        articles=_many_articles(25),
+        api_key="fake-key",
+        chunk_max_articles=10,
+        backend="batch",
+        batch_poll_interval=0,
+    )
+
+    assert len(mock_client.messages.batches.requests) == 3
+    mock_client.messages.create.assert_not_called()
+    assert [a["titulo_pt"] for a in result["articles"]] == [f"PT Story {i}" for i in range(25)]
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_batch_backend_falls_back_to_sync_after_deadline(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.batches = _FakeBatches(_echo_response, polls_until_done=10**6)
+    mock_client.messages.create.side_effect = _echo_response
+
+    result = summarize_articles(
+        articles=SAMPLE_ARTICLES,
+        api_key="fake-key",
+        backend="batch",
+        batch_deadline=0.05,
+        batch_poll_interval=0.01,
+    )
+
+    assert mock_client.messages.batches.cancelled == ["batch_1"]
+    assert mock_client.messages.create.call_count == 1
+    assert result["articles"][0]["titulo_pt"] == "PT OpenAI releases GPT-5"
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_batch_backend_keeps_requests_finished_before_cancel(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.batches = _FakeBatches(_echo_response, polls_until_done=10**6, finished_before_cancel=2)
+    mock_client.messages.create.side_effect = _echo_response
+
+    result = summarize_articles(
+        articles=_many_articles(25),
+        api_key="fake-key",
+        chunk_max_articles=10,
+        backend="batch",
+        batch_deadline=0.05,
+        batch_poll_interval=0.01,
+    )
+
+    assert mock_client.messages.batches.cancelled == ["batch_1"]
+    assert mock_client.messages.create.call_count == 1
+    assert "Story 20 " in mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+    assert [a["titulo_pt"] for a in result["articles"]] == [f"PT Story {i}" for i in range(25)]
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_marks_system_prompt_cacheable_and_reports_usage(mock_anthropic_class):
+    mock_response = MagicMock()
+    mock_response.content = [MagicMock(text=MOCK_JSON_RESPONSE)]
+    mock_response.usage = MagicMock(
+        input_tokens=80, cache_creation_input_tokens=900, cache_read_input_tokens=0, output_tokens=300,
+    )
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.create.return_value = mock_response
+
+    result = summarize_articles(articles=SAMPLE_ARTICLES, api_key="fake-key")
+
+    system = mock_client.messages.create.call_args.kwargs["system"]
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+    assert "curador de notícias" in system[0]["text"]
+    usage = result["usage"]
+    assert usage["input_tokens"] == 80
+    assert usage["cache_creation_input_tokens"] == 900
+    assert usage["output_tokens"] == 300
+    assert len(usage["calls"]) == 1
+    assert usage["calls"][0]["articles"] == 2
+    assert usage["calls"][0]["latency_s"] >= 0
+
+
+@patch("src.summarizer.anthropic.Anthropic")
+def test_summarize_prompts_with_full_text_when_fetched(mock_anthropic_class):
+    mock_client = mock_anthropic_class.return_value
+    mock_client.messages.create.side_effect = _echo_response
+    articles = _many_articles(2)
+    articles[0]["content"] = "First paragraph of the story.\n\nSecond paragraph."
+
+    summarize_articles(articles=articles, api_key="fake-key")
+
+    prompt = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+    assert "[0] Story 0 (Src)\n    First paragraph of the story. Second paragraph." in prompt
+    assert "[1] Story 1 (Src)\n    AI news" in prompt
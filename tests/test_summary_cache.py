@@ -0,0 +1,28 @@
+import time
+
+from src.summary_cache import SummaryCache
+
+
+def test_summary_cache_round_trips_values(tmp_path):
+    cache = SummaryCache(tmp_path / "summaries.sqlite3")
+    cache.put_many({"k1": {"titulo_pt": "Título", "resumo_pt": "Resumo."}})
+
+    assert cache.get_many(["k1", "missing"]) == {"k1": {"titulo_pt": "Título", "resumo_pt": "Resumo."}}
+
+
+def test_summary_cache_ignores_expired_entries(tmp_path):
+    cache = SummaryCache(tmp_path / "summaries.sqlite3", ttl_days=1)
+    cache.put_many({"k1": {"titulo_pt": "T", "resumo_pt": "R"}})
+    cache._conn.execute("UPDATE summaries SET created_at = ?", (time.time() - 2 * 86400,))
+
+    assert cache.get_many(["k1"]) == {}
+
+
+def test_summary_cache_evicts_least_recently_used(tmp_path):
+    cache = SummaryCache(tmp_path / "summaries.sqlite3", max_entries=2)
+    cache.put_many({"old": {}, "hot": {}})
+    cache._conn.execute("UPDATE summaries SET used_at = used_at - 100")
+    cache.get_many(["hot"])
+    cache.put_many({"new": {}})
+
+    assert set(cache.get_many(["old", "hot", "new"])) == {"hot", "new"}